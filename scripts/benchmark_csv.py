@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path to import src
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+import pandas as pd
+from src.data_loader import RATINGS_FILE
+from src.parallel_csv import RATINGS_DTYPES, TAGS_DTYPES, read_csv_parallel
+
+
+def best_time(func, repeats):
+    """Returns the result and the best wall time of `repeats` calls."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def benchmark(csv_path, workers, repeats):
+    """
+    Compares pd.read_csv with read_csv_parallel on a MovieLens CSV file.
+
+    Args:
+        csv_path (str): ratings.csv or tags.csv.
+        workers (list): Worker counts to measure.
+        repeats (int): Runs per configuration (the best one is reported).
+    """
+    is_tags = "tags" in os.path.basename(csv_path)
+    dtype = TAGS_DTYPES if is_tags else RATINGS_DTYPES
+    size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+    print(f"{csv_path}: {size_mb:.1f} MB, {os.cpu_count()} CPUs")
+
+    reference, baseline = best_time(
+        lambda: pd.read_csv(csv_path, dtype=dtype), repeats
+    )
+    print(f"{'pd.read_csv':>14}: {baseline:7.2f} s")
+    for n in workers:
+        frame, elapsed = best_time(
+            lambda n=n: read_csv_parallel(csv_path, dtype, workers=n), repeats
+        )
+        status = "" if frame.equals(reference) else "  MISMATCH"
+        print(
+            f"{n:>6} workers: {elapsed:7.2f} s "
+            f"({baseline / elapsed:.2f}x){status}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark parallel CSV parsing against pd.read_csv."
+    )
+    parser.add_argument("csv_path", nargs="?", default=RATINGS_FILE)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    benchmark(args.csv_path, args.workers, args.repeats)
@@ -0,0 +1,165 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """
+    Roughly estimates the memory held by a cached value.
+
+    NumPy arrays count their buffer, containers are walked recursively and
+    anything else falls back to `sys.getsizeof`.
+
+    Args:
+        value: The value to measure.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by entries and bytes.
+
+    When either limit is exceeded, the least recently used entries are
+    evicted. Entries can also expire after a time-to-live. Values are shared
+    with the caller, so they must be treated as immutable.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None):
+        """
+        Args:
+            max_entries (int): Maximum number of entries.
+            max_bytes (int): Maximum estimated size of all values, or None
+                for no memory cap.
+            ttl (float): Seconds an entry stays valid, or None to keep it
+                until evicted.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for `key` and marks it as recently used.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is not cached.
+
+        Returns:
+            The cached value, or `default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None:
+                if time.monotonic() >= entry[2]:
+                    self._remove(key)
+                    self.expirations += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        """
+        Caches `value` under `key`, evicting old entries if needed.
+
+        Values larger than `max_bytes` on their own are not cached.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+            nbytes (int): Size of the value, estimated if omitted.
+        """
+        if nbytes is None:
+            nbytes = estimate_size(value)
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes, expires_at)
+            self.nbytes += nbytes
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes
+            ):
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """
+        Removes `key` from the cache.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is not cached.
+
+        Returns:
+            The removed value, or `default`.
+        """
+        with self._lock:
+            entry = self._remove(key)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        """Removes every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Returns cache counters for monitoring.
+
+        Returns:
+            dict: {"entries", "bytes", "hits", "misses", "hit_rate",
+            "evictions", "expirations"}.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+        return entry
@@ -0,0 +1,470 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from src.utils import GENRE_VOCAB, genre_multi_hot
+
+# Release year at the end of MovieLens titles, e.g. "Toy Story (1995)"
+YEAR_PATTERN = r"\((\d{4})\)\s*$"
+
+# Binary catalog layout: one .npy file per column plus a manifest
+CATALOG_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+class Catalog:
+    """
+    Movie metadata stored as dense, position-aligned arrays.
+
+    Row `r` of every array describes the same movie, and `index` maps a raw
+    movieId to its row, so metadata joins are O(1) instead of a scan of the
+    movies DataFrame. A catalog can also be aligned to the model's inner item
+    IDs (see `align`), in which case the row of a movie is its inner ID.
+    """
+
+    def __init__(
+        self,
+        movie_ids,
+        titles,
+        genres,
+        years=None,
+        genre_matrix=None,
+        present=None,
+    ):
+        """
+        Args:
+            movie_ids (array-like): Raw movie IDs, one per row.
+            titles (array-like): Movie titles aligned with `movie_ids`.
+            genres (array-like): Pipe-separated genre strings (EN).
+            years (array-like): Release years (0 if unknown). Parsed from the
+                titles if omitted.
+            genre_matrix (np.ndarray): Multi-hot genre matrix. Built from
+                `genres` if omitted.
+            present (np.ndarray): Boolean mask of the rows that have
+                metadata. Defaults to all rows.
+        """
+        self.movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        self.titles = titles
+        self.genres = genres
+        if years is None:
+            years = parse_years(titles)
+        self.years = np.asarray(years, dtype=np.int16)
+        if genre_matrix is None:
+            genre_matrix = genre_multi_hot(genres)
+        self.genre_matrix = genre_matrix
+        if present is None:
+            present = np.ones(len(self.movie_ids), dtype=bool)
+        self.present = present
+        self.index = {
+            movie_id: row
+            for row, movie_id in enumerate(self.movie_ids.tolist())
+            if movie_id >= 0
+        }
+        self._sorted_ids = None
+        self._sorted_rows = None
+
+    @classmethod
+    def from_frame(cls, movies_df):
+        """
+        Builds a catalog from a movies DataFrame (movieId, title, genres).
+
+        Args:
+            movies_df (pd.DataFrame): The movies dataset.
+
+        Returns:
+            Catalog: The catalog, rows in DataFrame order.
+        """
+        return cls(
+            movies_df["movieId"].values,
+            movies_df["title"].values.astype(object),
+            movies_df["genres"].values.astype(object),
+        )
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    def row(self, movie_id):
+        """
+        Returns the row of a movie.
+
+        Args:
+            movie_id: The raw movie ID (int, str or float-as-int).
+
+        Returns:
+            int or None: The row, or None if the movie is not in the catalog.
+        """
+        try:
+            return self.index.get(int(movie_id))
+        except (ValueError, TypeError):
+            return None
+
+    def rows_of(self, movie_ids):
+        """
+        Vectorized version of `row`, using binary search over sorted IDs.
+
+        Args:
+            movie_ids (array-like): Raw movie IDs.
+
+        Returns:
+            np.ndarray: Rows (int64), -1 for movies not in the catalog.
+        """
+        if self._sorted_ids is None:
+            self._sorted_rows = np.argsort(self.movie_ids, kind="stable")
+            self._sorted_ids = self.movie_ids[self._sorted_rows]
+        movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        if len(self._sorted_ids) == 0:
+            return np.full(movie_ids.shape, -1, dtype=np.int64)
+        pos = np.searchsorted(self._sorted_ids, movie_ids)
+        pos = np.minimum(pos, len(self._sorted_ids) - 1)
+        found = (self._sorted_ids[pos] == movie_ids) & (movie_ids >= 0)
+        return np.where(found, self._sorted_rows[pos], -1)
+
+    def title(self, movie_id, default="Unknown"):
+        """
+        Returns the title of a movie.
+
+        Args:
+            movie_id: The raw movie ID.
+            default (str): Value returned for unknown movies.
+
+        Returns:
+            str: The title, or `default` if the movie is unknown.
+        """
+        row = self.row(movie_id)
+        if row is None or not self.present[row]:
+            return default
+        return self.titles[row]
+
+    def record(self, row):
+        """
+        Returns the metadata of a row as a dictionary.
+
+        Args:
+            row (int): The catalog row.
+
+        Returns:
+            dict: {"movieId", "title", "genres", "year"}.
+        """
+        return {
+            "movieId": int(self.movie_ids[row]),
+            "title": self.titles[row],
+            "genres": self.genres[row],
+            "year": int(self.years[row]),
+        }
+
+    def to_frame(self):
+        """
+        Returns the catalog as a movies DataFrame (movieId, title, genres).
+
+        Returns:
+            pd.DataFrame: The same columns and dtypes as `pd.read_csv` of
+            movies.csv.
+        """
+        rows = np.flatnonzero(self.present)
+        return pd.DataFrame(
+            {
+                "movieId": self.movie_ids[rows],
+                "title": _take_strings(self.titles, rows),
+                "genres": _take_strings(self.genres, rows),
+            }
+        )
+
+    def align(self, raw_item_ids):
+        """
+        Re-indexes the catalog so that row `i` describes inner item `i`.
+
+        Args:
+            raw_item_ids (np.ndarray): Raw movie IDs indexed by inner ID, -1
+                for unknown entries.
+
+        Returns:
+            Catalog: The aligned catalog. Items missing from this catalog
+            are not `present`: they have a None title and genres, year 0 and
+            no genres in the matrix.
+        """
+        rows = self.rows_of(raw_item_ids)
+        missing = rows < 0
+        titles = _take_strings(self.titles, rows)
+        genres = _take_strings(self.genres, rows)
+        titles[missing] = None
+        genres[missing] = None
+        years = self.years[rows]
+        years[missing] = 0
+        genre_matrix = self.genre_matrix[rows]
+        genre_matrix[missing] = 0
+        return Catalog(
+            raw_item_ids, titles, genres, years, genre_matrix, ~missing
+        )
+
+
+def parse_years(titles):
+    """
+    Extracts the release year from MovieLens titles.
+
+    Args:
+        titles (array-like): Movie titles.
+
+    Returns:
+        np.ndarray: int16 years, 0 when the title has no year.
+    """
+    years = pd.Series(titles, dtype=object).str.extract(YEAR_PATTERN)[0]
+    return years.fillna(0).astype(np.int16).values
+
+
+class StringTable:
+    """
+    Read-only sequence of strings stored as offsets into a UTF-8 blob.
+
+    Both arrays are usually memory-mapped, so opening a table costs nothing
+    and strings are only decoded when accessed.
+    """
+
+    def __init__(self, offsets, blob):
+        """
+        Args:
+            offsets (np.ndarray): int64 array of len(strings) + 1 byte offsets.
+            blob (np.ndarray): uint8 array with the concatenated UTF-8 strings.
+        """
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def from_strings(cls, strings):
+        """
+        Encodes a sequence of strings into a table.
+
+        Args:
+            strings (iterable): The strings (None is stored as "").
+
+        Returns:
+            StringTable: The in-memory table.
+        """
+        encoded = [(s or "").encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(offsets, blob)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+    def take(self, rows):
+        """
+        Decodes the strings of several rows.
+
+        Args:
+            rows (array-like): Row numbers.
+
+        Returns:
+            np.ndarray: Object array with the decoded strings.
+        """
+        blob = self.blob.tobytes() if len(rows) > 64 else None
+        strings = np.empty(len(rows), dtype=object)
+        for pos, row in enumerate(np.asarray(rows).tolist()):
+            start, end = self.offsets[row], self.offsets[row + 1]
+            if blob is None:
+                strings[pos] = self[row]
+            else:
+                strings[pos] = blob[start:end].decode("utf-8")
+        return strings
+
+
+def _take_strings(strings, rows):
+    """
+    Gathers strings by row from an object array or a StringTable.
+
+    Args:
+        strings (np.ndarray or StringTable): The source strings.
+        rows (np.ndarray): Row numbers (negative rows yield garbage and must
+            be masked by the caller).
+
+    Returns:
+        np.ndarray: Object array with the selected strings.
+    """
+    if isinstance(strings, StringTable):
+        return strings.take(np.where(rows < 0, 0, rows))
+    return np.asarray(strings, dtype=object)[rows]
+
+
+def file_md5(path, chunk_size=1 << 20):
+    """
+    Computes the md5 hex digest of a file (same format as checksums.txt).
+
+    Args:
+        path (str): Path to the file.
+        chunk_size (int): Read size in bytes.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, write, mode="wb"):
+    """Writes a file through `write(f)` on a temp file, then renames it."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode) as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _save_array(out_dir, name, array):
+    """Saves a .npy column atomically (write to a temp file, then rename)."""
+    path = os.path.join(out_dir, f"{name}.npy")
+    _write_atomic(path, lambda f: np.save(f, array))
+
+
+def compile_catalog(csv_path, out_dir):
+    """
+    Compiles movies.csv into the binary catalog format.
+
+    Layout of `out_dir`: movie_ids (int32), years (int16), genre_bits
+    (uint32, bit i = GENRE_VOCAB[i]), title/genres string tables (int64
+    offsets + uint8 UTF-8 blob), all as .npy files, and a manifest with the
+    md5 of the source CSV. The manifest is written last, so a partially
+    written catalog is never opened.
+
+    Args:
+        csv_path (str): Path to movies.csv.
+        out_dir (str): Output directory.
+
+    Returns:
+        dict: The manifest.
+    """
+    print(f"Compiling movie catalog from {csv_path}...")
+    os.makedirs(out_dir, exist_ok=True)
+    movies_df = pd.read_csv(csv_path)
+    catalog = Catalog.from_frame(movies_df)
+
+    bit_values = np.uint32(1) << np.arange(len(GENRE_VOCAB), dtype=np.uint32)
+    genre_bits = (catalog.genre_matrix.astype(np.uint32) * bit_values).sum(
+        axis=1, dtype=np.uint32
+    )
+    titles = StringTable.from_strings(catalog.titles)
+    genres = StringTable.from_strings(catalog.genres)
+
+    _save_array(out_dir, "movie_ids", catalog.movie_ids.astype(np.int32))
+    _save_array(out_dir, "years", catalog.years)
+    _save_array(out_dir, "genre_bits", genre_bits)
+    _save_array(out_dir, "title_offsets", titles.offsets)
+    _save_array(out_dir, "title_blob", titles.blob)
+    _save_array(out_dir, "genres_offsets", genres.offsets)
+    _save_array(out_dir, "genres_blob", genres.blob)
+
+    stat = os.stat(csv_path)
+    manifest = {
+        "version": CATALOG_FORMAT_VERSION,
+        "rows": len(catalog),
+        "genres": GENRE_VOCAB,
+        "source_md5": file_md5(csv_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+    }
+    _write_manifest(out_dir, manifest)
+    print(f"Catalog compiled: {len(catalog)} movies.")
+    return manifest
+
+
+def _write_manifest(out_dir, manifest):
+    """Writes the catalog manifest atomically."""
+    _write_atomic(
+        os.path.join(out_dir, MANIFEST_FILE),
+        lambda f: json.dump(manifest, f, indent=2),
+        mode="w",
+    )
+
+
+def read_manifest(out_dir):
+    """
+    Reads the manifest of a compiled catalog.
+
+    Args:
+        out_dir (str): Directory of the compiled catalog.
+
+    Returns:
+        dict or None: The manifest, or None if it is missing or was written
+        by another format version.
+    """
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != CATALOG_FORMAT_VERSION:
+        return None
+    if manifest.get("genres") != GENRE_VOCAB:
+        return None
+    return manifest
+
+
+def open_catalog(out_dir):
+    """
+    Opens a compiled catalog with memory mapping.
+
+    Args:
+        out_dir (str): Directory written by `compile_catalog`.
+
+    Returns:
+        Catalog: The catalog, backed by memory-mapped columns.
+    """
+
+    def column(name):
+        return np.load(os.path.join(out_dir, f"{name}.npy"), mmap_mode="r")
+
+    genre_bits = column("genre_bits")
+    bit_values = np.uint32(1) << np.arange(len(GENRE_VOCAB), dtype=np.uint32)
+    genre_matrix = ((genre_bits[:, None] & bit_values) != 0).astype(np.uint8)
+    return Catalog(
+        column("movie_ids"),
+        StringTable(column("title_offsets"), column("title_blob")),
+        StringTable(column("genres_offsets"), column("genres_blob")),
+        column("years"),
+        genre_matrix,
+    )
+
+
+def load_or_build_catalog(csv_path, out_dir):
+    """
+    Opens the compiled catalog, rebuilding it only if the CSV changed.
+
+    The CSV size and modification time are checked first; the md5 is only
+    recomputed when they differ from the manifest, and the catalog is only
+    recompiled when the md5 differs too. If the CSV is missing, an existing
+    catalog is used as is.
+
+    Args:
+        csv_path (str): Path to movies.csv.
+        out_dir (str): Directory of the compiled catalog.
+
+    Returns:
+        Catalog: The memory-mapped catalog.
+    """
+    manifest = read_manifest(out_dir)
+    if manifest is not None and os.path.exists(csv_path):
+        stat = os.stat(csv_path)
+        unchanged = (
+            stat.st_size == manifest["source_size"]
+            and stat.st_mtime_ns == manifest["source_mtime_ns"]
+        )
+        if not unchanged:
+            if file_md5(csv_path) == manifest["source_md5"]:
+                # Same content (e.g. re-extracted file): refresh the stamp
+                manifest["source_size"] = stat.st_size
+                manifest["source_mtime_ns"] = stat.st_mtime_ns
+                _write_manifest(out_dir, manifest)
+            else:
+                manifest = None
+
+    if manifest is None:
+        compile_catalog(csv_path, out_dir)
+    return open_catalog(out_dir)
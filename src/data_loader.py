@@ -1,19 +1,41 @@
 import os
-import pandas as pd
+import numpy as np
 import urllib.request
 import zipfile
 import io
 import sys
+import threading
 
 # Add project root to path to import scripts
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from scripts.file_manager import join_file
+from src.catalog import Catalog, load_or_build_catalog, read_manifest
+from src.parallel_csv import RATINGS_DTYPES, TAGS_DTYPES, read_csv_parallel
+from src.movie_stats import (
+    POPULARITY_FILE,
+    PopularMovies,
+    load_movie_stats,
+    popularity_score,
+)
+from src.rating_matrix import load_or_build_rating_matrix
+from src.ratings_store import load_or_build_ratings_store, read_ratings_manifest
+from src.search_index import MovieSearchIndex
+from src.utils import genre_multi_hot
 
 DATASET_URL = "https://files.grouplens.org/datasets/movielens/ml-32m.zip"
 DATA_DIR = "datasets"
 MOVIES_FILE = os.path.join(DATA_DIR, "ml-32m", "movies.csv")
 RATINGS_FILE = os.path.join(DATA_DIR, "ml-32m", "ratings.csv")
 TAGS_FILE = os.path.join(DATA_DIR, "ml-32m", "tags.csv")
+CHECKSUMS_FILE = os.path.join(DATA_DIR, "ml-32m", "checksums.txt")
+CATALOG_DIR = os.path.join(DATA_DIR, "ml-32m", "catalog")
+RATINGS_STORE_DIR = os.path.join(DATA_DIR, "ml-32m", "ratings_store")
+
+_CATALOG = None
+_MOVIES_DF = None
+_SEARCH_INDEX = None
+_POPULAR_MOVIES = None
+_CATALOG_LOCK = threading.RLock()
 
 
 def ensure_dataset_exists():
@@ -41,81 +63,253 @@ def load_movies():
     """
     Loads the movies dataset into a pandas DataFrame.
 
+    The DataFrame is built once per process from the compiled catalog and
+    then shared, so callers must not modify it in place.
+
     Returns:
         pd.DataFrame: A DataFrame containing movie information (movieId, title, genres).
     """
+    global _MOVIES_DF
+    if _MOVIES_DF is None:
+        with _CATALOG_LOCK:
+            if _MOVIES_DF is None:
+                _MOVIES_DF = load_catalog().to_frame()
+    return _MOVIES_DF
+
+
+def load_catalog():
+    """
+    Returns the process-wide movie Catalog, opening it on first use.
+
+    movies.csv is compiled into a memory-mapped binary catalog under
+    CATALOG_DIR, which is only rebuilt when the CSV checksum changes.
+
+    Returns:
+        Catalog: Indexed movie metadata, rows in movies.csv order.
+    """
+    global _CATALOG
+    if _CATALOG is None:
+        with _CATALOG_LOCK:
+            if _CATALOG is None:
+                ensure_dataset_exists()
+                _CATALOG = load_or_build_catalog(MOVIES_FILE, CATALOG_DIR)
+    return _CATALOG
+
+
+def load_ratings(mode="frame", workers=None):
+    """
+    Loads the ratings dataset.
+
+    Args:
+        mode (str): "frame" parses ratings.csv into a DataFrame; "store"
+            returns the binary columnar store (converted from the CSV once,
+            then memory-mapped without copies).
+        workers (int): Parser processes for the "frame" mode (see
+            parallel_csv.read_csv_parallel). Defaults to the CPU count.
+
+    Returns:
+        pd.DataFrame or RatingsStore: A DataFrame containing ratings
+        (userId, movieId, rating, timestamp), or the RatingsStore.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if mode not in ("frame", "store"):
+        raise ValueError(f"Unknown ratings mode: {mode}")
     ensure_dataset_exists()
-    return pd.read_csv(MOVIES_FILE)
+    if mode == "store":
+        return load_or_build_ratings_store(
+            RATINGS_FILE, RATINGS_STORE_DIR, CHECKSUMS_FILE
+        )
+    return read_csv_parallel(RATINGS_FILE, RATINGS_DTYPES, workers)
+
+
+def load_rating_matrix():
+    """
+    Loads the ratings indexed by user (CSR) and by item (CSC).
+
+    The matrices are built from the ratings store once per ratings.csv and
+    saved next to it, so later calls only memory-map them.
+
+    Returns:
+        RatingMatrix: The memory-mapped matrices.
+    """
+    store = load_ratings(mode="store")
+    source_md5 = read_ratings_manifest(RATINGS_STORE_DIR)["source_md5"]
+    return load_or_build_rating_matrix(store, RATINGS_STORE_DIR, source_md5)
 
 
-def load_ratings():
+def load_tags(workers=None):
     """
-    Loads the ratings dataset into a pandas DataFrame.
+    Loads the tags dataset.
+
+    Args:
+        workers (int): Parser processes (see
+            parallel_csv.read_csv_parallel). Defaults to the CPU count.
 
     Returns:
-        pd.DataFrame: A DataFrame containing ratings (userId, movieId, rating, timestamp).
+        pd.DataFrame: A DataFrame containing tags (userId, movieId, tag,
+        timestamp).
     """
     ensure_dataset_exists()
-    return pd.read_csv(RATINGS_FILE)
+    return read_csv_parallel(TAGS_FILE, TAGS_DTYPES, workers)
+
+
+def load_popularity():
+    """
+    Loads the per-movie popularity scores aligned with the catalog rows.
+
+    The scores come from the rating statistics precomputed offline with
+    `python -m src.movie_stats`; ratings.csv is never read at query time.
+
+    Returns:
+        np.ndarray or None: Scores (see movie_stats.popularity_score), or
+        None if the statistics have not been computed for this catalog.
+    """
+    manifest = read_manifest(CATALOG_DIR)
+    if manifest is None:
+        return None
+    stats = load_movie_stats(CATALOG_DIR, manifest["source_md5"])
+    if stats is None:
+        return None
+    return popularity_score(*stats)
+
+
+def load_popular_movies():
+    """
+    Loads the time-decayed popularity lists, once per process.
+
+    The lists are precomputed offline with `python -m src.movie_stats`.
+
+    Returns:
+        PopularMovies or None: The lists, or None if they have not been
+        computed for the current catalog.
+    """
+    global _POPULAR_MOVIES
+    if _POPULAR_MOVIES is None:
+        manifest = read_manifest(CATALOG_DIR)
+        if manifest is None:
+            return None
+        _POPULAR_MOVIES = PopularMovies.load(
+            os.path.join(CATALOG_DIR, POPULARITY_FILE), manifest["source_md5"]
+        )
+    return _POPULAR_MOVIES
+
+
+def get_search_index(movies_df):
+    """
+    Returns the search index for a movies DataFrame, building it once.
+
+    The index of the shared DataFrame returned by `load_movies` is kept for
+    the whole process; other DataFrames get a fresh index.
+
+    Args:
+        movies_df (pd.DataFrame): The DataFrame containing movie data.
 
+    Returns:
+        MovieSearchIndex: Index whose rows are positions in `movies_df`.
+    """
+    global _SEARCH_INDEX
+    with _CATALOG_LOCK:
+        if _SEARCH_INDEX is not None and _SEARCH_INDEX[0] is movies_df:
+            return _SEARCH_INDEX[1]
+        popularity = None
+        if movies_df is _MOVIES_DF:
+            genre_matrix = _CATALOG.genre_matrix[_CATALOG.present]
+            popularity = load_popularity()
+            if popularity is not None:
+                popularity = popularity[_CATALOG.present]
+        else:
+            genre_matrix = genre_multi_hot(movies_df["genres"].values)
+        index = MovieSearchIndex(
+            movies_df["title"].values, genre_matrix, popularity
+        )
+        _SEARCH_INDEX = (movies_df, index)
+        return index
 
-def search_movies(query, movies_df):
+
+def search_movies(query, movies_df, fuzzy=True, order="catalog"):
     """
     Searches for movies based on a query string.
 
-    The search is performed in two steps:
-    1. It attempts to translate the query (if it's a Spanish genre) to English.
-    2. It filters the DataFrame for matches in either the 'title' or 'genres' columns.
+    Matching uses an inverted index over the normalized (accent-folded,
+    lower-cased) title tokens: a movie matches when its title contains every
+    word of the query, the last one as a prefix. Movies whose genres contain
+    the query also match; Spanish genre names are translated to English first.
+
+    When nothing matches exactly and `fuzzy` is set, titles are matched by
+    character-trigram similarity instead, so misspelled queries
+    ("star wras") still find results.
 
     Args:
         query (str): The search term entered by the user.
         movies_df (pd.DataFrame): The DataFrame containing movie data.
+        fuzzy (bool): Whether to fall back to fuzzy matching.
+        order (str): "catalog" keeps exact matches in catalog order;
+            "popularity" ranks them by the precomputed popularity/quality
+            score (see `load_popularity`). Fuzzy matches are always ranked
+            by similarity.
 
     Returns:
         pd.DataFrame: A filtered DataFrame containing matching movies.
+
+    Raises:
+        ValueError: If the order is unknown.
     """
+    if order not in ("catalog", "popularity"):
+        raise ValueError(f"Unknown search order: {order}")
+
     if not query:
+        if order == "popularity":
+            index = get_search_index(movies_df)
+            return movies_df.iloc[index.rank(np.arange(len(movies_df)))[:20]]
         return movies_df.head(20)
 
-    # Convert potential Spanish genre in query to English
-    from src.utils import get_english_genre
-
-    # Try to map the whole query as a genre
-    # (Simple approach: if query matches a Spanish genre, use the English version)
-    query_as_english_genre = get_english_genre(query.strip().title())
-
-    # If the mapping returned something different, it means it was a known Spanish genre
-    # Use that for the genre search part.
-    # Keep original query for title search.
+    index = get_search_index(movies_df)
+    rows = index.search(query)
+    if len(rows) == 0 and fuzzy:
+        return movies_df.iloc[index.fuzzy_search(query)]
+    if order == "popularity":
+        rows = index.rank(rows)
+    return movies_df.iloc[rows]
 
-    search_term = (
-        query_as_english_genre
-        if query_as_english_genre != query.strip().title()
-        else query
-    )
 
-    # Simple case-insensitive search in title and genres
-    # If search_term differs from query, it means we detected a genre.
-    # We search for that genre in 'genres' OR the original query in 'title'.
+def suggest_movies(query, movies_df, limit=8):
+    """
+    Suggests completions for the text typed in the search box.
 
-    mask = movies_df["title"].str.contains(
-        query, case=False, na=False
-    ) | movies_df["genres"].str.contains(search_term, case=False, na=False)
+    Args:
+        query (str): The text typed so far.
+        movies_df (pd.DataFrame): The DataFrame containing movie data.
+        limit (int): Maximum number of suggestions.
 
-    return movies_df[mask]
+    Returns:
+        list: Suggestion labels (titles or genre names), most popular first.
+    """
+    if not query:
+        return []
+    completions = get_search_index(movies_df).complete(query, limit=limit)
+    return [c["label"] for c in completions]
 
 
-def get_movie_title(movie_id, movies_df):
+def get_movie_title(movie_id, movies_df=None):
     """
     Retrieves the title of a movie given its ID.
 
     Args:
         movie_id (int): The ID of the movie.
-        movies_df (pd.DataFrame): The DataFrame containing movie data.
+        movies_df (Catalog or pd.DataFrame): The movie data. Defaults to the
+            process-wide Catalog, which answers in O(1); a DataFrame is
+            scanned.
 
     Returns:
         str: The title of the movie, or "Unknown" if not found.
     """
+    if movies_df is None:
+        movies_df = load_catalog()
+    if isinstance(movies_df, Catalog):
+        return movies_df.title(movie_id)
+
     movie = movies_df[movies_df["movieId"] == movie_id]
     if not movie.empty:
         return movie.iloc[0]["title"]
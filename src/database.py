@@ -1,5 +1,11 @@
 import sqlite3
 import hashlib
+import atexit
+import queue
+import threading
+import time
+import weakref
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
@@ -8,19 +14,122 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, "data", "movie_recsys.db")
 
+# Pragmas applied to every pooled connection. WAL lets readers proceed
+# while a writer commits, and synchronous=NORMAL is safe in WAL mode.
+DB_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", 5000),
+    ("cache_size", -64000),  # 64 MB
+    ("mmap_size", 256 * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+)
+# Prepared statements kept per connection (reused across calls)
+STATEMENT_CACHE_SIZE = 256
+
+# Group commit: a queued rating waits at most WRITE_MAX_LATENCY seconds for
+# other writes to join its transaction, and a batch holds at most
+# WRITE_MAX_BATCH rows.
+WRITE_MAX_LATENCY = 0.002
+WRITE_MAX_BATCH = 1000
+# Seconds callers wait for a queued write before giving up
+WRITE_TIMEOUT = 30.0
+
+INSERT_RATING_SQL = (
+    "INSERT OR REPLACE INTO ratings (user_id, movie_id, rating, timestamp) "
+    "VALUES (?, ?, ?, ?)"
+)
+# Bumped in the same transaction as every change to a user's ratings, so
+# caches derived from them can check whether they are still current.
+BUMP_VERSION_SQL = (
+    "INSERT INTO rating_versions (user_id, version) VALUES (?, 1) "
+    "ON CONFLICT(user_id) DO UPDATE SET version = version + 1"
+)
+
+_pool = threading.local()
+_pool_lock = threading.Lock()
+_pool_connections = []
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    SQLite connection owned by the per-thread pool.
+
+    `close()` only rolls back an unfinished transaction and keeps the
+    connection open for the next call in the same thread, so existing
+    open/close call sites reuse it transparently.
+    """
+
+    closed = False
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def close_for_real(self):
+        """Closes the underlying SQLite connection."""
+        self.closed = True
+        sqlite3.Connection.close(self)
+
 
 def get_db_connection():
     """
-    Establishes a connection to the SQLite database.
+    Returns the calling thread's pooled connection to the SQLite database.
+
+    Each thread keeps one long-lived connection, configured with
+    DB_PRAGMAS, so requests no longer reconnect and its prepared statements
+    are reused. A transaction left open by a caller that raised before
+    committing is rolled back before the connection is handed out again,
+    so the next caller's commit cannot save it. Connections of finished
+    threads are closed when new ones are created.
 
     Returns:
         sqlite3.Connection: A connection object with row_factory set to sqlite3.Row.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = getattr(_pool, "conn", None)
+    if conn is not None and not conn.closed and _pool.path == DB_PATH:
+        if conn.in_transaction:
+            conn.rollback()
+        return conn
+
+    conn = sqlite3.connect(
+        DB_PATH,
+        factory=PooledConnection,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+    )
     conn.row_factory = sqlite3.Row
+    for name, value in DB_PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+
+    previous = getattr(_pool, "conn", None)
+    _pool.conn = conn
+    _pool.path = DB_PATH
+
+    with _pool_lock:
+        alive = []
+        for thread_ref, pooled in _pool_connections:
+            thread = thread_ref()
+            if pooled is previous or thread is None or not thread.is_alive():
+                pooled.close_for_real()
+            else:
+                alive.append((thread_ref, pooled))
+        alive.append((weakref.ref(threading.current_thread()), conn))
+        _pool_connections[:] = alive
     return conn
 
 
+def close_db_connections():
+    """
+    Closes every pooled connection (e.g. at shutdown or between tests).
+    """
+    with _pool_lock:
+        for _, pooled in _pool_connections:
+            pooled.close_for_real()
+        _pool_connections.clear()
+    _pool.__dict__.clear()
+
+
 def init_db():
     """
     Initializes the database schema.
@@ -39,7 +148,8 @@ def init_db():
             username TEXT UNIQUE NOT NULL,
             email TEXT UNIQUE NOT NULL,
             password_hash TEXT NOT NULL,
-            favorite_genres TEXT
+            favorite_genres TEXT,
+            movielens_user_id INTEGER
         )
     """
     )
@@ -58,6 +168,16 @@ def init_db():
     """
     )
 
+    # Ratings version per user (see get_ratings_version)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rating_versions (
+            user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    """
+    )
+
     # Check if timestamp column exists (migration for existing DBs)
     c.execute("PRAGMA table_info(ratings)")
     columns = [info[1] for info in c.fetchall()]
@@ -72,6 +192,14 @@ def init_db():
         )
         print("Migration completed.")
 
+    # Link to a MovieLens user of the training set (see link_movielens_user)
+    c.execute("PRAGMA table_info(users)")
+    columns = [info[1] for info in c.fetchall()]
+    if "movielens_user_id" not in columns:
+        print("Migrating database: Adding movielens_user_id column to users...")
+        c.execute("ALTER TABLE users ADD COLUMN movielens_user_id INTEGER")
+        print("Migration completed.")
+
     conn.commit()
     conn.close()
 
@@ -150,33 +278,270 @@ def delete_user(user_id):
 
     Args:
         user_id (int): The ID of the user to delete.
+
+    Raises:
+        TimeoutError: If queued ratings could not be written first.
     """
+    # Queued ratings must not re-insert rows after the deletion
+    if not _rating_writer.flush():
+        raise TimeoutError("Queued ratings were not written in time")
+
     conn = get_db_connection()
-    c = conn.cursor()
-    c.execute("DELETE FROM users WHERE id = ?", (user_id,))
-    c.execute("DELETE FROM ratings WHERE user_id = ?", (user_id,))
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            c = conn.cursor()
+            c.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            c.execute("DELETE FROM ratings WHERE user_id = ?", (user_id,))
+            c.execute(BUMP_VERSION_SQL, (user_id,))
+    finally:
+        conn.close()
 
 
-def add_rating(user_id, movie_id, rating):
+class WriteTicket:
+    """
+    Acknowledgement handle of a queued write.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.error = None
+
+    @property
+    def done(self):
+        """bool: True once the write has been committed or has failed."""
+        return self._event.is_set()
+
+    def resolve(self, error=None):
+        """Marks the write as finished (called by the writer thread)."""
+        self.error = error
+        self._event.set()
+
+    def wait(self, timeout=WRITE_TIMEOUT):
+        """
+        Blocks until the write is committed.
+
+        Args:
+            timeout (float): Maximum seconds to wait (None waits forever).
+
+        Returns:
+            bool: True if the write finished, False on timeout.
+
+        Raises:
+            Exception: The error of the write if it failed (usually a
+                sqlite3.Error).
+        """
+        if not self._event.wait(timeout):
+            return False
+        if self.error is not None:
+            raise self.error
+        return True
+
+
+class RatingWriter:
+    """
+    Background thread that group-commits rating inserts.
+
+    Writes submitted by all sessions are queued; the writer takes the first
+    pending write, collects whatever else arrives within `max_latency`
+    seconds (up to `max_batch` rows) and commits them in one transaction,
+    so bursts share a single fsync instead of serializing on one each.
+    """
+
+    def __init__(
+        self, max_latency=WRITE_MAX_LATENCY, max_batch=WRITE_MAX_BATCH
+    ):
+        """
+        Args:
+            max_latency (float): Seconds a write may wait for others to join.
+            max_batch (int): Maximum number of rows per transaction.
+        """
+        self.max_latency = max_latency
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, rows):
+        """
+        Queues rating rows for insertion.
+
+        Args:
+            rows (list): (user_id, movie_id, rating, timestamp) tuples.
+
+        Returns:
+            WriteTicket: Handle resolved once the rows are committed.
+        """
+        self._ensure_started()
+        ticket = WriteTicket()
+        self._queue.put((rows, ticket))
+        return ticket
+
+    def flush(self, timeout=WRITE_TIMEOUT):
+        """
+        Waits until every write queued so far has been committed.
+
+        Args:
+            timeout (float): Maximum seconds to wait (None waits forever).
+
+        Returns:
+            bool: True if the queue was flushed, False on timeout.
+        """
+        if self._thread is None:
+            return True
+        # Writes are committed in order, so an empty write acts as a barrier
+        return self.submit([]).wait(timeout)
+
+    def stats(self):
+        """
+        Returns group-commit counters for monitoring.
+
+        Returns:
+            dict: {"batches", "rows", "pending"}.
+        """
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "pending": self._queue.qsize(),
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="rating-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            n_rows = len(batch[0][0])
+            deadline = time.monotonic() + self.max_latency
+            while n_rows < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                n_rows += len(item[0])
+            try:
+                self._commit(batch)
+            except Exception as e:
+                # The thread must survive, or every later write would hang
+                print(f"Error writing ratings: {e}")
+                for _, ticket in batch:
+                    if not ticket.done:
+                        ticket.resolve(e)
+
+    def _commit(self, batch):
+        rows = [row for item_rows, _ in batch for row in item_rows]
+        if rows:
+            conn = None
+            try:
+                conn = get_db_connection()
+                conn.executemany(INSERT_RATING_SQL, rows)
+                users = {row[0] for row in rows}
+                conn.executemany(BUMP_VERSION_SQL, [(u,) for u in users])
+                conn.commit()
+            except Exception as e:
+                # Not only sqlite3.Error: binding a bad value raises e.g.
+                # OverflowError, which must fail just its own write
+                if conn is not None:
+                    try:
+                        conn.rollback()
+                    except sqlite3.Error:
+                        pass
+                if len(batch) > 1:
+                    # Isolate the failing write so the others still succeed
+                    for item in batch:
+                        self._commit([item])
+                    return
+                print(f"Error writing ratings: {e}")
+                batch[0][1].resolve(e)
+                return
+            self.batches += 1
+            self.rows += len(rows)
+
+        for _, ticket in batch:
+            ticket.resolve()
+
+
+_rating_writer = RatingWriter()
+atexit.register(_rating_writer.flush, 5.0)
+
+
+def get_rating_writer():
+    """
+    Returns the process-wide rating writer.
+
+    Returns:
+        RatingWriter: The shared group-commit writer.
+    """
+    return _rating_writer
+
+
+def add_rating(user_id, movie_id, rating, wait=True):
     """
     Adds or updates a rating for a specific movie by a user.
 
+    The write goes through the group-commit queue and is committed together
+    with the ratings submitted concurrently by other sessions.
+
     Args:
         user_id (int): The ID of the user.
         movie_id (int): The ID of the movie.
         rating (float): The rating value (0.5 to 5.0).
+        wait (bool): Whether to block until the rating is committed.
+
+    Returns:
+        WriteTicket: Handle to confirm the write (already resolved if `wait`).
+
+    Raises:
+        TimeoutError: If `wait` and the write was not committed within
+            WRITE_TIMEOUT seconds.
     """
-    conn = get_db_connection()
-    c = conn.cursor()
     timestamp = int(datetime.now().timestamp())
-    c.execute(
-        "INSERT OR REPLACE INTO ratings (user_id, movie_id, rating, timestamp) VALUES (?, ?, ?, ?)",
-        (user_id, movie_id, rating, timestamp),
+    ticket = _rating_writer.submit(
+        [(int(user_id), int(movie_id), float(rating), timestamp)]
     )
-    conn.commit()
-    conn.close()
+    if wait and not ticket.wait():
+        raise TimeoutError("Rating write not committed in time")
+    return ticket
+
+
+def add_ratings(user_id, ratings, wait=True):
+    """
+    Adds or updates many ratings of a user in a single transaction.
+
+    Args:
+        user_id (int): The ID of the user.
+        ratings (iterable): (movie_id, rating) or (movie_id, rating, timestamp)
+            tuples, e.g. an imported rating history.
+        wait (bool): Whether to block until the ratings are committed.
+
+    Returns:
+        WriteTicket: Handle to confirm the write (already resolved if `wait`).
+
+    Raises:
+        TimeoutError: If `wait` and the write was not committed within
+            WRITE_TIMEOUT seconds.
+    """
+    now = int(datetime.now().timestamp())
+    rows = []
+    for entry in ratings:
+        timestamp = int(entry[2]) if len(entry) > 2 else now
+        rows.append((int(user_id), int(entry[0]), float(entry[1]), timestamp))
+    ticket = _rating_writer.submit(rows)
+    if wait and not ticket.wait():
+        raise TimeoutError("Rating write not committed in time")
+    return ticket
 
 
 def get_user_ratings(user_id):
@@ -196,6 +561,61 @@ def get_user_ratings(user_id):
     return df
 
 
+def get_ratings_version(user_id):
+    """
+    Returns the version of a user's ratings.
+
+    The version increases every time the user's ratings change (new or
+    updated ratings, account deletion), so it can be used to validate
+    cached results computed from them. Read it before the ratings: a write
+    landing in between then only makes the cached entry look older.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        int: The ratings version, 0 if the user never rated anything.
+    """
+    conn = get_db_connection()
+    c = conn.cursor()
+    c.row_factory = None
+    c.execute(
+        "SELECT version FROM rating_versions WHERE user_id = ?", (user_id,)
+    )
+    row = c.fetchone()
+    conn.close()
+    return row[0] if row else 0
+
+
+def get_user_rating_arrays(user_id):
+    """
+    Retrieves the ratings of a user as NumPy arrays.
+
+    Lightweight counterpart of `get_user_ratings` for the recommendation
+    path: rows are read straight from the cursor as plain tuples, without
+    building a DataFrame.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        tuple: (movie_ids, ratings) as int32 and float32 arrays.
+    """
+    conn = get_db_connection()
+    c = conn.cursor()
+    c.row_factory = None
+    c.execute(
+        "SELECT movie_id, rating FROM ratings WHERE user_id = ?", (user_id,)
+    )
+    rows = c.fetchall()
+    conn.close()
+    if not rows:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    # Movie IDs are exact in float64, so both columns convert in one call
+    table = np.array(rows, dtype=np.float64)
+    return table[:, 0].astype(np.int32), table[:, 1].astype(np.float32)
+
+
 def get_all_ratings():
     """
     Retrieves all ratings from the database.
@@ -230,6 +650,56 @@ def get_user_genres(user_id):
     return []
 
 
+def link_movielens_user(user_id, movielens_user_id):
+    """
+    Links an app user to a MovieLens user of the training set.
+
+    The recommender then starts from the trained factors of that MovieLens
+    user instead of folding the app user in from scratch.
+
+    Args:
+        user_id (int): The ID of the user.
+        movielens_user_id (int): The MovieLens userId, or None to unlink.
+    """
+    conn = get_db_connection()
+    try:
+        with conn:
+            c = conn.cursor()
+            c.execute(
+                "UPDATE users SET movielens_user_id = ? WHERE id = ?",
+                (
+                    (
+                        None
+                        if movielens_user_id is None
+                        else int(movielens_user_id)
+                    ),
+                    user_id,
+                ),
+            )
+            # The user's factors change, so cached results must be discarded
+            c.execute(BUMP_VERSION_SQL, (user_id,))
+    finally:
+        conn.close()
+
+
+def get_movielens_user_id(user_id):
+    """
+    Retrieves the MovieLens user linked to an app user.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        int or None: The MovieLens userId, or None if the user is not linked.
+    """
+    conn = get_db_connection()
+    c = conn.cursor()
+    c.execute("SELECT movielens_user_id FROM users WHERE id = ?", (user_id,))
+    row = c.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
 def update_user_genres(user_id, genres):
     """
     Updates the favorite genres for a specific user.
@@ -239,10 +709,14 @@ def update_user_genres(user_id, genres):
         genres (list): A list of new favorite genres (strings).
     """
     conn = get_db_connection()
-    c = conn.cursor()
-    c.execute(
-        "UPDATE users SET favorite_genres = ? WHERE id = ?",
-        (",".join(genres), user_id),
-    )
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            c = conn.cursor()
+            c.execute(
+                "UPDATE users SET favorite_genres = ? WHERE id = ?",
+                (",".join(genres), user_id),
+            )
+            # Cold-start factors are derived from the genres
+            c.execute(BUMP_VERSION_SQL, (user_id,))
+    finally:
+        conn.close()
@@ -1,13 +1,28 @@
+import itertools
 import os
 import pickle
+import sys
+import threading
+import time
 import pandas as pd
 import numpy as np
 from surprise import SVD, Dataset, Reader
 from surprise.model_selection import train_test_split
-from src.data_loader import load_ratings, load_movies
-from src.database import get_user_ratings
-
-import sys
+from src.data_loader import (
+    load_ratings,
+    load_movies,
+    load_catalog,
+    load_popular_movies,
+)
+from src.cache import LRUCache
+from src.trainer import train_from_store
+from src.database import (
+    get_movielens_user_id,
+    get_user_genres,
+    get_ratings_version,
+    get_user_rating_arrays,
+)
+from src.utils import GENRE_INDEX, GENRE_VOCAB
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from scripts.file_manager import join_file
@@ -15,20 +30,69 @@ from scripts.file_manager import join_file
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MODEL_PATH = os.path.join(BASE_DIR, "models", "svd_model.pkl")
 MODELS_DIR = os.path.join(BASE_DIR, "models")
-
-
-def train_model():
+# Latent centroid of each genre (rows follow utils.GENRE_VOCAB)
+GENRE_CENTROIDS_FILE = "svd_genre_centroids.npy"
+
+# Per-user fold-in results kept in memory (see get_user_profile)
+FOLD_IN_CACHE_ENTRIES = 10_000
+FOLD_IN_CACHE_BYTES = 64 * 1024 * 1024
+# Finished recommendation lists (see get_recommendations)
+RECOMMENDATION_CACHE_ENTRIES = 4096
+RECOMMENDATION_CACHE_BYTES = 32 * 1024 * 1024
+RECOMMENDATION_CACHE_TTL = 600
+# Users with at least this many ratings keep the statistics of their
+# fold-in cached and are updated incrementally after each new rating
+INCREMENTAL_FOLD_IN_MIN_RATINGS = 200
+# Incremental updates allowed before the statistics are rebuilt
+FOLD_IN_RESOLVE_EVERY = 50
+# Whether the app ratings of a linked MovieLens user refine the trained
+# factors (True) or the trained factors are used as they are (False)
+BLEND_STORED_FACTORS = True
+
+# Generation numbers of loaded models, unique across ModelStore instances
+_MODEL_VERSIONS = itertools.count(1)
+
+
+def train_model(engine="native"):
     """
     Trains the SVD recommendation model using the complete dataset.
 
-    Loads ratings, builds a Surprise trainset, trains the SVD algorithm,
-    and saves the trained model to a pickle file.
+    The "native" engine trains the same biased matrix factorization as
+    Surprise's SVD directly on the columnar ratings store (see
+    trainer.train_biased_mf) and writes the optimized model files, ready
+    for the ModelStore. The "surprise" engine builds a Surprise trainset,
+    fits SVD and pickles it to MODEL_PATH for `python -m src.optimize_model`.
+
+    Args:
+        engine (str): "native" or "surprise".
 
     Returns:
-        surprise.prediction_algorithms.matrix_factorization.SVD: The trained SVD model.
+        trainer.BiasedMF or surprise.SVD: The trained model.
+
+    Raises:
+        ValueError: If the engine is unknown.
     """
-    print("Training SVD model...")
-    ratings_df = load_ratings()
+    if engine not in ("native", "surprise"):
+        raise ValueError(f"Unknown training engine: {engine}")
+    print(f"Training SVD model ({engine})...")
+    store = load_ratings(mode="store")
+
+    if engine == "native":
+        model = train_from_store(store)
+        model.save(MODELS_DIR)
+        save_genre_centroids(
+            MODELS_DIR,
+            model.qi,
+            np.bincount(store.item_index, minlength=store.n_items),
+        )
+        # Serve the new factors if this process already loaded a model
+        if _MODEL_STORE is not None and _MODEL_STORE.loaded:
+            _MODEL_STORE.reload()
+        print("Model trained and saved.")
+        return model
+
+    # Compact columns from the binary store instead of parsing the CSV
+    ratings_df = store.to_frame()
 
     # Use the Reader object to parse the dataframe
     reader = Reader(rating_scale=(0.5, 5.0))
@@ -65,10 +129,10 @@ def load_model():
                 return data["algo"]
             return data
     else:
-        return train_model()
+        return train_model(engine="surprise")
 
 
-def load_optimized_components():
+def load_optimized_components(models_dir=MODELS_DIR):
     """
     Loads optimized model components (matrices) using memory mapping for efficiency.
 
@@ -76,10 +140,15 @@ def load_optimized_components():
     and ID mappings. This allows for faster recommendation generation without loading
     the full Surprise model object.
 
+    Prefer `get_model_store().load()` in request paths: this function does the
+    full disk work on every call.
+
+    Args:
+        models_dir (str): Directory containing the exported model files.
+
     Returns:
         tuple: (pu, qi, bu, bi, global_mean, mappings) or None if files are missing.
     """
-    """Load optimized model components using memory mapping."""
     # Ensure all components are ready (reconstructed if needed)
     for filename in [
         "svd_pu.npy",
@@ -88,34 +157,34 @@ def load_optimized_components():
         "svd_bi.npy",
         "svd_global_mean.npy",
     ]:
-        join_file(os.path.join(MODELS_DIR, filename))
+        join_file(os.path.join(models_dir, filename))
 
     try:
         pu = np.load(
-            os.path.join(MODELS_DIR, "svd_pu.npy"),
+            os.path.join(models_dir, "svd_pu.npy"),
             mmap_mode="r",
             allow_pickle=True,
         )
         qi = np.load(
-            os.path.join(MODELS_DIR, "svd_qi.npy"),
+            os.path.join(models_dir, "svd_qi.npy"),
             mmap_mode="r",
             allow_pickle=True,
         )
         bu = np.load(
-            os.path.join(MODELS_DIR, "svd_bu.npy"),
+            os.path.join(models_dir, "svd_bu.npy"),
             mmap_mode="r",
             allow_pickle=True,
         )
         bi = np.load(
-            os.path.join(MODELS_DIR, "svd_bi.npy"),
+            os.path.join(models_dir, "svd_bi.npy"),
             mmap_mode="r",
             allow_pickle=True,
         )
         global_mean = np.load(
-            os.path.join(MODELS_DIR, "svd_global_mean.npy"), allow_pickle=True
+            os.path.join(models_dir, "svd_global_mean.npy"), allow_pickle=True
         )[0]
 
-        with open(os.path.join(MODELS_DIR, "svd_mappings.pkl"), "rb") as f:
+        with open(os.path.join(models_dir, "svd_mappings.pkl"), "rb") as f:
             mappings = pickle.load(f)
 
         return pu, qi, bu, bi, global_mean, mappings
@@ -123,8 +192,431 @@ def load_optimized_components():
         return None
 
 
+class ModelStore:
+    """
+    Process-wide, thread-safe holder of the optimized SVD components.
+
+    The matrices and ID mappings are loaded once per process and then shared
+    read-only by every Streamlit session, so request paths no longer pay for
+    the existence checks, memory maps and the unpickling of the mappings.
+    Callers must treat the returned arrays and dictionaries as immutable.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR):
+        """
+        Args:
+            models_dir (str): Directory containing the exported model files.
+        """
+        self.models_dir = models_dir
+        self._lock = threading.RLock()
+        self._components = None
+        self._item_catalog = None
+        self._genre_centroids = None
+        self.load_time = None
+        self.version = None
+
+    @property
+    def loaded(self):
+        """bool: True once the components have been loaded successfully."""
+        return self._components is not None
+
+    def load(self):
+        """
+        Returns the shared model components, loading them on first use.
+
+        Loading happens under a lock so concurrent sessions trigger it only
+        once. A failed load (missing files) is not cached, so it is retried
+        on the next call.
+
+        Returns:
+            tuple: (pu, qi, bu, bi, global_mean, mappings) or None if
+            files are missing.
+        """
+        components = self._components
+        if components is not None:
+            return components
+
+        with self._lock:
+            if self._components is None:
+                start = time.perf_counter()
+                components = load_optimized_components(self.models_dir)
+                if components is not None:
+                    self.load_time = time.perf_counter() - start
+                    self.version = next(_MODEL_VERSIONS)
+                    self._components = components
+            return self._components
+
+    def reload(self):
+        """
+        Drops the loaded components and loads them again from disk.
+
+        Returns:
+            tuple: (pu, qi, bu, bi, global_mean, mappings) or None if
+            files are missing.
+        """
+        with self._lock:
+            self._components = None
+            self._item_catalog = None
+            self._genre_centroids = None
+            self.load_time = None
+            self.version = None
+        return self.load()
+
+    def item_catalog(self):
+        """
+        Returns the movie catalog aligned with the model's inner IDs.
+
+        Row `i` of the catalog describes inner item `i`: its `movie_ids`
+        array is the precomputed inner-to-raw ID list and its `index` maps a
+        raw movieId to the inner ID. Built once per loaded model.
+
+        Returns:
+            Catalog: The aligned catalog, or None if the model is missing.
+        """
+        item_catalog = self._item_catalog
+        if item_catalog is not None:
+            return item_catalog
+
+        with self._lock:
+            if self._item_catalog is None:
+                components = self.load()
+                if components is None:
+                    return None
+                raw_item_ids = _raw_item_ids(components[5])
+                self._item_catalog = load_catalog().align(raw_item_ids)
+            return self._item_catalog
+
+    def genre_matrix(self):
+        """
+        Returns the genre multi-hot matrix aligned with the model's inner IDs.
+
+        Columns follow `utils.GENRE_VOCAB`.
+
+        Returns:
+            np.ndarray: uint8 matrix of shape (n_items, len(GENRE_VOCAB)),
+            or None if the model is missing.
+        """
+        item_catalog = self.item_catalog()
+        if item_catalog is None:
+            return None
+        return item_catalog.genre_matrix
+
+    def genre_centroids(self):
+        """
+        Returns the latent centroid of every genre.
+
+        Loaded from the file written at export time by `optimize_model`; if
+        it is missing (or was built for another genre vocabulary) the
+        centroids are computed from the aligned catalog without weights.
+
+        Returns:
+            np.ndarray: float64 matrix of shape (len(GENRE_VOCAB), n_factors),
+            or None if the model is missing.
+        """
+        centroids = self._genre_centroids
+        if centroids is not None:
+            return centroids
+
+        with self._lock:
+            if self._genre_centroids is None:
+                components = self.load()
+                if components is None:
+                    return None
+                qi = components[1]
+                path = os.path.join(self.models_dir, GENRE_CENTROIDS_FILE)
+                centroids = None
+                if os.path.exists(path):
+                    centroids = np.load(path).astype(np.float64)
+                    if centroids.shape != (len(GENRE_VOCAB), qi.shape[1]):
+                        print(f"Ignoring {path}: built for another model.")
+                        centroids = None
+                if centroids is None:
+                    centroids = compute_genre_centroids(qi, self.genre_matrix())
+                self._genre_centroids = centroids
+            return self._genre_centroids
+
+    def memory_footprint(self):
+        """
+        Reports the memory used by the loaded components.
+
+        Memory-mapped arrays are reported separately because their pages are
+        shared with the OS page cache and only become resident when touched.
+
+        Returns:
+            dict: Byte counts per component plus "mapped" and "heap" totals,
+            or an empty dict if nothing is loaded.
+        """
+        components = self._components
+        if components is None:
+            return {}
+
+        pu, qi, bu, bi, global_mean, mappings = components
+        footprint = {
+            "pu": pu.nbytes,
+            "qi": qi.nbytes,
+            "bu": bu.nbytes,
+            "bi": bi.nbytes,
+            "global_mean": sys.getsizeof(global_mean),
+            "mappings": _mapping_size(mappings),
+        }
+        item_catalog = self._item_catalog
+        footprint["item_catalog"] = (
+            item_catalog.movie_ids.nbytes
+            + item_catalog.years.nbytes
+            + item_catalog.genre_matrix.nbytes
+            if item_catalog is not None
+            else 0
+        )
+        footprint["mapped"] = sum(
+            footprint[name] for name in ("pu", "qi", "bu", "bi")
+        )
+        footprint["heap"] = (
+            footprint["global_mean"]
+            + footprint["mappings"]
+            + footprint["item_catalog"]
+        )
+        return footprint
+
+    def stats(self):
+        """
+        Returns load-time and memory statistics for monitoring.
+
+        Returns:
+            dict: {"loaded", "load_time", "memory"}.
+        """
+        return {
+            "loaded": self.loaded,
+            "load_time": self.load_time,
+            "memory": self.memory_footprint(),
+        }
+
+
+def compute_genre_centroids(qi, genre_matrix, weights=None):
+    """
+    Computes the latent centroid of every genre.
+
+    The centroid of a genre is the weighted mean of the factor vectors (qi
+    rows) of its movies. Used as the user vector of cold-start users, it
+    favours movies close to the genres they picked at registration.
+
+    Args:
+        qi (np.ndarray): Item latent factors matrix.
+        genre_matrix (np.ndarray): Multi-hot genres aligned with qi rows
+            (columns follow utils.GENRE_VOCAB).
+        weights (np.ndarray): Optional weight per item, e.g. its number of
+            training ratings so that popular movies dominate the centroid.
+
+    Returns:
+        np.ndarray: float64 matrix of shape (len(GENRE_VOCAB), n_factors);
+        genres without movies get a zero centroid.
+    """
+    members = np.asarray(genre_matrix, dtype=np.float64)
+    if weights is not None:
+        members = members * np.asarray(weights, dtype=np.float64)[:, None]
+    totals = members.sum(axis=0)
+    sums = members.T @ np.asarray(qi, dtype=np.float64)
+    return np.divide(
+        sums,
+        totals[:, None],
+        out=np.zeros_like(sums),
+        where=totals[:, None] > 0,
+    )
+
+
+def save_genre_centroids(models_dir, qi, weights):
+    """
+    Computes and saves the genre centroids of an exported model.
+
+    Args:
+        models_dir (str): Directory of the optimized model files; their ID
+            mappings align the catalog genres with the qi rows.
+        qi (np.ndarray): Item latent factors matrix.
+        weights (np.ndarray): Number of training ratings of each item.
+    """
+    genre_matrix = ModelStore(models_dir).genre_matrix()
+    centroids = compute_genre_centroids(qi, genre_matrix, weights)
+    np.save(
+        os.path.join(models_dir, GENRE_CENTROIDS_FILE),
+        centroids.astype(np.float32),
+    )
+    print(f"Saved {GENRE_CENTROIDS_FILE}")
+
+
+def cold_start_factors(favorite_genres, centroids):
+    """
+    Builds the user vector of a user without ratings from their genres.
+
+    Args:
+        favorite_genres (list): Favourite genres (English names).
+        centroids (np.ndarray): Genre centroids, see `compute_genre_centroids`.
+
+    Returns:
+        np.ndarray: The mean centroid of the known genres, or zeros if none
+        of the genres is known.
+    """
+    columns = [
+        GENRE_INDEX[g] for g in favorite_genres or () if g in GENRE_INDEX
+    ]
+    if not columns:
+        return np.zeros(centroids.shape[1])
+    return centroids[columns].mean(axis=0)
+
+
+def _mapping_size(mappings):
+    """
+    Approximates the heap size of the raw-to-inner ID mappings.
+
+    Args:
+        mappings (dict): {"users": {...}, "items": {...}}.
+
+    Returns:
+        int: Size in bytes of the dictionaries, their keys and values.
+    """
+    total = sys.getsizeof(mappings)
+    for table in mappings.values():
+        total += sys.getsizeof(table)
+        for raw_id, inner_id in table.items():
+            total += sys.getsizeof(raw_id) + sys.getsizeof(inner_id)
+    return total
+
+
+_MODEL_STORE = None
+_MODEL_STORE_LOCK = threading.Lock()
+
+
+def get_model_store():
+    """
+    Returns the process-wide ModelStore, creating it on first use.
+
+    Returns:
+        ModelStore: The shared model store.
+    """
+    global _MODEL_STORE
+    if _MODEL_STORE is None:
+        with _MODEL_STORE_LOCK:
+            if _MODEL_STORE is None:
+                _MODEL_STORE = ModelStore()
+    return _MODEL_STORE
+
+
+def _lookup_inner_id(raw_id, item_map):
+    """
+    Resolves a raw movie ID to the model's inner item ID.
+
+    Mappings keys might be strings or ints depending on how they were saved,
+    so the lookup tries the raw value, its string form and its integer form.
+
+    Args:
+        raw_id: The raw movie ID (int, str or float-as-int).
+        item_map (dict): Mapping of raw item IDs to inner IDs.
+
+    Returns:
+        int or None: The inner ID, or None if the movie is unknown to the model.
+    """
+    # 1. Direct lookup
+    if raw_id in item_map:
+        return item_map[raw_id]
+
+    # 2. String lookup
+    s_id = str(raw_id)
+    if s_id in item_map:
+        return item_map[s_id]
+
+    # 3. Int -> String lookup (handles 1.0 -> '1')
+    try:
+        int_id = int(raw_id)
+    except (ValueError, TypeError):
+        return None
+    if int_id in item_map:
+        return item_map[int_id]
+    return item_map.get(str(int_id))
+
+
+def _rating_arrays(user_ratings):
+    """
+    Returns the (movie_ids, ratings) arrays of a user's ratings.
+
+    Args:
+        user_ratings (pd.DataFrame or tuple): A DataFrame with movie_id and
+            rating columns, or the (movie_ids, ratings) arrays returned by
+            `database.get_user_rating_arrays`.
+
+    Returns:
+        tuple: (movie_ids, ratings) as NumPy arrays.
+    """
+    if isinstance(user_ratings, pd.DataFrame):
+        return user_ratings["movie_id"].values, user_ratings["rating"].values
+    movie_ids, ratings = user_ratings
+    return np.asarray(movie_ids), np.asarray(ratings)
+
+
+def _collect_samples(user_ratings, item_map):
+    """
+    Converts a user's ratings into (inner_ids, ratings) training arrays.
+
+    Ratings of movies unknown to the model are dropped.
+
+    Args:
+        user_ratings (pd.DataFrame or tuple): The user's ratings, see
+            `_rating_arrays`.
+        item_map (dict): Mapping of raw item IDs to inner IDs.
+
+    Returns:
+        tuple: (inner_ids, ratings) as int64 and float64 arrays.
+    """
+    movie_ids, ratings = _rating_arrays(user_ratings)
+    if len(movie_ids) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    inner_ids = _map_inner_ids(movie_ids, item_map)
+    known = inner_ids >= 0
+    return inner_ids[known], ratings[known].astype(np.float64)
+
+
+def _solve_ridge(X, y, reg):
+    """
+    Solves a stack of regularized least-squares problems in one call.
+
+    For each problem the SGD updates of `fold_in_user` apply the penalty
+    once per rating, so the equivalent closed-form objective is
+    ||y - Xw||^2 + reg * n * ||w||^2, with n the number of ratings.
+
+    Args:
+        X (np.ndarray): Design matrices of shape (batch, n, n_factors + 1),
+            item factors with a trailing column of ones for the user bias.
+        y (np.ndarray): Targets of shape (batch, n): rating minus the
+            global mean and item bias.
+        reg (float): Regularization term.
+
+    Returns:
+        np.ndarray: Solutions of shape (batch, n_factors + 1), user factors
+        followed by the user bias.
+    """
+    n_samples = X.shape[1]
+    A = np.matmul(X.transpose(0, 2, 1), X)
+    A += reg * n_samples * np.eye(X.shape[2])
+    b = np.matmul(X.transpose(0, 2, 1), y[:, :, None])
+    return np.linalg.solve(A, b)[:, :, 0]
+
+
+def _design_matrix(qi, inner_ids):
+    """
+    Builds the ridge design matrix [qi | 1] for the given items.
+
+    Args:
+        qi (np.ndarray): Item latent factors matrix.
+        inner_ids (np.ndarray): Inner item IDs, of any shape.
+
+    Returns:
+        np.ndarray: Array of shape inner_ids.shape + (n_factors + 1,).
+    """
+    factors = np.asarray(qi[inner_ids.ravel()], dtype=np.float64)
+    ones = np.ones((factors.shape[0], 1))
+    X = np.concatenate([factors, ones], axis=1)
+    return X.reshape(inner_ids.shape + (X.shape[1],))
+
+
 def fold_in_user(
-    user_ratings_df,
+    user_ratings,
     qi,
     bi,
     global_mean,
@@ -132,32 +624,64 @@ def fold_in_user(
     n_epochs=100,
     lr=0.01,
     reg=0.05,
+    solver="ridge",
+    prior=None,
 ):
     """
     Optimizes the user latent factors (pu) and user bias (bu) for a specific user
     based on their current ratings.
 
-    This performs a mini-SGD 'fold-in' process at runtime, allowing the model
+    This performs a 'fold-in' process at runtime, allowing the model
     to generate personalized recommendations for users who rated items after
     the model was trained, or to update recommendations immediately after a new rating.
 
+    Two solvers are available:
+    - "ridge": solves the regularized least-squares problem that the SGD loop
+      converges to in a single vectorized call. Its cost does not depend on
+      `n_epochs` or `lr`.
+    - "sgd": the original per-rating SGD loop, kept for parity checks.
+
     Args:
-        user_ratings_df (pd.DataFrame): The user's ratings.
+        user_ratings (pd.DataFrame or tuple): The user's ratings, either a
+            DataFrame (movie_id, rating) or the (movie_ids, ratings) arrays
+            returned by `database.get_user_rating_arrays`.
         qi (np.ndarray): Item latent factors matrix.
         bi (np.ndarray): Item bias vector.
         global_mean (float): Global mean rating.
         mappings (dict): Dictionaries mapping raw IDs to inner IDs.
-        n_epochs (int): Number of SGD iterations.
-        lr (float): Learning rate.
+        n_epochs (int): Number of SGD iterations (sgd solver only).
+        lr (float): Learning rate (sgd solver only).
         reg (float): Regularization term.
+        solver (str): "ridge" or "sgd".
+        prior (tuple): Optional (pu, bu) the solution is shrunk towards
+            instead of zero, e.g. the trained factors of a MovieLens user
+            (ridge solver only).
 
     Returns:
         tuple: (pu, bu) where pu is the user factor vector and bu is the user bias.
+
+    Raises:
+        ValueError: If the solver is unknown, or a prior is given to the
+        sgd solver.
     """
-    """
-    Optimizes the user latent factors (pu) and user bias (bu) for a specific user
-    based on their current ratings, performing a mini SGD 'fold-in' at runtime.
-    """
+    if solver not in ("ridge", "sgd"):
+        raise ValueError(f"Unknown fold-in solver: {solver}")
+    if prior is not None and solver != "ridge":
+        raise ValueError("A fold-in prior requires the ridge solver")
+
+    inner_ids, ratings = _collect_samples(user_ratings, mappings["items"])
+
+    if solver == "ridge":
+        if prior is not None:
+            state = FoldInState.build(inner_ids, ratings, qi, bi, global_mean)
+            return state.solve(reg, prior=prior)
+        if len(inner_ids) == 0:
+            return np.zeros(qi.shape[1]), 0.0
+        X = _design_matrix(qi, inner_ids[None, :])
+        y = ratings - global_mean - np.asarray(bi[inner_ids])
+        w = _solve_ridge(X, y[None, :], reg)[0]
+        return w[:-1], float(w[-1])
+
     n_factors = qi.shape[1]
     # Initialize with small random values to break symmetry
     # Use a fixed seed to ensure determinism for the same input
@@ -165,43 +689,11 @@ def fold_in_user(
     pu = rng.normal(0, 0.1, n_factors)
     bu = 0.0
 
-    # Prepare training samples from user ratings
-    samples = []
-
-    # Mappings keys might be strings or ints depending on how they were saved.
-    item_map = mappings["items"]
-
-    for _, row in user_ratings_df.iterrows():
-        raw_id = row["movie_id"]
-        inner_id = None
-
-        # Robust lookup: handle int, string, float-as-int
-        # 1. Direct lookup
-        if raw_id in item_map:
-            inner_id = item_map[raw_id]
-        else:
-            # 2. String lookup
-            s_id = str(raw_id)
-            if s_id in item_map:
-                inner_id = item_map[s_id]
-            else:
-                # 3. Int -> String lookup (handles 1.0 -> '1')
-                try:
-                    int_id = int(raw_id)
-                    s_int_id = str(int_id)
-                    if int_id in item_map:
-                        inner_id = item_map[int_id]
-                    elif s_int_id in item_map:
-                        inner_id = item_map[s_int_id]
-                except (ValueError, TypeError):
-                    pass
-
-        if inner_id is not None:
-            samples.append((inner_id, float(row["rating"])))
-
-    if not samples:
+    if len(inner_ids) == 0:
         return pu, bu
 
+    samples = list(zip(inner_ids.tolist(), ratings.tolist(), strict=True))
+
     # SGD Optimization
     for _ in range(n_epochs):
         for i, r in samples:
@@ -218,7 +710,603 @@ def fold_in_user(
 
     return pu, bu
 
-    return pu, bu
+
+def _map_inner_ids(movie_ids, item_map):
+    """
+    Vectorized raw-to-inner ID lookup for many ratings at once.
+
+    Each distinct movie is resolved once with `_lookup_inner_id`, so the cost
+    scales with the number of distinct movies rather than ratings.
+
+    Args:
+        movie_ids (array-like): Raw movie IDs.
+        item_map (dict): Mapping of raw item IDs to inner IDs.
+
+    Returns:
+        np.ndarray: Inner IDs (int64), -1 for movies unknown to the model.
+    """
+    unique_ids, inverse = np.unique(np.asarray(movie_ids), return_inverse=True)
+    lookup = np.full(len(unique_ids), -1, dtype=np.int64)
+    for pos, raw_id in enumerate(unique_ids.tolist()):
+        inner_id = _lookup_inner_id(raw_id, item_map)
+        if inner_id is not None:
+            lookup[pos] = inner_id
+    return lookup[inverse]
+
+
+def fold_in_users(
+    ratings_df,
+    qi,
+    bi,
+    global_mean,
+    mappings,
+    reg=0.05,
+    block_rows=500_000,
+):
+    """
+    Folds in many users at once with the closed-form ridge solver.
+
+    This is the batched counterpart of `fold_in_user(..., solver="ridge")`,
+    meant for bulk refreshes such as re-scoring every app user after a model
+    publish. Users are grouped by their number of known ratings so that each
+    group is solved as one stack of equally sized problems, without padding.
+    Groups are processed in blocks of at most `block_rows` ratings to keep
+    the stacked design matrices bounded in memory.
+
+    Args:
+        ratings_df (pd.DataFrame): Ratings of many users (user_id, movie_id,
+            rating), e.g. the output of `database.get_all_ratings`.
+        qi (np.ndarray): Item latent factors matrix.
+        bi (np.ndarray): Item bias vector.
+        global_mean (float): Global mean rating.
+        mappings (dict): Dictionaries mapping raw IDs to inner IDs.
+        reg (float): Regularization term.
+        block_rows (int): Maximum number of ratings solved per block.
+
+    Returns:
+        tuple: (user_ids, pu, bu) where user_ids is the sorted array of users,
+        pu has one factor row per user and bu one bias per user. Users
+        without any known movie get zero factors and bias, like
+        `fold_in_user`.
+    """
+    n_factors = qi.shape[1]
+    user_ids, user_index = np.unique(
+        ratings_df["user_id"].values, return_inverse=True
+    )
+    pu = np.zeros((len(user_ids), n_factors))
+    bu = np.zeros(len(user_ids))
+
+    inner_ids = _map_inner_ids(ratings_df["movie_id"].values, mappings["items"])
+    known = inner_ids >= 0
+    user_index = user_index[known]
+    inner_ids = inner_ids[known]
+    targets = (
+        ratings_df["rating"].values[known].astype(np.float64)
+        - global_mean
+        - np.asarray(bi[inner_ids])
+    )
+
+    # Lay out the ratings contiguously per user
+    order = np.argsort(user_index, kind="stable")
+    inner_ids = inner_ids[order]
+    targets = targets[order]
+    counts = np.bincount(user_index, minlength=len(user_ids))
+    starts = np.cumsum(counts) - counts
+
+    for count in np.unique(counts[counts > 0]):
+        group = np.flatnonzero(counts == count)
+        users_per_block = max(1, block_rows // count)
+        for lo in range(0, len(group), users_per_block):
+            block = group[lo : lo + users_per_block]
+            rows = starts[block][:, None] + np.arange(count)
+            X = _design_matrix(qi, inner_ids[rows])
+            w = _solve_ridge(X, targets[rows], reg)
+            pu[block] = w[:, :-1]
+            bu[block] = w[:, -1]
+
+    return user_ids, pu, bu
+
+
+class FoldInState:
+    """
+    Sufficient statistics of a user's ridge fold-in.
+
+    The ridge solution only depends on the Gram matrix XᵀX and on Xᵀy of
+    the user's design matrix, so keeping them lets a new or changed rating
+    be folded in with a rank-one correction instead of rebuilding them from
+    every rating.
+    """
+
+    def __init__(self, inner_ids, ratings, gram, rhs, updates=0):
+        """
+        Args:
+            inner_ids (np.ndarray): Sorted inner IDs of the rated items.
+            ratings (np.ndarray): Ratings aligned with `inner_ids`.
+            gram (np.ndarray): XᵀX, of shape (n_factors + 1, n_factors + 1).
+            rhs (np.ndarray): Xᵀy, of shape (n_factors + 1,).
+            updates (int): Ratings folded in since the last full solve.
+        """
+        self.inner_ids = inner_ids
+        self.ratings = ratings
+        self.gram = gram
+        self.rhs = rhs
+        self.updates = updates
+
+    @property
+    def nbytes(self):
+        """int: Memory held by the arrays (used by the LRU cache cap)."""
+        return (
+            self.inner_ids.nbytes
+            + self.ratings.nbytes
+            + self.gram.nbytes
+            + self.rhs.nbytes
+        )
+
+    @classmethod
+    def build(cls, inner_ids, ratings, qi, bi, global_mean):
+        """
+        Computes the statistics from scratch.
+
+        Args:
+            inner_ids (np.ndarray): Inner IDs of the rated items.
+            ratings (np.ndarray): The ratings.
+            qi (np.ndarray): Item latent factors matrix.
+            bi (np.ndarray): Item bias vector.
+            global_mean (float): Global mean rating.
+
+        Returns:
+            FoldInState: The new state.
+        """
+        order = np.argsort(inner_ids)
+        inner_ids, ratings = inner_ids[order], ratings[order]
+        X = _design_matrix(qi, inner_ids)
+        y = ratings - global_mean - np.asarray(bi[inner_ids])
+        return cls(inner_ids, ratings, X.T @ X, X.T @ y)
+
+    def solve(self, reg, prior=None):
+        """
+        Solves the ridge problem of `fold_in_user` from the statistics.
+
+        With a prior (pu0, bu0) the penalty becomes reg * n * ||w - w0||^2,
+        so the solution starts at the prior and moves towards the ratings.
+
+        Args:
+            reg (float): Regularization term.
+            prior (tuple): Optional (pu, bu) to shrink towards instead of 0.
+
+        Returns:
+            tuple: (pu, bu) where pu is the user factor vector and bu is the
+            user bias.
+        """
+        n_samples = len(self.inner_ids)
+        w0 = np.zeros(len(self.rhs))
+        if prior is not None:
+            w0[:-1] = prior[0]
+            w0[-1] = prior[1]
+        if n_samples == 0:
+            return w0[:-1], float(w0[-1])
+        A = self.gram + reg * n_samples * np.eye(len(self.rhs))
+        w = np.linalg.solve(A, self.rhs + reg * n_samples * w0)
+        return w[:-1], float(w[-1])
+
+
+def fold_in_user_incremental(
+    user_ratings,
+    qi,
+    bi,
+    global_mean,
+    mappings,
+    state=None,
+    reg=0.05,
+    resolve_every=FOLD_IN_RESOLVE_EVERY,
+    prior=None,
+):
+    """
+    Warm-started ridge fold-in that reuses the statistics of a previous call.
+
+    The difference between the current ratings and those in `state` (new,
+    changed or removed ratings) is applied to the Gram matrix and Xᵀy as
+    low-rank corrections, then only the small (n_factors + 1) system is
+    solved again, so the cost no longer grows with the number of ratings.
+    The statistics are rebuilt from scratch after `resolve_every` corrections
+    to bound the accumulated floating-point drift, or when most ratings
+    changed. The result matches `fold_in_user(..., solver="ridge")`.
+
+    Args:
+        user_ratings (pd.DataFrame or tuple): The user's ratings, see
+            `fold_in_user`.
+        qi (np.ndarray): Item latent factors matrix.
+        bi (np.ndarray): Item bias vector.
+        global_mean (float): Global mean rating.
+        mappings (dict): Dictionaries mapping raw IDs to inner IDs.
+        state (FoldInState): State returned by the previous call for the
+            same user and model, or None.
+        reg (float): Regularization term.
+        resolve_every (int): Corrections allowed before a full rebuild.
+        prior (tuple): Optional (pu, bu) to shrink towards, see
+            `fold_in_user`.
+
+    Returns:
+        tuple: (pu, bu, state) with the updated FoldInState.
+    """
+    inner_ids, ratings = _collect_samples(user_ratings, mappings["items"])
+    order = np.argsort(inner_ids)
+    inner_ids, ratings = inner_ids[order], ratings[order]
+
+    if state is None or state.updates >= resolve_every:
+        state = FoldInState.build(inner_ids, ratings, qi, bi, global_mean)
+        return state.solve(reg, prior=prior) + (state,)
+
+    old_ids, old_ratings = state.inner_ids, state.ratings
+    if len(old_ids) > 0:
+        pos = np.minimum(np.searchsorted(old_ids, inner_ids), len(old_ids) - 1)
+        in_old = old_ids[pos] == inner_ids
+        changed = in_old & (old_ratings[pos] != ratings)
+    else:
+        # old_ratings[pos] would index an empty array
+        pos = np.zeros(len(inner_ids), dtype=np.int64)
+        in_old = np.zeros(len(inner_ids), dtype=bool)
+        changed = np.zeros(len(inner_ids), dtype=bool)
+    added = ~in_old
+    removed = ~np.isin(old_ids, inner_ids)
+
+    n_changes = int(added.sum() + changed.sum() + removed.sum())
+    if n_changes * 2 > len(inner_ids):
+        state = FoldInState.build(inner_ids, ratings, qi, bi, global_mean)
+        return state.solve(reg, prior=prior) + (state,)
+
+    gram = state.gram.copy()
+    rhs = state.rhs.copy()
+    for ids, targets, sign in (
+        (inner_ids[added], ratings[added], 1.0),
+        (old_ids[removed], old_ratings[removed], -1.0),
+    ):
+        if len(ids) > 0:
+            X = _design_matrix(qi, ids)
+            y = targets - global_mean - np.asarray(bi[ids])
+            gram += sign * (X.T @ X)
+            rhs += sign * (X.T @ y)
+    if changed.any():
+        # Same items, so only Xᵀy moves by the change of the targets
+        X = _design_matrix(qi, inner_ids[changed])
+        rhs += X.T @ (ratings[changed] - old_ratings[pos[changed]])
+
+    state = FoldInState(
+        inner_ids, ratings, gram, rhs, state.updates + n_changes
+    )
+    return state.solve(reg, prior=prior) + (state,)
+
+
+def _raw_item_ids(mappings):
+    """
+    Builds the inner-to-raw item ID array from the ID mappings.
+
+    Args:
+        mappings (dict): Dictionaries mapping raw IDs to inner IDs.
+
+    Returns:
+        np.ndarray: Raw movie IDs (int64) indexed by inner ID, -1 if unknown.
+    """
+    raw_item_ids = np.full(len(mappings["items"]), -1, dtype=np.int64)
+    for raw_id, inner_id in mappings["items"].items():
+        if inner_id < len(raw_item_ids):
+            try:
+                raw_item_ids[inner_id] = int(raw_id)
+            except (ValueError, TypeError):
+                pass
+    return raw_item_ids
+
+
+def _top_n_rows(values, indices, n):
+    """
+    Keeps the n largest values of every row (unordered).
+
+    Args:
+        values (np.ndarray): Scores of shape (rows, candidates).
+        indices (np.ndarray): Item indices aligned with `values`.
+        n (int): Number of entries to keep per row.
+
+    Returns:
+        tuple: (values, indices) of shape (rows, min(n, candidates)).
+    """
+    if n <= 0:
+        return values[:, :0], indices[:, :0]
+    if values.shape[1] <= n:
+        return values, indices
+    keep = np.argpartition(values, -n, axis=1)[:, -n:]
+    return (
+        np.take_along_axis(values, keep, axis=1),
+        np.take_along_axis(indices, keep, axis=1),
+    )
+
+
+def recommend_batch(
+    user_ids,
+    n=10,
+    pu=None,
+    bu=None,
+    exclude=None,
+    user_block=1024,
+    item_block=8192,
+):
+    """
+    Computes top-N SVD recommendations for many users at once.
+
+    Users are scored in blocks of `user_block` rows against blocks of
+    `item_block` items with a single matrix product per block pair. Each item
+    block only contributes its per-row top-N candidates (`argpartition`), so
+    peak memory is bounded by user_block x item_block scores regardless of
+    the catalog size.
+
+    Items are ranked by the raw SVD estimate and the returned scores are
+    clipped to [1, 5], as displayed by `get_recommendations`.
+
+    Args:
+        user_ids (array-like): Raw user IDs to recommend for.
+        n (int): Number of recommendations per user.
+        pu (np.ndarray): Optional user factors, one row per entry of
+            `user_ids` (e.g. from `fold_in_users`). Defaults to the trained
+            factors of users present in the model; unknown users get zeros.
+        bu (np.ndarray): Optional user biases aligned with `pu`.
+        exclude (dict): Optional mapping of user ID to the raw movie IDs
+            that must not be recommended (typically the rated ones).
+        user_block (int): Number of users scored per block.
+        item_block (int): Number of items scored per block.
+
+    Returns:
+        tuple: (item_ids, scores), arrays of shape (len(user_ids), n) sorted by
+        descending score. Rows are padded with -1 / NaN when fewer than n
+        items are left after exclusions.
+
+    Raises:
+        FileNotFoundError: If the optimized model components are missing.
+    """
+    components = get_model_store().load()
+    if components is None:
+        raise FileNotFoundError("Optimized model components not found.")
+    model_pu, qi, model_bu, bi, global_mean, mappings = components
+
+    user_ids = np.asarray(user_ids)
+    n_items = qi.shape[0]
+    n = min(n, n_items)
+
+    if pu is None:
+        # Use the trained factors of known users, zeros for the rest
+        user_inner = _map_inner_ids(user_ids, mappings["users"])
+        known = user_inner >= 0
+        pu = np.zeros((len(user_ids), qi.shape[1]))
+        bu = np.zeros(len(user_ids))
+        pu[known] = model_pu[user_inner[known]]
+        bu[known] = model_bu[user_inner[known]]
+    elif bu is None:
+        bu = np.zeros(len(user_ids))
+
+    raw_item_ids = _raw_item_ids(mappings)
+    item_ids = np.full((len(user_ids), n), -1, dtype=np.int64)
+    scores = np.full((len(user_ids), n), np.nan)
+
+    for u_lo in range(0, len(user_ids), user_block):
+        u_hi = min(u_lo + user_block, len(user_ids))
+        block_pu = np.asarray(pu[u_lo:u_hi], dtype=np.float64)
+        block_bias = np.asarray(bu[u_lo:u_hi], dtype=np.float64) + global_mean
+
+        # (row, inner item) pairs to mask in this user block
+        ex_rows, ex_cols = [], []
+        if exclude:
+            for row, user_id in enumerate(user_ids[u_lo:u_hi].tolist()):
+                rated = exclude.get(user_id)
+                if rated is None or len(rated) == 0:
+                    continue
+                inner = _map_inner_ids(list(rated), mappings["items"])
+                inner = inner[inner >= 0]
+                ex_rows.append(np.full(len(inner), row))
+                ex_cols.append(inner)
+        ex_rows = np.concatenate(ex_rows) if ex_rows else np.empty(0, int)
+        ex_cols = np.concatenate(ex_cols) if ex_cols else np.empty(0, int)
+
+        best_val = np.empty((u_hi - u_lo, 0))
+        best_idx = np.empty((u_hi - u_lo, 0), dtype=np.int64)
+        for i_lo in range(0, n_items, item_block):
+            i_hi = min(i_lo + item_block, n_items)
+            block_scores = block_pu @ np.asarray(qi[i_lo:i_hi]).T
+            block_scores += np.asarray(bi[i_lo:i_hi])
+            block_scores += block_bias[:, None]
+
+            in_block = (ex_cols >= i_lo) & (ex_cols < i_hi)
+            block_scores[ex_rows[in_block], ex_cols[in_block] - i_lo] = -np.inf
+
+            candidates = np.broadcast_to(
+                np.arange(i_lo, i_hi), block_scores.shape
+            )
+            cand_val, cand_idx = _top_n_rows(block_scores, candidates, n)
+            best_val, best_idx = _top_n_rows(
+                np.concatenate([best_val, cand_val], axis=1),
+                np.concatenate([best_idx, cand_idx], axis=1),
+                n,
+            )
+
+        order = np.argsort(-best_val, axis=1, kind="stable")
+        best_val = np.take_along_axis(best_val, order, axis=1)
+        best_idx = np.take_along_axis(best_idx, order, axis=1)
+        valid = np.isfinite(best_val)
+        item_ids[u_lo:u_hi] = np.where(valid, raw_item_ids[best_idx], -1)
+        scores[u_lo:u_hi] = np.where(valid, np.clip(best_val, 1.0, 5.0), np.nan)
+
+    return item_ids, scores
+
+
+_FOLD_IN_CACHE = LRUCache(
+    max_entries=FOLD_IN_CACHE_ENTRIES, max_bytes=FOLD_IN_CACHE_BYTES
+)
+
+
+def stored_user_factors(movielens_user_id, components):
+    """
+    Returns the trained factors of a MovieLens user of the training set.
+
+    Args:
+        movielens_user_id (int): The MovieLens userId.
+        components (tuple): The model components (see ModelStore.load).
+
+    Returns:
+        tuple: (pu, bu), or None if the user is not in the training set.
+    """
+    pu, qi, bu, bi, global_mean, mappings = components
+    inner_id = _lookup_inner_id(movielens_user_id, mappings["users"])
+    if inner_id is None:
+        return None
+    return np.array(pu[inner_id], dtype=np.float64), float(bu[inner_id])
+
+
+def is_known_movielens_user(movielens_user_id):
+    """
+    Checks whether a MovieLens user has trained factors in the loaded model.
+
+    Args:
+        movielens_user_id (int): The MovieLens userId.
+
+    Returns:
+        bool: True if the user was part of the training set.
+    """
+    components = get_model_store().load()
+    if components is None:
+        return False
+    return (
+        _lookup_inner_id(movielens_user_id, components[5]["users"]) is not None
+    )
+
+
+def get_user_profile(user_id, store=None):
+    """
+    Returns the folded-in factors of an app user, cached per ratings version.
+
+    The result is cached under the user's ratings version (bumped by every
+    rating write and by `delete_user`) and the model version, so repeated
+    recommendations skip both the ratings query and the solve until the
+    user rates something or the model is reloaded. Users with at least
+    INCREMENTAL_FOLD_IN_MIN_RATINGS ratings also keep their FoldInState, so
+    after a new rating only the difference is folded in.
+
+    Users without ratings get the mean latent centroid of their favourite
+    genres (see `cold_start_factors`).
+
+    App users linked to a MovieLens user of the training set start from
+    its trained factors: with no app ratings they are used directly (no
+    solve at all), otherwise the app ratings are folded in with the trained
+    factors as the ridge prior (unless BLEND_STORED_FACTORS is False).
+
+    Args:
+        user_id (int): The ID of the user.
+        store (ModelStore): The model store, defaults to the shared one.
+
+    Returns:
+        tuple: (pu, bu, rated_rows) where rated_rows are the inner IDs of the
+        movies the user already rated, or None if the model is missing.
+    """
+    store = store or get_model_store()
+    components = store.load()
+    if components is None:
+        return None
+
+    # Read the version first: a concurrent write then only invalidates
+    version = (get_ratings_version(user_id), store.version)
+    cached = _FOLD_IN_CACHE.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1:4]
+
+    pu, qi, bu, bi, global_mean, mappings = components
+    user_ratings = get_user_rating_arrays(user_id)
+    rated_rows = store.item_catalog().rows_of(user_ratings[0])
+    rated_rows = rated_rows[rated_rows >= 0]
+
+    # Trained factors of the linked MovieLens user, if any
+    stored = None
+    movielens_user_id = get_movielens_user_id(user_id)
+    if movielens_user_id is not None:
+        stored = stored_user_factors(movielens_user_id, components)
+
+    # Statistics of the previous fold-in, valid while the model is the same
+    state = None
+    if cached is not None and cached[0][1] == store.version:
+        state = cached[4]
+
+    if stored is not None and (
+        len(user_ratings[0]) == 0 or not BLEND_STORED_FACTORS
+    ):
+        # Known user: the trained factors need no solve
+        user_factors, user_bias = stored
+    elif (
+        state is not None or len(rated_rows) >= INCREMENTAL_FOLD_IN_MIN_RATINGS
+    ):
+        # Heavy raters: correct the previous solution for the new ratings
+        user_factors, user_bias, state = fold_in_user_incremental(
+            user_ratings,
+            qi,
+            bi,
+            global_mean,
+            mappings,
+            state=state,
+            prior=stored,
+        )
+    elif len(user_ratings[0]) > 0:
+        # Fold-in: dynamically compute user factors based on current ratings
+        user_factors, user_bias = fold_in_user(
+            user_ratings, qi, bi, global_mean, mappings, prior=stored
+        )
+    else:
+        # No ratings -> Cold Start from the favourite genres' centroids
+        user_factors = cold_start_factors(
+            get_user_genres(user_id), store.genre_centroids()
+        )
+        user_bias = 0.0
+
+    _FOLD_IN_CACHE.put(
+        user_id, (version, user_factors, user_bias, rated_rows, state)
+    )
+    return user_factors, user_bias, rated_rows
+
+
+def _genre_scores(genre_matrix, selected_genres):
+    """
+    Computes the genre coverage score of every item.
+
+    Coverage is |movie genres & selected genres| / |selected genres|, so
+    multi-genre movies aren't penalized if they match the request.
+
+    Args:
+        genre_matrix (np.ndarray): Multi-hot genre matrix aligned with inner
+            IDs.
+        selected_genres (list): Genres (EN) selected by the user.
+
+    Returns:
+        np.ndarray: Scores in [0, 1], one per item.
+    """
+    target_genres = set(selected_genres)
+    columns = sorted(GENRE_INDEX[g] for g in target_genres if g in GENRE_INDEX)
+    if not columns:
+        return np.zeros(genre_matrix.shape[0])
+    intersection = genre_matrix[:, columns].sum(axis=1, dtype=np.float64)
+    return intersection / len(target_genres)
+
+
+_RECOMMENDATION_CACHE = LRUCache(
+    max_entries=RECOMMENDATION_CACHE_ENTRIES,
+    max_bytes=RECOMMENDATION_CACHE_BYTES,
+    ttl=RECOMMENDATION_CACHE_TTL,
+)
+
+
+def get_cache_stats():
+    """
+    Returns the counters of the in-memory caches for monitoring.
+
+    Returns:
+        dict: LRUCache.stats() of the "recommendations" and "fold_in" caches.
+    """
+    return {
+        "recommendations": _RECOMMENDATION_CACHE.stats(),
+        "fold_in": _FOLD_IN_CACHE.stats(),
+    }
 
 
 def get_recommendations(user_id, n=10, selected_genres=None, alpha=0.5):
@@ -233,6 +1321,11 @@ def get_recommendations(user_id, n=10, selected_genres=None, alpha=0.5):
     It attempts to use the optimized components first, falling back to the standard
     Surprise model if optimization files are missing.
 
+    Results of the optimized path are cached for RECOMMENDATION_CACHE_TTL
+    seconds under (user, ratings version, genres, alpha, n, model version),
+    so toggling the genre filter back and forth is served from memory and
+    any new rating or model reload produces a fresh list.
+
     Args:
         user_id (int): The ID of the user.
         n (int): Number of recommendations to return.
@@ -242,40 +1335,96 @@ def get_recommendations(user_id, n=10, selected_genres=None, alpha=0.5):
     Returns:
         list: A list of dictionaries representing recommended movies.
     """
+    store = get_model_store()
+    if store.load() is None:
+        return _compute_recommendations(user_id, n, selected_genres, alpha)
+
+    key = (
+        user_id,
+        get_ratings_version(user_id),
+        tuple(sorted(set(selected_genres or ()))),
+        float(alpha),
+        n,
+        store.version,
+    )
+    cached = _RECOMMENDATION_CACHE.get(key)
+    if cached is None:
+        cached = _compute_recommendations(user_id, n, selected_genres, alpha)
+        _RECOMMENDATION_CACHE.put(key, cached)
+    # Callers may modify the returned dictionaries
+    return [dict(r) for r in cached]
+
+
+def _popular_recommendations(popular, n, selected_genres, exclude=None):
+    """
+    Builds recommendations from the precomputed popularity lists.
+
+    Args:
+        popular (PopularMovies): The popularity lists.
+        n (int): Number of recommendations to return.
+        selected_genres (list): Genres to draw from (all genres if empty).
+        exclude (array-like): Movie IDs to leave out.
+
+    Returns:
+        list: Dictionaries in the format of `get_recommendations`; "score"
+        is the smoothed mean rating and "hybrid_score" the popularity.
+    """
+    catalog = load_catalog()
+    movie_ids, scores, ratings = popular.top(n, selected_genres, exclude)
+    recommendations = []
+    for movie_id, score, rating in zip(movie_ids, scores, ratings, strict=True):
+        row = catalog.row(movie_id)
+        if row is None:
+            continue
+        movie = catalog.record(row)
+        recommendations.append(
+            {
+                "movieId": movie["movieId"],
+                "title": movie["title"],
+                "genres": movie["genres"],
+                "score": float(rating),
+                "hybrid_score": float(score),
+            }
+        )
+    return recommendations
+
+
+def _compute_recommendations(user_id, n, selected_genres, alpha):
     """
-    Generate recommendations for a user.
+    Computes the recommendations returned by `get_recommendations`.
+
     Args:
-        user_id: The ID of the user.
-        n: Number of recommendations to return.
-        selected_genres: List of genres to boost (Hybrid approach).
-        alpha: Weight for SVD score (0.0 - 1.0). 1.0 = Pure SVD, 0.0 = Pure Genre.
+        user_id (int): The ID of the user.
+        n (int): Number of recommendations to return.
+        selected_genres (list): List of genres to boost (Hybrid approach).
+        alpha (float): Weight for SVD score (0.0 - 1.0).
+
+    Returns:
+        list: A list of dictionaries representing recommended movies.
     """
-    # Try to load optimized components
-    components = load_optimized_components()
+    # Optimized components are loaded once per process and shared
+    components = get_model_store().load()
 
     if components:
         # Optimized path
         pu, qi, bu, bi, global_mean, mappings = components
-        movies_df = load_movies()
-
-        # Fetch user ratings to fold-in
-        user_ratings_df = get_user_ratings(user_id)
-        rated_movie_ids = (
-            set(user_ratings_df["movie_id"].values)
-            if not user_ratings_df.empty
-            else set()
-        )
-
-        # Determine User Factors
-        if not user_ratings_df.empty:
-            # Fold-in: dynamically compute user factors based on current ratings
-            user_factors, user_bias = fold_in_user(
-                user_ratings_df, qi, bi, global_mean, mappings
-            )
-        else:
-            # No ratings -> Pure Cold Start (Global Mean + Item Bias)
-            user_factors = np.zeros(qi.shape[1])
-            user_bias = 0.0
+        # Catalog aligned with inner ids (row i describes inner item i)
+        item_catalog = get_model_store().item_catalog()
+
+        # Folded-in user factors, cached until the user rates again
+        user_factors, user_bias, rated_rows = get_user_profile(user_id)
+
+        # Without ratings, genres or a linked history the model can only
+        # rank by item bias, which favours obscure movies: serve the
+        # precomputed popularity list instead
+        if len(rated_rows) == 0 and not np.any(user_factors):
+            popular = load_popular_movies()
+            if popular is not None:
+                # Ratings of movies the model does not know still count
+                rated_movie_ids = get_user_rating_arrays(user_id)[0]
+                return _popular_recommendations(
+                    popular, n, selected_genres, exclude=rated_movie_ids
+                )
 
         # Calculate scores
         # Score = global_mean + user_bias + bi + (qi . user_factors)
@@ -287,46 +1436,14 @@ def get_recommendations(user_id, n=10, selected_genres=None, alpha=0.5):
         # Clip scores to [1, 5]
         scores = np.clip(scores, 1.0, 5.0)
 
-        # Create reverse mapping (inner -> raw)
-        raw_item_ids = [None] * len(mappings["items"])
-        for raw_id, inner_id in mappings["items"].items():
-            if inner_id < len(raw_item_ids):
-                try:
-                    raw_item_ids[inner_id] = int(raw_id)
-                except (ValueError, TypeError):
-                    raw_item_ids[inner_id] = raw_id
-
         # --- HYBRID SCORING ---
         final_scores = scores.copy()  # Start with clipped SVD scores
 
         if selected_genres:
-            # Compute genre scores for ALL items
-            # Convert selected_genres to set
-            target_genres = set(selected_genres)
-
-            # Create a genre_score array aligned with inner_ids
-            # We need to map inner_id -> genres
-            # movies_df has 'movieId', 'genres'
-            # We can create a lookup array/list where index = inner_id
-
-            # Map movieId -> genres string
-            # This is fast
-            movie_genre_map = movies_df.set_index("movieId")["genres"].to_dict()
-
-            genre_scores = np.zeros(len(scores))
-
-            for inner_id in range(len(raw_item_ids)):
-                mid = raw_item_ids[inner_id]
-                g_str = movie_genre_map.get(mid)
-                if g_str and g_str != "(no genres listed)":
-                    # Calculate Jaccard or simple overlap
-                    m_genres = set(g_str.split("|"))
-                    if m_genres and target_genres:
-                        intersection = len(m_genres.intersection(target_genres))
-                        # Use Coverage metric: intersection / len(target_genres)
-                        # This ensures multi-genre movies aren't penalized if they match the request.
-                        score = intersection / len(target_genres)
-                        genre_scores[inner_id] = score
+            # Coverage of the selected genres for ALL items in one reduction
+            genre_scores = _genre_scores(
+                item_catalog.genre_matrix, selected_genres
+            )
 
             # Combine scores
             # Normalized SVD: SVD / 5.0  (0.2 - 1.0)
@@ -338,18 +1455,25 @@ def get_recommendations(user_id, n=10, selected_genres=None, alpha=0.5):
             # Use final_scores for ranking
             final_scores = (alpha * svd_norm) + ((1 - alpha) * genre_scores)
 
+        # Never recommend rated movies nor items without metadata
+        final_scores[rated_rows] = -np.inf
+        final_scores[~item_catalog.present] = -np.inf
+
         # Prepare results
         recommendations = []
 
         # Get top N indices based on final_scores (Hybrid or SVD)
         # We can use argpartition for efficiency if N is small compared to total items
+        n = min(n, len(final_scores))
+        if n <= 0:
+            # argpartition(..., -0)[-0:] would select every item
+            return []
         top_indices = np.argpartition(final_scores, -n)[-n:]
         # Sort these top indices
         top_indices = top_indices[np.argsort(final_scores[top_indices])[::-1]]
 
         for i in top_indices:
-            movie_id = raw_item_ids[i]
-            if movie_id in rated_movie_ids:
+            if final_scores[i] == -np.inf:
                 continue
 
             # We want to display the SVD predicted rating (clipped 1-5) as "Predicted Score"
@@ -357,38 +1481,39 @@ def get_recommendations(user_id, n=10, selected_genres=None, alpha=0.5):
             svd_score_val = scores[i]
             hybrid_score_val = final_scores[i]
 
-            # Get metadata
-            movie_row = movies_df[movies_df["movieId"] == movie_id]
-            if not movie_row.empty:
-                title = movie_row.iloc[0]["title"]
-                genres = movie_row.iloc[0]["genres"]
-                recommendations.append(
-                    {
-                        "movieId": movie_id,
-                        "title": title,
-                        "genres": genres,
-                        "score": float(svd_score_val),  # Display SVD score
-                        "hybrid_score": float(
-                            hybrid_score_val
-                        ),  # Internal ranking score
-                    }
-                )
+            # Metadata is an O(1) lookup in the aligned catalog
+            movie = item_catalog.record(i)
+            recommendations.append(
+                {
+                    "movieId": movie["movieId"],
+                    "title": movie["title"],
+                    "genres": movie["genres"],
+                    "score": float(svd_score_val),  # Display SVD score
+                    "hybrid_score": float(
+                        hybrid_score_val
+                    ),  # Internal ranking score
+                }
+            )
 
-        # If we filtered out some rated movies, we might have fewer than n.
-        return recommendations[:n]
+        return recommendations
 
     else:
+        # Without any model file, serve the popularity list rather than
+        # training a model inside the request
+        popular = load_popular_movies()
+        if not os.path.exists(MODEL_PATH) and popular is not None:
+            print("Model not found, serving the popularity fallback list...")
+            rated_movie_ids = get_user_rating_arrays(user_id)[0]
+            return _popular_recommendations(
+                popular, n, selected_genres, exclude=rated_movie_ids
+            )
+
         # Fallback to original slow method
         print("Optimized model not found, falling back to slow method...")
         algo = load_model()
         movies_df = load_movies()
         all_movie_ids = movies_df["movieId"].unique()
-        user_ratings_df = get_user_ratings(user_id)
-        rated_movie_ids = (
-            set(user_ratings_df["movie_id"].values)
-            if not user_ratings_df.empty
-            else set()
-        )
+        rated_movie_ids = set(get_user_rating_arrays(user_id)[0].tolist())
         predictions = []
         for movie_id in all_movie_ids:
             if movie_id not in rated_movie_ids:
@@ -398,12 +1523,12 @@ def get_recommendations(user_id, n=10, selected_genres=None, alpha=0.5):
                 predictions.append((movie_id, est))
         predictions.sort(key=lambda x: x[1], reverse=True)
         top_n = predictions[:n]
+        catalog = load_catalog()
         results = []
         for movie_id, score in top_n:
-            title = movies_df[movies_df["movieId"] == movie_id].iloc[0]["title"]
-            genres = movies_df[movies_df["movieId"] == movie_id].iloc[0][
-                "genres"
-            ]
+            row = catalog.row(movie_id)
+            title = catalog.titles[row]
+            genres = catalog.genres[row]
             results.append(
                 {
                     "movieId": movie_id,
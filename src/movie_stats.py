@@ -0,0 +1,440 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from src.catalog import _save_array
+from src.utils import GENRE_INDEX, GENRE_VOCAB
+
+STATS_FILE = "movie_stats.json"
+POPULARITY_FILE = "popular_movies.npz"
+
+# Ratings lose half of their weight every DECAY_HALF_LIFE_DAYS
+DECAY_HALF_LIFE_DAYS = 365
+# Length of the precomputed global and per-genre lists
+POPULAR_LIST_SIZE = 500
+
+
+def compute_movie_stats(ratings_file, catalog, chunksize=5_000_000):
+    """
+    Aggregates rating counts and mean ratings per movie.
+
+    ratings.csv is read in chunks and accumulated with `np.bincount`, so
+    memory stays bounded by the chunk size whatever the number of ratings.
+
+    Args:
+        ratings_file (str): Path to ratings.csv.
+        catalog (Catalog): The movie catalog the results are aligned with.
+        chunksize (int): Number of rows parsed per chunk.
+
+    Returns:
+        tuple: (counts, means) arrays aligned with the catalog rows (int32
+        and float32; movies without ratings have count 0 and mean 0).
+    """
+    n_rows = len(catalog)
+    counts = np.zeros(n_rows, dtype=np.int64)
+    sums = np.zeros(n_rows, dtype=np.float64)
+
+    reader = pd.read_csv(
+        ratings_file,
+        usecols=["movieId", "rating"],
+        dtype={"movieId": np.int32, "rating": np.float32},
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        rows = catalog.rows_of(chunk["movieId"].values)
+        known = rows >= 0
+        rows = rows[known]
+        counts += np.bincount(rows, minlength=n_rows)
+        sums += np.bincount(
+            rows, weights=chunk["rating"].values[known], minlength=n_rows
+        )
+
+    means = np.divide(sums, counts, out=np.zeros(n_rows), where=counts > 0)
+    return counts.astype(np.int32), means.astype(np.float32)
+
+
+def save_movie_stats(out_dir, counts, means, catalog_md5):
+    """
+    Saves the per-movie statistics next to the compiled catalog.
+
+    The arrays are replaced atomically and the JSON that validates them is
+    removed first and written last, so an interrupted run leaves no
+    statistics rather than mismatched ones.
+
+    Args:
+        out_dir (str): The catalog directory.
+        counts (np.ndarray): Rating counts aligned with the catalog rows.
+        means (np.ndarray): Mean ratings aligned with the catalog rows.
+        catalog_md5 (str): md5 of the movies.csv the catalog was built from,
+            so the statistics are discarded when the catalog is rebuilt.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, STATS_FILE)
+    if os.path.exists(path):
+        os.remove(path)
+    _save_array(out_dir, "rating_counts", counts)
+    _save_array(out_dir, "rating_means", means)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({"catalog_md5": catalog_md5, "rows": len(counts)}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def load_movie_stats(out_dir, catalog_md5):
+    """
+    Loads the per-movie statistics saved by `save_movie_stats`.
+
+    Args:
+        out_dir (str): The catalog directory.
+        catalog_md5 (str): md5 of the movies.csv of the current catalog.
+
+    Returns:
+        tuple: (counts, means) memory-mapped arrays, or None if they are
+        missing or were computed for another catalog.
+    """
+    try:
+        with open(os.path.join(out_dir, STATS_FILE)) as f:
+            info = json.load(f)
+        if info["catalog_md5"] != catalog_md5:
+            return None
+        counts = np.load(
+            os.path.join(out_dir, "rating_counts.npy"), mmap_mode="r"
+        )
+        means = np.load(
+            os.path.join(out_dir, "rating_means.npy"), mmap_mode="r"
+        )
+    except (OSError, ValueError, KeyError):
+        return None
+    return counts, means
+
+
+def bayesian_mean(counts, means, prior_weight=None):
+    """
+    Shrinks each movie's mean rating towards the global mean.
+
+    Args:
+        counts (np.ndarray): Rating counts per movie.
+        means (np.ndarray): Mean ratings per movie.
+        prior_weight (float): Number of pseudo-ratings at the global mean.
+            Defaults to the median count of rated movies.
+
+    Returns:
+        np.ndarray: float64 smoothed means (the global mean for movies
+        without ratings), or zeros if nothing was rated.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    means = np.asarray(means, dtype=np.float64)
+    rated = counts > 0
+    if not rated.any():
+        return np.zeros(len(counts))
+
+    global_mean = (counts * means).sum() / counts.sum()
+    if prior_weight is None:
+        prior_weight = float(np.median(counts[rated]))
+    return (counts * means + prior_weight * global_mean) / (
+        counts + prior_weight
+    )
+
+
+def popularity_score(counts, means, prior_weight=None):
+    """
+    Combines popularity and quality into a single ranking score.
+
+    The mean rating is shrunk towards the global mean with a Bayesian
+    average (so a single 5-star rating does not beat a classic), then
+    weighted by the log of the number of ratings.
+
+    Args:
+        counts (np.ndarray): Rating counts per movie.
+        means (np.ndarray): Mean ratings per movie.
+        prior_weight (float): Number of pseudo-ratings at the global mean.
+            Defaults to the median count of rated movies.
+
+    Returns:
+        np.ndarray: float64 scores, 0 for movies without ratings.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    smoothed = bayesian_mean(counts, means, prior_weight)
+    return np.where(counts > 0, smoothed * np.log1p(counts), 0.0)
+
+
+def compute_decayed_stats(
+    ratings_file,
+    catalog,
+    half_life_days=DECAY_HALF_LIFE_DAYS,
+    now=None,
+    chunksize=5_000_000,
+):
+    """
+    Aggregates time-decayed rating counts and means per movie.
+
+    Each rating weighs 0.5 ** (age / half_life), so recent activity counts
+    more than ratings from decades ago. ratings.csv is streamed in chunks
+    in a single pass: weights are accumulated relative to the first chunk
+    and rescaled once the reference time is known.
+
+    Args:
+        ratings_file (str): Path to ratings.csv.
+        catalog (Catalog): The movie catalog the results are aligned with.
+        half_life_days (float): Age at which a rating weighs half.
+        now (int): Reference UNIX timestamp. Defaults to the newest rating,
+            since the dataset is a snapshot.
+        chunksize (int): Number of rows parsed per chunk.
+
+    Returns:
+        tuple: (counts, means, now) where counts are the decayed rating
+        counts (float64) and means the decayed mean ratings (float32),
+        aligned with the catalog rows.
+    """
+    n_rows = len(catalog)
+    counts = np.zeros(n_rows, dtype=np.float64)
+    sums = np.zeros(n_rows, dtype=np.float64)
+    half_life = half_life_days * 86400.0
+    anchor = now
+    newest = None
+
+    reader = pd.read_csv(
+        ratings_file,
+        usecols=["movieId", "rating", "timestamp"],
+        dtype={
+            "movieId": np.int32,
+            "rating": np.float32,
+            "timestamp": np.int64,
+        },
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        timestamps = chunk["timestamp"].values
+        if len(timestamps) == 0:
+            continue
+        newest = max(newest or 0, int(timestamps.max()))
+        if anchor is None:
+            anchor = newest
+        rows = catalog.rows_of(chunk["movieId"].values)
+        known = rows >= 0
+        weights = np.exp2((timestamps[known] - anchor) / half_life)
+        rows = rows[known]
+        counts += np.bincount(rows, weights=weights, minlength=n_rows)
+        sums += np.bincount(
+            rows,
+            weights=weights * chunk["rating"].values[known],
+            minlength=n_rows,
+        )
+
+    if now is None:
+        now = newest if newest is not None else 0
+        if anchor is not None:
+            # Move the weights from the anchor to the newest rating
+            scale = np.exp2((anchor - now) / half_life)
+            counts *= scale
+            sums *= scale
+
+    means = np.divide(sums, counts, out=np.zeros(n_rows), where=counts > 0)
+    return counts, means.astype(np.float32), now
+
+
+def build_popular_lists(counts, means, catalog, size=POPULAR_LIST_SIZE):
+    """
+    Ranks the most popular movies overall and within each genre.
+
+    Movies are scored with `popularity_score` (Bayesian mean times the log
+    of the count), which keeps obscure movies with a handful of perfect
+    ratings out of the lists.
+
+    Args:
+        counts (np.ndarray): Rating counts (possibly time-decayed).
+        means (np.ndarray): Mean ratings aligned with `counts`.
+        catalog (Catalog): The catalog the statistics are aligned with.
+        size (int): Maximum length of each list.
+
+    Returns:
+        dict: Arrays for `PopularMovies`: "movie_ids", "scores" and
+        "ratings" (the Bayesian means) of all lists concatenated, and
+        "offsets" delimiting the global list followed by one list per genre
+        of utils.GENRE_VOCAB.
+    """
+    scores = popularity_score(counts, means)
+    bayesian_means = bayesian_mean(counts, means)
+    rated = np.asarray(counts) > 0
+
+    segments = [np.flatnonzero(rated)]
+    genre_matrix = catalog.genre_matrix
+    for column in range(genre_matrix.shape[1]):
+        segments.append(np.flatnonzero(rated & (genre_matrix[:, column] > 0)))
+
+    ranked = []
+    for rows in segments:
+        if len(rows) > size:
+            rows = rows[np.argpartition(-scores[rows], size - 1)[:size]]
+        ranked.append(rows[np.argsort(-scores[rows], kind="stable")])
+
+    rows = np.concatenate(ranked).astype(np.int64)
+    offsets = np.zeros(len(ranked) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(r) for r in ranked])
+    return {
+        "movie_ids": np.asarray(catalog.movie_ids)[rows].astype(np.int32),
+        "scores": scores[rows].astype(np.float32),
+        "ratings": bayesian_means[rows].astype(np.float32),
+        "offsets": offsets,
+    }
+
+
+def save_popular_lists(path, lists, catalog_md5, now, half_life_days):
+    """
+    Saves the lists built by `build_popular_lists` to a single .npz file.
+
+    Args:
+        path (str): Destination file.
+        lists (dict): Output of `build_popular_lists`.
+        catalog_md5 (str): md5 of the movies.csv the catalog was built from.
+        now (int): Reference timestamp of the decay.
+        half_life_days (float): Half-life used for the decay.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        genres=np.array(GENRE_VOCAB),
+        catalog_md5=np.array(catalog_md5),
+        now=np.array(now, dtype=np.int64),
+        half_life_days=np.array(half_life_days, dtype=np.float64),
+        **lists,
+    )
+    os.replace(tmp_path, path)
+
+
+class PopularMovies:
+    """
+    Precomputed popularity lists served as a constant-time fallback.
+
+    Holds the global ranking and one ranking per genre, each truncated to
+    a few hundred movies, so a list is a slice of a small array whatever
+    the size of the catalog.
+    """
+
+    def __init__(self, movie_ids, scores, ratings, offsets, now=None):
+        """
+        Args:
+            movie_ids (np.ndarray): Movie IDs of all lists concatenated.
+            scores (np.ndarray): Popularity scores aligned with movie_ids.
+            ratings (np.ndarray): Bayesian mean ratings aligned with movie_ids.
+            offsets (np.ndarray): Bounds of the global list followed by the
+                per-genre lists (utils.GENRE_VOCAB order).
+            now (int): Reference timestamp of the time decay.
+        """
+        self.movie_ids = movie_ids
+        self.scores = scores
+        self.ratings = ratings
+        self.offsets = offsets
+        self.now = now
+
+    @classmethod
+    def load(cls, path, catalog_md5=None):
+        """
+        Loads the lists saved by `save_popular_lists`.
+
+        Args:
+            path (str): The .npz file.
+            catalog_md5 (str): md5 of the current movies.csv; lists built
+                for another catalog are discarded.
+
+        Returns:
+            PopularMovies: The lists, or None if the file is missing, stale
+            or was built for another genre vocabulary.
+        """
+        try:
+            with np.load(path) as data:
+                if list(data["genres"]) != GENRE_VOCAB:
+                    return None
+                if catalog_md5 is not None and (
+                    str(data["catalog_md5"]) != catalog_md5
+                ):
+                    return None
+                return cls(
+                    data["movie_ids"],
+                    data["scores"],
+                    data["ratings"],
+                    data["offsets"],
+                    int(data["now"]),
+                )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _segment(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return (
+            self.movie_ids[start:end],
+            self.scores[start:end],
+            self.ratings[start:end],
+        )
+
+    def top(self, n=10, genres=None, exclude=None):
+        """
+        Returns the most popular movies, optionally within some genres.
+
+        Args:
+            n (int): Number of movies to return.
+            genres (list): Genres (English names) to draw from; movies of
+                any of them qualify. None or empty for the global list.
+            exclude (array-like): Movie IDs to leave out (e.g. already rated).
+
+        Returns:
+            tuple: (movie_ids, scores, ratings) arrays of at most n movies,
+            ranked by decreasing popularity.
+        """
+        columns = [GENRE_INDEX[g] for g in genres or () if g in GENRE_INDEX]
+        if columns:
+            parts = [self._segment(1 + c) for c in columns]
+            movie_ids = np.concatenate([p[0] for p in parts])
+            scores = np.concatenate([p[1] for p in parts])
+            ratings = np.concatenate([p[2] for p in parts])
+            # Movies of several selected genres appear once
+            movie_ids, first = np.unique(movie_ids, return_index=True)
+            scores, ratings = scores[first], ratings[first]
+            order = np.argsort(-scores, kind="stable")
+            movie_ids, scores, ratings = (
+                movie_ids[order],
+                scores[order],
+                ratings[order],
+            )
+        else:
+            movie_ids, scores, ratings = self._segment(0)
+
+        if exclude is not None and len(exclude) > 0:
+            keep = ~np.isin(movie_ids, np.asarray(exclude))
+            movie_ids, scores, ratings = (
+                movie_ids[keep],
+                scores[keep],
+                ratings[keep],
+            )
+        return movie_ids[:n], scores[:n], ratings[:n]
+
+
+if __name__ == "__main__":
+    from src.data_loader import (
+        CATALOG_DIR,
+        RATINGS_FILE,
+        ensure_dataset_exists,
+        load_catalog,
+    )
+    from src.catalog import read_manifest
+
+    ensure_dataset_exists()
+    catalog = load_catalog()
+    catalog_md5 = read_manifest(CATALOG_DIR)["source_md5"]
+    print(f"Aggregating {RATINGS_FILE}...")
+    counts, means = compute_movie_stats(RATINGS_FILE, catalog)
+    save_movie_stats(CATALOG_DIR, counts, means, catalog_md5)
+    print(f"Saved statistics for {int((counts > 0).sum())} rated movies.")
+
+    print(f"Ranking popular movies (half-life {DECAY_HALF_LIFE_DAYS} days)...")
+    decayed_counts, decayed_means, now = compute_decayed_stats(
+        RATINGS_FILE, catalog
+    )
+    save_popular_lists(
+        os.path.join(CATALOG_DIR, POPULARITY_FILE),
+        build_popular_lists(decayed_counts, decayed_means, catalog),
+        catalog_md5,
+        now,
+        DECAY_HALF_LIFE_DAYS,
+    )
+    print(f"Saved {POPULARITY_FILE}.")
@@ -1,7 +1,7 @@
 import pickle
 import os
 import numpy as np
-from src.model import MODEL_PATH, BASE_DIR
+from src.model import MODEL_PATH, BASE_DIR, save_genre_centroids
 
 
 def optimize():
@@ -10,7 +10,8 @@ def optimize():
 
     Loads the full pickled SVD model, extracts the latent factor matrices (pu, qi)
     and bias vectors (bu, bi), and saves them as separate numpy arrays.
-    It also saves the global mean and ID mappings.
+    It also saves the global mean, ID mappings and the latent centroid of
+    each genre used for cold-start users.
     """
     print(f"Loading model from {MODEL_PATH}...")
     if not os.path.exists(MODEL_PATH):
@@ -71,6 +72,14 @@ def optimize():
             pickle.dump(mappings, f)
         print("Saved svd_mappings.pkl")
 
+        # Genre centroids weighted by the number of training ratings
+        if hasattr(algo, "qi"):
+            weights = np.zeros(len(algo.qi))
+            for inner_id, item_ratings in algo.trainset.ir.items():
+                weights[inner_id] = len(item_ratings)
+            # Genres aligned with the inner IDs of the files just saved
+            save_genre_centroids(models_dir, algo.qi, weights)
+
     print("Optimization complete.")
 
 
@@ -0,0 +1,140 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Column dtypes of the MovieLens CSV files
+RATINGS_DTYPES = {
+    "userId": np.int32,
+    "movieId": np.int32,
+    "rating": np.float32,
+    "timestamp": np.int64,
+}
+TAGS_DTYPES = {
+    "userId": np.int32,
+    "movieId": np.int32,
+    "tag": str,
+    "timestamp": np.int64,
+}
+
+# Files smaller than this are parsed in-process: starting the pool costs
+# more than it saves
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+MAX_WORKERS = 8
+
+
+def default_workers():
+    """
+    Returns the default number of parser processes.
+
+    Returns:
+        int: The CPU count, capped at MAX_WORKERS.
+    """
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS))
+
+
+def split_ranges(csv_path, n_parts):
+    """
+    Splits a CSV file into byte ranges that start and end on line breaks.
+
+    Nominal offsets at multiples of size / n_parts are moved forward to the
+    start of the next line, so every range holds whole rows. The header line
+    is excluded. Quoted fields must not contain line breaks, which holds
+    for the MovieLens files.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        n_parts (int): Desired number of ranges.
+
+    Returns:
+        list: (start, end) byte offsets, in file order. Fewer than `n_parts`
+        ranges are returned when lines are long compared to the file.
+    """
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as f:
+        f.readline()
+        offsets = [f.tell()]
+        for part in range(1, n_parts):
+            nominal = size * part // n_parts
+            if nominal <= offsets[-1]:
+                continue
+            f.seek(nominal - 1)
+            # The byte before the nominal offset tells whether it is already
+            # at the start of a line
+            if f.read(1) != b"\n":
+                f.readline()
+            if offsets[-1] < f.tell() < size:
+                offsets.append(f.tell())
+    offsets.append(size)
+    return [
+        (start, end)
+        for start, end in zip(offsets[:-1], offsets[1:], strict=True)
+        if end > start
+    ]
+
+
+def _parse_range(csv_path, start, end, names, dtype):
+    """
+    Parses one byte range of a CSV file.
+
+    Runs in a worker process; the columns are returned as NumPy arrays,
+    which are cheaper to send back than a DataFrame.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        start (int): First byte of the range (start of a line).
+        end (int): End of the range (exclusive, start of a line or EOF).
+        names (list): Column names, from the header.
+        dtype (dict): Column dtypes passed to pd.read_csv.
+
+    Returns:
+        dict: Column name -> np.ndarray.
+    """
+    with open(csv_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    frame = pd.read_csv(io.BytesIO(data), header=None, names=names, dtype=dtype)
+    return {name: frame[name].values for name in names}
+
+
+def read_csv_parallel(csv_path, dtype=None, workers=None):
+    """
+    Reads a CSV file by parsing byte ranges in a process pool.
+
+    The file is split at line breaks (see `split_ranges`), each range is
+    parsed by pandas' C parser in its own process and the typed columns are
+    concatenated in file order, so the result matches `pd.read_csv` with
+    the same dtypes.
+
+    Args:
+        csv_path (str): Path to the CSV file (with a header line).
+        dtype (dict): Column dtypes. Columns without an explicit dtype are
+            inferred per range, so they should be given for large files.
+        workers (int): Number of processes. Defaults to `default_workers()`;
+            1, or a file under PARALLEL_MIN_BYTES, parses in-process.
+
+    Returns:
+        pd.DataFrame: The parsed file.
+    """
+    if workers is None:
+        workers = default_workers()
+    if workers <= 1 or os.path.getsize(csv_path) < PARALLEL_MIN_BYTES:
+        return pd.read_csv(csv_path, dtype=dtype)
+
+    with open(csv_path, "rb") as f:
+        names = f.readline().decode("utf-8").strip().split(",")
+    ranges = split_ranges(csv_path, workers)
+    if not ranges:
+        return pd.read_csv(csv_path, dtype=dtype)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [
+            pool.submit(_parse_range, csv_path, start, end, names, dtype)
+            for start, end in ranges
+        ]
+        parts = [future.result() for future in futures]
+
+    return pd.DataFrame(
+        {name: np.concatenate([part[name] for part in parts]) for name in names}
+    )
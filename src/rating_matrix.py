@@ -0,0 +1,333 @@
+import json
+import os
+import numpy as np
+
+from src.ratings_store import decode_ratings
+
+# Compressed matrices saved next to the ratings store, one .npy per array
+MATRIX_FORMAT_VERSION = 1
+MATRIX_MANIFEST_FILE = "matrix_manifest.json"
+MATRIX_ARRAYS = ("indptr", "indices", "codes")
+
+
+class CompressedRatings:
+    """
+    One compressed axis of the rating matrix (CSR rows or CSC columns).
+
+    The ratings of row `r` are `indices[indptr[r]:indptr[r + 1]]` (the
+    dense indices on the other axis, ascending) and the half-star codes at
+    the same positions, so fetching a row is two slices of the arrays.
+    """
+
+    def __init__(self, indptr, indices, codes):
+        """
+        Args:
+            indptr (np.ndarray): int64 row offsets, length n_rows + 1.
+            indices (np.ndarray): int32 dense indices on the other axis.
+            codes (np.ndarray): uint8 half-star codes (rating * 2).
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self):
+        """int: Number of stored ratings."""
+        return len(self.indices)
+
+    def counts(self):
+        """
+        Returns the number of ratings of every row.
+
+        Returns:
+            np.ndarray: int64 counts.
+        """
+        return np.diff(self.indptr)
+
+    def row(self, r):
+        """
+        Returns the ratings of one row as views of the stored arrays.
+
+        Args:
+            r (int): Dense row index.
+
+        Returns:
+            tuple: (indices, codes) views; decode the codes with
+            `ratings_store.decode_ratings` for float ratings.
+        """
+        start, end = self.indptr[r], self.indptr[r + 1]
+        return self.indices[start:end], self.codes[start:end]
+
+    def get(self, r, c):
+        """
+        Returns a single rating.
+
+        Args:
+            r (int): Dense row index.
+            c (int): Dense index on the other axis.
+
+        Returns:
+            float or None: The rating, or None if it does not exist.
+        """
+        indices, codes = self.row(r)
+        pos = np.searchsorted(indices, c)
+        if pos < len(indices) and indices[pos] == c:
+            return float(decode_ratings(codes[pos : pos + 1])[0])
+        return None
+
+
+def compress(rows, cols, codes, n_rows):
+    """
+    Builds one compressed axis from rating triples.
+
+    Args:
+        rows (np.ndarray): Dense index of the compressed axis per rating.
+        cols (np.ndarray): Dense index of the other axis per rating.
+        codes (np.ndarray): Half-star code per rating.
+        n_rows (int): Number of rows of the compressed axis.
+
+    Returns:
+        CompressedRatings: Rows in index order, columns ascending in a row.
+    """
+    n_cols = int(cols.max()) + 1 if len(cols) else 0
+    key = rows.astype(np.int64) * n_cols + cols
+    order = np.argsort(key, kind="stable")
+    del key
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return CompressedRatings(
+        indptr,
+        np.asarray(cols)[order].astype(np.int32, copy=False),
+        np.asarray(codes)[order].astype(np.uint8, copy=False),
+    )
+
+
+class RatingMatrix:
+    """
+    The ratings indexed both by user (CSR) and by item (CSC).
+
+    Both layouts use the dense user/item indices of the ratings store, so
+    rows line up with factor matrices indexed the same way. Loaded
+    matrices are memory-mapped: opening them costs no reads and rows are
+    served straight from the OS page cache.
+    """
+
+    def __init__(self, by_user, by_item, user_raw_ids, item_raw_ids):
+        """
+        Args:
+            by_user (CompressedRatings): CSR matrix, one row per user.
+            by_item (CompressedRatings): CSC matrix, one row per item.
+            user_raw_ids (np.ndarray): Raw userId of each dense user index.
+            item_raw_ids (np.ndarray): Raw movieId of each dense item index.
+        """
+        self.by_user = by_user
+        self.by_item = by_item
+        self.user_raw_ids = user_raw_ids
+        self.item_raw_ids = item_raw_ids
+        self._user_lookup = None
+        self._item_lookup = None
+
+    @property
+    def shape(self):
+        """tuple: (n_users, n_items)."""
+        return len(self.by_user), len(self.by_item)
+
+    @property
+    def nnz(self):
+        """int: Number of ratings."""
+        return self.by_user.nnz
+
+    @classmethod
+    def from_store(cls, store):
+        """
+        Builds both layouts from a RatingsStore.
+
+        Args:
+            store (RatingsStore): The columnar ratings.
+
+        Returns:
+            RatingMatrix: The matrices, held in memory.
+        """
+        return cls(
+            compress(
+                store.user_index,
+                store.item_index,
+                store.rating_codes,
+                store.n_users,
+            ),
+            compress(
+                store.item_index,
+                store.user_index,
+                store.rating_codes,
+                store.n_items,
+            ),
+            store.user_raw_ids,
+            store.item_raw_ids,
+        )
+
+    def user_row(self, user_index):
+        """
+        Returns the ratings of a user, without copies.
+
+        Args:
+            user_index (int): Dense user index.
+
+        Returns:
+            tuple: (item indices, half-star codes), items ascending.
+        """
+        return self.by_user.row(user_index)
+
+    def item_column(self, item_index):
+        """
+        Returns the ratings of an item, without copies.
+
+        Args:
+            item_index (int): Dense item index.
+
+        Returns:
+            tuple: (user indices, half-star codes), users ascending.
+        """
+        return self.by_item.row(item_index)
+
+    def user_position(self, user_id):
+        """
+        Returns the dense index of a raw userId.
+
+        Args:
+            user_id (int): MovieLens userId.
+
+        Returns:
+            int or None: The dense index, or None for unknown users.
+        """
+        if self._user_lookup is None:
+            self._user_lookup = _inverse(self.user_raw_ids)
+        return _lookup(self._user_lookup, user_id)
+
+    def item_position(self, movie_id):
+        """
+        Returns the dense index of a raw movieId.
+
+        Args:
+            movie_id (int): MovieLens movieId.
+
+        Returns:
+            int or None: The dense index, or None for unrated movies.
+        """
+        if self._item_lookup is None:
+            self._item_lookup = _inverse(self.item_raw_ids)
+        return _lookup(self._item_lookup, movie_id)
+
+
+def _inverse(raw_ids):
+    """Returns an array mapping raw IDs to dense indices (-1 if missing)."""
+    size = int(raw_ids.max()) + 1 if len(raw_ids) else 0
+    lookup = np.full(size, -1, dtype=np.int32)
+    lookup[raw_ids] = np.arange(len(raw_ids), dtype=np.int32)
+    return lookup
+
+
+def _lookup(lookup, raw_id):
+    """Looks a raw ID up in an `_inverse` array."""
+    if 0 <= raw_id < len(lookup) and lookup[raw_id] >= 0:
+        return int(lookup[raw_id])
+    return None
+
+
+def save_rating_matrix(matrix, out_dir, source_md5):
+    """
+    Saves both layouts as .npy files, writing the manifest last.
+
+    Args:
+        matrix (RatingMatrix): The matrices to save.
+        out_dir (str): Output directory (the ratings store directory).
+        source_md5 (str): md5 of ratings.csv the matrices were built from.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    for prefix, layout in (("csr", matrix.by_user), ("csc", matrix.by_item)):
+        for name in MATRIX_ARRAYS:
+            path = os.path.join(out_dir, f"{prefix}_{name}.npy")
+            with open(f"{path}.tmp", "wb") as f:
+                np.save(f, getattr(layout, name))
+            os.replace(f"{path}.tmp", path)
+
+    manifest = {
+        "version": MATRIX_FORMAT_VERSION,
+        "shape": list(matrix.shape),
+        "nnz": matrix.nnz,
+        "source_md5": source_md5,
+    }
+    path = os.path.join(out_dir, MATRIX_MANIFEST_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def read_matrix_manifest(out_dir):
+    """
+    Reads the manifest of saved rating matrices.
+
+    Args:
+        out_dir (str): Directory of the matrices.
+
+    Returns:
+        dict or None: The manifest, or None if it is missing or was written
+        by another format version.
+    """
+    try:
+        with open(os.path.join(out_dir, MATRIX_MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MATRIX_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def open_rating_matrix(out_dir, user_raw_ids, item_raw_ids):
+    """
+    Opens saved rating matrices with memory mapping.
+
+    Args:
+        out_dir (str): Directory written by `save_rating_matrix`.
+        user_raw_ids (np.ndarray): Raw userId of each dense user index.
+        item_raw_ids (np.ndarray): Raw movieId of each dense item index.
+
+    Returns:
+        RatingMatrix: The memory-mapped matrices.
+    """
+    layouts = []
+    for prefix in ("csr", "csc"):
+        arrays = [
+            np.load(
+                os.path.join(out_dir, f"{prefix}_{name}.npy"), mmap_mode="r"
+            )
+            for name in MATRIX_ARRAYS
+        ]
+        layouts.append(CompressedRatings(*arrays))
+    return RatingMatrix(*layouts, user_raw_ids, item_raw_ids)
+
+
+def load_or_build_rating_matrix(store, out_dir, source_md5):
+    """
+    Opens the rating matrices, building them when the ratings changed.
+
+    Args:
+        store (RatingsStore): The columnar ratings.
+        out_dir (str): Directory of the matrices (the ratings store's).
+        source_md5 (str): md5 of ratings.csv the store was built from.
+
+    Returns:
+        RatingMatrix: The memory-mapped matrices.
+    """
+    manifest = read_matrix_manifest(out_dir)
+    if (
+        manifest is None
+        or manifest["source_md5"] != source_md5
+        or manifest["nnz"] != len(store)
+    ):
+        print("Building user/item rating matrices...")
+        save_rating_matrix(RatingMatrix.from_store(store), out_dir, source_md5)
+    return open_rating_matrix(out_dir, store.user_raw_ids, store.item_raw_ids)
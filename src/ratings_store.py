@@ -0,0 +1,452 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from src.catalog import _save_array, file_md5
+
+# Binary ratings layout: one raw little-endian .bin file per column, the
+# dense ID tables as .npy files and a manifest with the row count
+RATINGS_FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+
+# Column name -> dtype of the stored arrays
+COLUMNS = {
+    "user_ids": np.dtype("<i4"),
+    "movie_ids": np.dtype("<i4"),
+    "rating_codes": np.dtype("u1"),  # rating * 2 (0.5 -> 1, 5.0 -> 10)
+    "timestamps": np.dtype("<i4"),
+    "user_index": np.dtype("<i4"),  # dense user index (first appearance)
+    "item_index": np.dtype("<i4"),  # dense item index (first appearance)
+}
+
+# Peak memory of the ingestion on top of the interpreter and the imported
+# libraries: a fixed parser overhead plus a cost per row of the chunk being
+# parsed (CSV text, parsed columns and the derived columns), measured with
+# pandas' C parser and rounded up
+INGEST_MEMORY_BUDGET = 512 * 1024 * 1024
+INGEST_FIXED_BYTES = 48 * 1024 * 1024
+INGEST_BYTES_PER_ROW = 96
+
+
+def encode_ratings(ratings):
+    """
+    Encodes half-star ratings as small integers (rating * 2).
+
+    Args:
+        ratings (array-like): Ratings between 0.5 and 5.0 in steps of 0.5.
+
+    Returns:
+        np.ndarray: uint8 codes between 1 and 10.
+
+    Raises:
+        ValueError: If a rating is not a half-star value in range.
+    """
+    doubled = np.asarray(ratings, dtype=np.float64) * 2
+    codes = np.rint(doubled)
+    if len(codes) and (
+        codes.min() < 1 or codes.max() > 10 or np.any(codes != doubled)
+    ):
+        raise ValueError("Ratings must be half-star values from 0.5 to 5.0")
+    return codes.astype(np.uint8)
+
+
+def decode_ratings(codes):
+    """
+    Decodes half-star codes back to ratings.
+
+    Args:
+        codes (np.ndarray): uint8 codes written by `encode_ratings`.
+
+    Returns:
+        np.ndarray: float32 ratings.
+    """
+    return np.asarray(codes, dtype=np.float32) * np.float32(0.5)
+
+
+class RatingsStore:
+    """
+    The MovieLens ratings as compact, memory-mapped columns.
+
+    Row `r` of every column describes the same rating, in ratings.csv order.
+    Besides the raw IDs, each rating carries dense user/item indices
+    (0..n_users-1, 0..n_items-1) ready to index factor matrices. Opening a
+    store only maps the files, so the columns are shared with the OS page
+    cache instead of being parsed into a DataFrame.
+    """
+
+    def __init__(
+        self,
+        user_ids,
+        movie_ids,
+        rating_codes,
+        timestamps,
+        user_index,
+        item_index,
+        user_raw_ids,
+        item_raw_ids,
+    ):
+        """
+        Args:
+            user_ids (np.ndarray): Raw userId per rating (int32).
+            movie_ids (np.ndarray): Raw movieId per rating (int32).
+            rating_codes (np.ndarray): Half-star codes (uint8, rating * 2).
+            timestamps (np.ndarray): UNIX timestamps (int32).
+            user_index (np.ndarray): Dense user index per rating (int32).
+            item_index (np.ndarray): Dense item index per rating (int32).
+            user_raw_ids (np.ndarray): Raw userId of each dense user index.
+            item_raw_ids (np.ndarray): Raw movieId of each dense item index.
+        """
+        self.user_ids = user_ids
+        self.movie_ids = movie_ids
+        self.rating_codes = rating_codes
+        self.timestamps = timestamps
+        self.user_index = user_index
+        self.item_index = item_index
+        self.user_raw_ids = user_raw_ids
+        self.item_raw_ids = item_raw_ids
+
+    @property
+    def n_users(self):
+        """int: Number of distinct users."""
+        return len(self.user_raw_ids)
+
+    @property
+    def n_items(self):
+        """int: Number of distinct rated movies."""
+        return len(self.item_raw_ids)
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    @property
+    def ratings(self):
+        """np.ndarray: Decoded float32 ratings (computed on each access)."""
+        return decode_ratings(self.rating_codes)
+
+    @property
+    def nbytes(self):
+        """int: Total size of the columns."""
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    def to_frame(self):
+        """
+        Returns the ratings as a DataFrame with compact dtypes.
+
+        Returns:
+            pd.DataFrame: Columns userId, movieId (int32), rating (float32)
+            and timestamp (int32), like ratings.csv.
+        """
+        return pd.DataFrame(
+            {
+                "userId": np.asarray(self.user_ids),
+                "movieId": np.asarray(self.movie_ids),
+                "rating": self.ratings,
+                "timestamp": np.asarray(self.timestamps),
+            }
+        )
+
+
+def expected_md5(checksums_path, filename):
+    """
+    Looks up the md5 of a dataset file in the MovieLens checksums.txt.
+
+    Args:
+        checksums_path (str): Path to checksums.txt ("<md5>  <filename>" lines).
+        filename (str): Name of the file, e.g. "ratings.csv".
+
+    Returns:
+        str or None: The md5, or None if the file or entry is missing.
+    """
+    try:
+        with open(checksums_path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == filename:
+                    return parts[0]
+    except OSError:
+        pass
+    return None
+
+
+class DenseIdMap:
+    """
+    Assigns dense indices (0, 1, 2...) to raw IDs in order of appearance.
+
+    The raw-to-dense lookup is a flat array indexed by raw ID, so mapping a
+    chunk is a single vectorized gather; MovieLens IDs are small positive
+    integers, so the table stays around a megabyte.
+    """
+
+    def __init__(self):
+        self.lookup = np.full(1024, -1, dtype=np.int32)
+        self.size = 0
+        self._raw_ids = []
+
+    def map(self, raw_ids):
+        """
+        Returns the dense indices of raw IDs, assigning new ones as needed.
+
+        Args:
+            raw_ids (np.ndarray): Non-negative integer raw IDs.
+
+        Returns:
+            np.ndarray: int32 dense indices.
+
+        Raises:
+            ValueError: If an ID is negative.
+        """
+        raw_ids = np.asarray(raw_ids, dtype=np.int64)
+        if len(raw_ids) == 0:
+            return np.empty(0, dtype=np.int32)
+        if raw_ids.min() < 0:
+            raise ValueError("Raw IDs must be non-negative")
+        top = int(raw_ids.max())
+        if top >= len(self.lookup):
+            grown = np.full(max(top + 1, 2 * len(self.lookup)), -1, np.int32)
+            grown[: len(self.lookup)] = self.lookup
+            self.lookup = grown
+
+        index = self.lookup[raw_ids]
+        missing = index < 0
+        if missing.any():
+            new_ids, first = np.unique(raw_ids[missing], return_index=True)
+            new_ids = new_ids[np.argsort(first)]
+            self.lookup[new_ids] = np.arange(
+                self.size, self.size + len(new_ids), dtype=np.int32
+            )
+            self._raw_ids.append(new_ids.astype(np.int32))
+            self.size += len(new_ids)
+            index = self.lookup[raw_ids]
+        return index
+
+    def raw_ids(self):
+        """
+        Returns the raw ID of every dense index.
+
+        Returns:
+            np.ndarray: int32 array of length `size`.
+        """
+        if not self._raw_ids:
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate(self._raw_ids)
+
+
+def chunk_rows_for_budget(memory_budget):
+    """
+    Returns the number of CSV rows that can be parsed per chunk.
+
+    Args:
+        memory_budget (int): Peak memory allowed for the ingestion, in bytes.
+
+    Returns:
+        int: Rows per chunk.
+
+    Raises:
+        ValueError: If the budget cannot hold a reasonable chunk.
+    """
+    rows = (memory_budget - INGEST_FIXED_BYTES) // INGEST_BYTES_PER_ROW
+    if rows < 10_000:
+        raise ValueError(
+            f"Memory budget of {memory_budget} bytes is too small to ingest "
+            f"ratings (need at least {INGEST_FIXED_BYTES // 2**20 + 1} MB)"
+        )
+    return int(rows)
+
+
+def _print_progress(rows, bytes_read, total_bytes):
+    """Default progress report of `convert_ratings`."""
+    percent = 100.0 * bytes_read / total_bytes if total_bytes else 100.0
+    print(f"Ingested {rows:,} ratings ({percent:.0f}%)")
+
+
+def convert_ratings(
+    csv_path,
+    out_dir,
+    source_md5,
+    memory_budget=INGEST_MEMORY_BUDGET,
+    progress=_print_progress,
+):
+    """
+    Streams ratings.csv into the binary columnar format.
+
+    The CSV is parsed in chunks sized from `memory_budget`; each chunk is
+    downcast, its raw IDs are mapped to dense user/item indices on the fly
+    and every column is appended to its .bin file, so peak memory does not
+    grow with the size of the dataset. The old manifest is removed before
+    any file is replaced and the new one is written last, so a partially
+    written store is never opened.
+
+    Args:
+        csv_path (str): Path to ratings.csv.
+        out_dir (str): Output directory.
+        source_md5 (str): md5 of the CSV, recorded in the manifest.
+        memory_budget (int): Peak memory allowed, in bytes.
+        progress (callable): Called after each chunk with (rows, bytes_read,
+            total_bytes); None disables the reports.
+
+    Returns:
+        dict: The manifest.
+    """
+    chunk_rows = chunk_rows_for_budget(memory_budget)
+    print(f"Converting {csv_path} to columnar format...")
+    os.makedirs(out_dir, exist_ok=True)
+    users = DenseIdMap()
+    items = DenseIdMap()
+    total_bytes = os.path.getsize(csv_path)
+    rows = 0
+
+    outputs = {
+        name: open(os.path.join(out_dir, f"{name}.bin.tmp"), "wb")
+        for name in COLUMNS
+    }
+    try:
+        with open(csv_path, "rb") as source:
+            reader = pd.read_csv(
+                source,
+                dtype={
+                    "userId": np.int32,
+                    "movieId": np.int32,
+                    "rating": np.float32,
+                    "timestamp": np.int64,
+                },
+                chunksize=chunk_rows,
+            )
+            for chunk in reader:
+                user_ids = chunk["userId"].values
+                movie_ids = chunk["movieId"].values
+                columns = {
+                    "user_ids": user_ids,
+                    "movie_ids": movie_ids,
+                    "rating_codes": encode_ratings(chunk["rating"].values),
+                    "timestamps": chunk["timestamp"].values,
+                    "user_index": users.map(user_ids),
+                    "item_index": items.map(movie_ids),
+                }
+                del chunk
+                for name, values in columns.items():
+                    values.astype(COLUMNS[name], copy=False).tofile(
+                        outputs[name]
+                    )
+                rows += len(user_ids)
+                if progress is not None:
+                    progress(rows, source.tell(), total_bytes)
+    finally:
+        for f in outputs.values():
+            f.close()
+
+    # Readers must not pair the old row counts with the new columns
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        os.remove(path)
+    for name in COLUMNS:
+        path = os.path.join(out_dir, f"{name}.bin")
+        os.replace(f"{path}.tmp", path)
+    _save_array(out_dir, "user_raw_ids", users.raw_ids())
+    _save_array(out_dir, "item_raw_ids", items.raw_ids())
+
+    manifest = {
+        "version": RATINGS_FORMAT_VERSION,
+        "rows": rows,
+        "users": users.size,
+        "items": items.size,
+        "columns": {name: dtype.str for name, dtype in COLUMNS.items()},
+        "source_md5": source_md5,
+    }
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+    print(
+        f"Ratings store written: {rows} ratings, {users.size} users, "
+        f"{items.size} movies."
+    )
+    return manifest
+
+
+def read_ratings_manifest(out_dir):
+    """
+    Reads the manifest of a ratings store.
+
+    Args:
+        out_dir (str): Directory of the store.
+
+    Returns:
+        dict or None: The manifest, or None if it is missing or was written
+        by another format version.
+    """
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != RATINGS_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def open_ratings_store(out_dir):
+    """
+    Opens a ratings store with memory mapping.
+
+    Args:
+        out_dir (str): Directory written by `convert_ratings`.
+
+    Returns:
+        RatingsStore: The store, backed by memory-mapped columns.
+
+    Raises:
+        FileNotFoundError: If the store has no valid manifest.
+    """
+    manifest = read_ratings_manifest(out_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No ratings store in {out_dir}")
+
+    columns = {}
+    for name, dtype in COLUMNS.items():
+        if manifest["rows"] == 0:
+            # np.memmap cannot map empty files
+            columns[name] = np.empty(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(
+                os.path.join(out_dir, f"{name}.bin"),
+                dtype=dtype,
+                mode="r",
+                shape=(manifest["rows"],),
+            )
+    for name in ("user_raw_ids", "item_raw_ids"):
+        columns[name] = np.load(os.path.join(out_dir, f"{name}.npy"))
+    return RatingsStore(**columns)
+
+
+def load_or_build_ratings_store(
+    csv_path, out_dir, checksums_path=None, memory_budget=INGEST_MEMORY_BUDGET
+):
+    """
+    Opens the ratings store, converting ratings.csv only when it changed.
+
+    The store is keyed on the md5 of the CSV as listed in the dataset's
+    checksums.txt, so the check costs no read of the CSV itself; the md5 is
+    computed from the file only when checksums.txt has no entry for it.
+
+    Args:
+        csv_path (str): Path to ratings.csv.
+        out_dir (str): Directory of the store.
+        checksums_path (str): Path to the dataset's checksums.txt.
+        memory_budget (int): Peak memory allowed for a conversion, in bytes.
+
+    Returns:
+        RatingsStore: The memory-mapped store.
+    """
+    source_md5 = None
+    if checksums_path is not None:
+        source_md5 = expected_md5(checksums_path, os.path.basename(csv_path))
+    manifest = read_ratings_manifest(out_dir)
+    if source_md5 is None and os.path.exists(csv_path):
+        source_md5 = file_md5(csv_path)
+
+    if manifest is None or (
+        source_md5 is not None and manifest["source_md5"] != source_md5
+    ):
+        convert_ratings(csv_path, out_dir, source_md5, memory_budget)
+    return open_ratings_store(out_dir)
@@ -0,0 +1,465 @@
+import bisect
+import re
+import unicodedata
+import numpy as np
+
+from src.utils import GENRE_INDEX, GENRE_MAP, get_english_genre
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Release year at the end of MovieLens titles, ignored by fuzzy matching
+_YEAR_SUFFIX = re.compile(r"\s*\(\d{4}\)\s*$")
+# MovieLens moves leading articles to the end: "Matrix, The (1999)"
+_TRAILING_ARTICLE = re.compile(
+    r"^(?P<name>.+), (?P<article>The|A|An|La|Le|Les|El|Los|Las|Il|Der|Die|Das)"
+    r"(?P<year>\s*\(\d{4}\))?\s*$"
+)
+
+
+def normalize(text):
+    """
+    Normalizes text for searching: accent-folded and lower-cased.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The normalized text ("Amélie" -> "amelie").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return folded.lower()
+
+
+def tokenize(text):
+    """
+    Splits text into normalized alphanumeric tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list: The tokens, in order of appearance.
+    """
+    return _TOKEN_PATTERN.findall(normalize(text))
+
+
+def _union(arrays):
+    """Returns the sorted union of several sorted posting lists."""
+    if not arrays:
+        return np.empty(0, dtype=np.int32)
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+
+class TokenIndex:
+    """
+    Inverted index from normalized title tokens to sorted row arrays.
+
+    A query matches the rows containing all of its tokens; the last token
+    is matched as a prefix so results keep up while the user is typing.
+    """
+
+    def __init__(self, titles):
+        """
+        Args:
+            titles (iterable): Movie titles, one per catalog row.
+        """
+        postings = {}
+        n_rows = 0
+        for row, title in enumerate(titles):
+            n_rows += 1
+            if not isinstance(title, str):
+                continue
+            for token in set(tokenize(title)):
+                postings.setdefault(token, []).append(row)
+        self.n_rows = n_rows
+        # Rows are appended in increasing order, so postings are sorted
+        self.postings = {
+            token: np.array(rows, dtype=np.int32)
+            for token, rows in postings.items()
+        }
+        self.vocabulary = sorted(self.postings)
+
+    def lookup(self, token):
+        """
+        Returns the posting list of an exact token.
+
+        Args:
+            token (str): A normalized token.
+
+        Returns:
+            np.ndarray: Sorted int32 rows.
+        """
+        return self.postings.get(token, np.empty(0, dtype=np.int32))
+
+    def lookup_prefix(self, prefix):
+        """
+        Returns the union of the posting lists of all tokens with a prefix.
+
+        Args:
+            prefix (str): A normalized token prefix.
+
+        Returns:
+            np.ndarray: Sorted int32 rows.
+        """
+        lo = bisect.bisect_left(self.vocabulary, prefix)
+        hi = bisect.bisect_left(self.vocabulary, prefix + "\uffff")
+        return _union([self.postings[t] for t in self.vocabulary[lo:hi]])
+
+    def search(self, query):
+        """
+        Finds the rows whose title contains every token of the query.
+
+        Args:
+            query (str): The raw query.
+
+        Returns:
+            np.ndarray: Sorted int32 rows.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return np.empty(0, dtype=np.int32)
+
+        lists = [self.lookup(t) for t in tokens[:-1]]
+        lists.append(self.lookup_prefix(tokens[-1]))
+        # Intersect the shortest lists first
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+
+def trigrams(text):
+    """
+    Returns the set of character trigrams of a text.
+
+    Like PostgreSQL's pg_trgm, each normalized word is padded with two
+    leading spaces and one trailing space, so word starts weigh more.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        set: The trigrams.
+    """
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    Character-trigram index for fuzzy and substring title matching.
+
+    Candidates are generated by counting, over the concatenated posting
+    lists of the query trigrams, how many trigrams each title shares with
+    the query (`np.bincount`, or `np.unique` when there are few hits).
+    They are ranked by the fraction of query trigrams found in the title,
+    then by Jaccard similarity so that shorter, closer titles come first.
+    """
+
+    def __init__(self, titles):
+        """
+        Args:
+            titles (iterable): Movie titles, one per catalog row.
+        """
+        postings = {}
+        sizes = []
+        for row, title in enumerate(titles):
+            grams = (
+                trigrams(_YEAR_SUFFIX.sub("", title))
+                if isinstance(title, str)
+                else set()
+            )
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+        self.postings = {
+            gram: np.array(rows, dtype=np.int32)
+            for gram, rows in postings.items()
+        }
+        self.sizes = np.array(sizes, dtype=np.int32)
+
+    def search(self, query, limit=50, min_similarity=0.4):
+        """
+        Finds the titles most similar to a possibly misspelled query.
+
+        Args:
+            query (str): The raw query.
+            limit (int): Maximum number of rows returned.
+            min_similarity (float): Minimum fraction of the query trigrams
+                that a title must contain.
+
+        Returns:
+            tuple: (rows, similarities) sorted by decreasing similarity.
+        """
+        grams = trigrams(query)
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        if not grams or not lists:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+
+        hits = np.concatenate(lists)
+        min_overlap = max(1, int(np.ceil(min_similarity * len(grams))))
+        if len(hits) * 8 < len(self.sizes):
+            # Few hits: counting sorted hits beats a catalog-sized bincount
+            rows, shared = np.unique(hits, return_counts=True)
+            keep = shared >= min_overlap
+            rows, shared = rows[keep], shared[keep]
+        else:
+            overlap = np.bincount(hits, minlength=len(self.sizes))
+            rows = np.flatnonzero(overlap >= min_overlap)
+            shared = overlap[rows]
+        similarity = shared / len(grams)
+        jaccard = shared / (len(grams) + self.sizes[rows] - shared)
+
+        if len(rows) > limit:
+            # Keep the best candidates before the full sort
+            keep = np.argpartition(-(similarity + jaccard * 1e-3), limit)
+            keep = keep[:limit]
+            rows, similarity, jaccard = (
+                rows[keep],
+                similarity[keep],
+                jaccard[keep],
+            )
+        order = np.lexsort((rows, -jaccard, -similarity))
+        return rows[order].astype(np.int32), similarity[order]
+
+
+def title_variants(title):
+    """
+    Returns the searchable forms of a MovieLens title.
+
+    Titles with a trailing article ("Matrix, The (1999)") are also indexed
+    in natural order ("The Matrix (1999)").
+
+    Args:
+        title (str): The title.
+
+    Returns:
+        list: One or two title strings.
+    """
+    match = _TRAILING_ARTICLE.match(title)
+    if match is None:
+        return [title]
+    natural = f"{match['article']} {match['name']}{match['year'] or ''}"
+    return [title, natural]
+
+
+class PrefixIndex:
+    """
+    Sorted array of normalized keys answering prefix completions.
+
+    A prefix selects a contiguous range of keys with two binary searches;
+    the top-k entries of that range by popularity are returned.
+    """
+
+    def __init__(self, entries):
+        """
+        Args:
+            entries (iterable): (key, label, kind, value, popularity) tuples.
+                `key` is matched against the normalized prefix, `label` is
+                shown to the user and `value` identifies the entry.
+        """
+        entries = sorted(
+            (" ".join(tokenize(key)), label, kind, value, popularity)
+            for key, label, kind, value, popularity in entries
+        )
+        self.keys = [e[0] for e in entries]
+        self.labels = [e[1] for e in entries]
+        self.kinds = [e[2] for e in entries]
+        self.values = [e[3] for e in entries]
+        self.popularity = np.array([e[4] for e in entries], dtype=np.float64)
+
+    def complete(self, prefix, limit=8):
+        """
+        Returns the most popular entries whose key starts with a prefix.
+
+        Args:
+            prefix (str): The text typed so far.
+            limit (int): Maximum number of completions.
+
+        Returns:
+            list: Dicts {"label", "kind", "value"}, most popular first.
+                Entries sharing a value (title variants) appear once.
+        """
+        prefix = " ".join(tokenize(prefix))
+        if not prefix:
+            return []
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\uffff")
+        if lo == hi:
+            return []
+
+        popularity = self.popularity[lo:hi]
+        # Over-fetch a little to make up for deduplicated variants
+        wanted = min(2 * limit, hi - lo)
+        if wanted < hi - lo:
+            candidates = np.argpartition(-popularity, wanted)[:wanted]
+        else:
+            candidates = np.arange(hi - lo)
+        candidates = candidates[
+            np.argsort(-popularity[candidates], kind="stable")
+        ]
+
+        completions = []
+        seen = set()
+        for pos in (lo + candidates).tolist():
+            key = (self.kinds[pos], self.values[pos])
+            if key in seen:
+                continue
+            seen.add(key)
+            completions.append(
+                {
+                    "label": self.labels[pos],
+                    "kind": self.kinds[pos],
+                    "value": self.values[pos],
+                }
+            )
+            if len(completions) == limit:
+                break
+        return completions
+
+
+class MovieSearchIndex:
+    """
+    Search structures over the movie catalog, built once per catalog.
+
+    Combines the title token index with per-genre posting lists so that a
+    query matches movies by title or, when it names a genre (in English or
+    Spanish), by genre.
+    """
+
+    def __init__(self, titles, genre_matrix, popularity=None):
+        """
+        Args:
+            titles (iterable): Movie titles, one per catalog row.
+            genre_matrix (np.ndarray): Multi-hot genre matrix aligned with
+                the titles (columns follow utils.GENRE_VOCAB).
+            popularity (np.ndarray): Optional per-row popularity used to rank
+                completions. Defaults to zeros (catalog order).
+        """
+        self.titles = titles
+        self.tokens = TokenIndex(titles)
+        self.genre_matrix = genre_matrix
+        if popularity is None:
+            popularity = np.zeros(len(genre_matrix))
+        self.popularity = popularity
+        self._trigrams = None
+        self._prefixes = None
+        self.genre_postings = {
+            genre: np.flatnonzero(genre_matrix[:, col]).astype(np.int32)
+            for genre, col in GENRE_INDEX.items()
+        }
+        # Accent-folded Spanish names, so "accion" finds "Acción"
+        self._folded_spanish = {
+            normalize(es): en for en, es in GENRE_MAP.items()
+        }
+
+    def genre_rows(self, query):
+        """
+        Finds the rows whose genres contain the query.
+
+        Spanish genre names are translated first (see utils.get_english_genre);
+        otherwise the query is matched as a substring of the English names.
+
+        Args:
+            query (str): The raw query.
+
+        Returns:
+            np.ndarray: Sorted int32 rows.
+        """
+        stripped = query.strip()
+        english = get_english_genre(stripped.title())
+        if english == stripped.title():
+            english = self._folded_spanish.get(normalize(stripped), stripped)
+        term = english.lower()
+        return _union(
+            [
+                rows
+                for genre, rows in self.genre_postings.items()
+                if term in genre.lower()
+            ]
+        )
+
+    def search(self, query):
+        """
+        Finds the movies matching a query by title tokens or genre.
+
+        Args:
+            query (str): The raw query.
+
+        Returns:
+            np.ndarray: Sorted int32 catalog rows (stable catalog order).
+        """
+        if not query or not query.strip():
+            return np.empty(0, dtype=np.int32)
+        return _union([self.tokens.search(query), self.genre_rows(query)])
+
+    def fuzzy_search(self, query, limit=50):
+        """
+        Finds titles similar to a misspelled or partial query.
+
+        The trigram index is built on first use.
+
+        Args:
+            query (str): The raw query.
+            limit (int): Maximum number of rows returned.
+
+        Returns:
+            np.ndarray: int32 catalog rows, most similar first.
+        """
+        if self._trigrams is None:
+            self._trigrams = TrigramIndex(self.titles)
+        rows, _ = self._trigrams.search(query, limit=limit)
+        return rows
+
+    def complete(self, prefix, limit=8):
+        """
+        Suggests titles and genres (English and Spanish) for a typed prefix.
+
+        The prefix index is built on first use. Genres are ranked by their
+        number of movies and titles by `popularity`.
+
+        Args:
+            prefix (str): The text typed so far.
+            limit (int): Maximum number of suggestions.
+
+        Returns:
+            list: Dicts {"label", "kind", "value"}; `value` is the catalog
+            row for titles and the genre label for genres.
+        """
+        if self._prefixes is None:
+            self._prefixes = PrefixIndex(self._completion_entries())
+        return self._prefixes.complete(prefix, limit=limit)
+
+    def _completion_entries(self):
+        """Yields (key, label, kind, value, popularity) completion entries."""
+        for row, title in enumerate(self.titles):
+            if not isinstance(title, str):
+                continue
+            for variant in title_variants(title):
+                yield variant, title, "title", row, float(self.popularity[row])
+
+        for genre, col in GENRE_INDEX.items():
+            movie_count = float(self.genre_matrix[:, col].sum())
+            for label in (genre, GENRE_MAP[genre]):
+                yield label, label, "genre", label, movie_count
+
+    def rank(self, rows):
+        """
+        Orders rows by decreasing popularity (ties keep catalog order).
+
+        Args:
+            rows (np.ndarray): Catalog rows.
+
+        Returns:
+            np.ndarray: The same rows, most popular first.
+        """
+        order = np.argsort(-self.popularity[rows], kind="stable")
+        return rows[order]
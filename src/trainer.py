@@ -0,0 +1,282 @@
+import os
+import pickle
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from src.catalog import _save_array, _write_atomic
+from src.ratings_store import decode_ratings
+
+# Hyperparameters, same defaults as surprise.SVD
+N_FACTORS = 100
+N_EPOCHS = 20
+LEARNING_RATE = 0.005
+REGULARIZATION = 0.02
+INIT_MEAN = 0.0
+INIT_STD = 0.1
+RATING_SCALE = (0.5, 5.0)
+# Ratings per mini-batch
+BATCH_SIZE = 4096
+# Updates within a batch use the parameters from its start, so a user or
+# item with c ratings in the batch takes c gradient steps at once. Beyond
+# this many, their mean gradient is applied this many times instead,
+# keeping the combined step (lr * c) small enough to stay stable.
+MAX_BATCH_UPDATES = 100
+
+
+def _scatter_step(factors, biases, index, factor_grad, bias_grad, lr, cap):
+    """
+    Adds the gradients of a mini-batch to the users or items they belong to.
+
+    Gradients sharing a target are summed with the product of a sparse
+    one-hot matrix, like `np.add.at` but several times faster for 2-D
+    gradients. The learning rate and the MAX_BATCH_UPDATES cap are folded
+    into the weights of that matrix.
+
+    Args:
+        factors (np.ndarray): pu or qi, updated in place.
+        biases (np.ndarray): bu or bi, updated in place.
+        index (np.ndarray): User or item index of each rating in the batch.
+        factor_grad (np.ndarray): (batch, n_factors) factor gradients.
+        bias_grad (np.ndarray): Bias gradient of each rating.
+        lr (float): Learning rate.
+        cap (int): Maximum number of updates of one target.
+    """
+    order = np.argsort(index, kind="stable")
+    sorted_index = index[order]
+    starts = np.flatnonzero(
+        np.concatenate(([True], sorted_index[1:] != sorted_index[:-1]))
+    )
+    indptr = np.append(starts, len(index))
+    counts = np.diff(indptr)
+    step = lr * np.minimum(1.0, cap / counts)
+    one_hot = sp.csr_matrix(
+        (np.repeat(step, counts).astype(np.float32), order, indptr),
+        shape=(len(starts), len(index)),
+    )
+    targets = sorted_index[starts]
+    factors[targets] += one_hot @ factor_grad
+    biases[targets] += one_hot @ bias_grad
+
+
+class BiasedMF:
+    """
+    A biased matrix factorization model, as trained by surprise.SVD.
+
+    The prediction for user u and item i is
+    global_mean + bu[u] + bi[i] + pu[u] . qi[i]; the indices are the dense
+    user/item indices of the ratings store.
+    """
+
+    def __init__(self, pu, qi, bu, bi, global_mean, user_raw_ids, item_raw_ids):
+        """
+        Args:
+            pu (np.ndarray): User factors (n_users, n_factors).
+            qi (np.ndarray): Item factors (n_items, n_factors).
+            bu (np.ndarray): User biases.
+            bi (np.ndarray): Item biases.
+            global_mean (float): Mean of the training ratings.
+            user_raw_ids (np.ndarray): Raw userId of each user index.
+            item_raw_ids (np.ndarray): Raw movieId of each item index.
+        """
+        self.pu = pu
+        self.qi = qi
+        self.bu = bu
+        self.bi = bi
+        self.global_mean = global_mean
+        self.user_raw_ids = user_raw_ids
+        self.item_raw_ids = item_raw_ids
+
+    def predict(self, user_index, item_index, clip=True):
+        """
+        Predicts ratings for (user, item) index pairs.
+
+        Args:
+            user_index (np.ndarray): Dense user indices.
+            item_index (np.ndarray): Dense item indices.
+            clip (bool): Clip the estimates to RATING_SCALE, like Surprise.
+
+        Returns:
+            np.ndarray: Estimated ratings.
+        """
+        est = (
+            self.global_mean
+            + self.bu[user_index]
+            + self.bi[item_index]
+            + np.einsum("ij,ij->i", self.pu[user_index], self.qi[item_index])
+        )
+        if clip:
+            est = np.clip(est, *RATING_SCALE)
+        return est
+
+    def mappings(self):
+        """
+        Builds the raw-to-inner ID mappings in the format of svd_mappings.pkl.
+
+        Keys are strings, like the mappings exported from Surprise trainsets.
+
+        Returns:
+            dict: {"users": {raw_id: inner_id}, "items": {raw_id: inner_id}}.
+        """
+        return {
+            "users": {
+                str(r): i for i, r in enumerate(self.user_raw_ids.tolist())
+            },
+            "items": {
+                str(r): i for i, r in enumerate(self.item_raw_ids.tolist())
+            },
+        }
+
+    def save(self, models_dir):
+        """
+        Writes the optimized model files read by model.ModelStore.
+
+        Every file is written to a temp file and renamed over the old one, so
+        a ModelStore that has the previous arrays memory-mapped keeps reading
+        them until it reloads.
+
+        Args:
+            models_dir (str): Output directory.
+        """
+        os.makedirs(models_dir, exist_ok=True)
+        for name in ("pu", "qi", "bu", "bi"):
+            _save_array(models_dir, f"svd_{name}", getattr(self, name))
+        _save_array(models_dir, "svd_global_mean", np.array([self.global_mean]))
+        # Mappings last: ModelStore only loads a model once they exist
+        mappings = self.mappings()
+        _write_atomic(
+            os.path.join(models_dir, "svd_mappings.pkl"),
+            lambda f: pickle.dump(mappings, f),
+        )
+        print(f"Saved optimized model files to {models_dir}")
+
+
+def train_biased_mf(
+    user_index,
+    item_index,
+    ratings,
+    n_users,
+    n_items,
+    n_factors=N_FACTORS,
+    n_epochs=N_EPOCHS,
+    lr=LEARNING_RATE,
+    reg=REGULARIZATION,
+    init_mean=INIT_MEAN,
+    init_std=INIT_STD,
+    batch_size=BATCH_SIZE,
+    max_updates=MAX_BATCH_UPDATES,
+    random_state=None,
+    verbose=True,
+):
+    """
+    Trains biased matrix factorization with mini-batch SGD.
+
+    Runs the updates of surprise.SVD on shuffled mini-batches: the errors of
+    a batch are computed at once and the gradients of ratings sharing a
+    user or item are summed (see `_scatter_step`), so each batch is a
+    handful of NumPy operations instead of one update per rating.
+
+    Args:
+        user_index (np.ndarray): Dense user index per rating.
+        item_index (np.ndarray): Dense item index per rating.
+        ratings (np.ndarray): Rating values.
+        n_users (int): Number of users.
+        n_items (int): Number of items.
+        n_factors (int): Number of latent factors.
+        n_epochs (int): Passes over the ratings.
+        lr (float): Learning rate of every parameter.
+        reg (float): L2 regularization of every parameter.
+        init_mean (float): Mean of the initial factors.
+        init_std (float): Standard deviation of the initial factors.
+        batch_size (int): Ratings per mini-batch.
+        max_updates (int): Updates of one user or item per batch (see
+            MAX_BATCH_UPDATES).
+        random_state (int): Seed of the initialization and the shuffling.
+        verbose (bool): Print the training RMSE of each epoch.
+
+    Returns:
+        tuple: (pu, qi, bu, bi, global_mean), float32 arrays.
+    """
+    rng = np.random.RandomState(random_state)
+    n_ratings = len(ratings)
+    global_mean = (
+        float(np.mean(ratings, dtype=np.float64)) if n_ratings else 0.0
+    )
+    pu = rng.normal(init_mean, init_std, (n_users, n_factors)).astype(
+        np.float32
+    )
+    qi = rng.normal(init_mean, init_std, (n_items, n_factors)).astype(
+        np.float32
+    )
+    bu = np.zeros(n_users, dtype=np.float32)
+    bi = np.zeros(n_items, dtype=np.float32)
+    lr = np.float32(lr)
+    reg = np.float32(reg)
+
+    # Reused buffers: fresh (batch, n_factors) temporaries on every batch
+    # would spend more time in page faults than in arithmetic
+    p_buf, q_buf, gp_buf, gq_buf, tmp_buf = (
+        np.empty((batch_size, n_factors), dtype=np.float32) for _ in range(5)
+    )
+
+    for epoch in range(n_epochs):
+        start = time.perf_counter()
+        order = rng.permutation(n_ratings)
+        squared_error = 0.0
+        for batch_start in range(0, n_ratings, batch_size):
+            batch = order[batch_start : batch_start + batch_size]
+            b = len(batch)
+            u = user_index[batch]
+            i = item_index[batch]
+            p = np.take(pu, u, axis=0, out=p_buf[:b])
+            q = np.take(qi, i, axis=0, out=q_buf[:b])
+            err = (
+                ratings[batch]
+                - global_mean
+                - bu[u]
+                - bi[i]
+                - np.einsum("ij,ij->i", p, q)
+            )
+            squared_error += float(np.dot(err, err))
+
+            # Surprise's updates, all evaluated at the start of the batch
+            err_col = err[:, np.newaxis]
+            gp = np.multiply(q, err_col, out=gp_buf[:b])
+            gp -= np.multiply(p, reg, out=tmp_buf[:b])
+            gq = np.multiply(p, err_col, out=gq_buf[:b])
+            gq -= np.multiply(q, reg, out=tmp_buf[:b])
+            _scatter_step(pu, bu, u, gp, err - reg * bu[u], lr, max_updates)
+            _scatter_step(qi, bi, i, gq, err - reg * bi[i], lr, max_updates)
+
+        if verbose:
+            rmse = np.sqrt(squared_error / max(n_ratings, 1))
+            elapsed = time.perf_counter() - start
+            print(
+                f"Epoch {epoch + 1}/{n_epochs}: train RMSE {rmse:.4f} "
+                f"({elapsed:.1f} s)"
+            )
+    return pu, qi, bu, bi, global_mean
+
+
+def train_from_store(store, **kwargs):
+    """
+    Trains a BiasedMF model on a RatingsStore.
+
+    Args:
+        store (RatingsStore): The columnar ratings.
+        **kwargs: Hyperparameters passed to `train_biased_mf`.
+
+    Returns:
+        BiasedMF: The trained model, indexed by the store's dense indices.
+    """
+    pu, qi, bu, bi, global_mean = train_biased_mf(
+        np.asarray(store.user_index),
+        np.asarray(store.item_index),
+        decode_ratings(store.rating_codes),
+        store.n_users,
+        store.n_items,
+        **kwargs,
+    )
+    return BiasedMF(
+        pu, qi, bu, bi, global_mean, store.user_raw_ids, store.item_raw_ids
+    )
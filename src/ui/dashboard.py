@@ -1,14 +1,16 @@
 import streamlit as st
 import pandas as pd
-from src.data_loader import load_movies, search_movies
+from src.data_loader import load_movies, search_movies, suggest_movies
 from src.database import (
     add_rating,
     get_user_ratings,
     delete_user,
     get_user_genres,
     update_user_genres,
+    get_movielens_user_id,
+    link_movielens_user,
 )
-from src.model import get_recommendations
+from src.model import get_recommendations, is_known_movielens_user
 from src.utils import (
     translate_genres,
     get_spanish_genres_list,
@@ -42,7 +44,13 @@ def render_search_tab():
     # Load movies (cached)
     movies_df = load_movies()
 
-    results = search_movies(query, movies_df)
+    # Autocomplete suggestions for the text typed so far
+    suggestions = suggest_movies(query, movies_df, limit=5)
+    if suggestions:
+        st.caption("Sugerencias: " + " · ".join(suggestions))
+
+    # Most popular matches first, so users rarely need to page
+    results = search_movies(query, movies_df, order="popularity")
 
     if results.empty:
         st.info("No se encontraron películas.")
@@ -237,6 +245,30 @@ def render_profile_tab():
         # Optional: rerun to ensure state is consistent if we use this elsewhere immediately
         # st.rerun()
 
+    st.markdown("---")
+    st.subheader("Historial de MovieLens")
+    st.write(
+        "Si tus valoraciones forman parte del dataset de MovieLens, vincula "
+        "tu usuario para recibir recomendaciones basadas en tu historial."
+    )
+    current_ml_id = get_movielens_user_id(st.session_state["user_id"])
+    movielens_user_id = st.number_input(
+        "ID de usuario de MovieLens:",
+        min_value=0,
+        value=current_ml_id or 0,
+        step=1,
+        help="Introduce 0 para desvincular tu cuenta.",
+    )
+    if st.button("Guardar Vinculación"):
+        if movielens_user_id == 0:
+            link_movielens_user(st.session_state["user_id"], None)
+            st.success("Cuenta desvinculada de MovieLens.")
+        elif is_known_movielens_user(movielens_user_id):
+            link_movielens_user(st.session_state["user_id"], movielens_user_id)
+            st.success("¡Cuenta vinculada correctamente!")
+        else:
+            st.error("Ese usuario no existe en el modelo entrenado.")
+
     st.markdown("---")
 
     st.subheader("Zona de Peligro")
@@ -1,3 +1,5 @@
+import numpy as np
+
 GENRE_MAP = {
     "Action": "Acción",
     "Adventure": "Aventura",
@@ -22,6 +24,37 @@ GENRE_MAP = {
 
 REVERSE_GENRE_MAP = {v: k for k, v in GENRE_MAP.items()}
 
+# Column order of the genre multi-hot matrices (placeholder excluded)
+GENRE_VOCAB = [g for g in GENRE_MAP if g != "(no genres listed)"]
+GENRE_INDEX = {g: i for i, g in enumerate(GENRE_VOCAB)}
+
+
+def genre_multi_hot(genres_strings):
+    """
+    Encodes pipe-separated genre strings as a multi-hot matrix.
+
+    Columns follow GENRE_VOCAB. Genres outside the vocabulary and the
+    '(no genres listed)' placeholder are ignored, so such movies get an
+    all-zero row.
+
+    Args:
+        genres_strings (iterable): Pipe-separated genre strings (EN).
+
+    Returns:
+        np.ndarray: uint8 matrix of shape
+        (len(genres_strings), len(GENRE_VOCAB)).
+    """
+    genres_strings = list(genres_strings)
+    matrix = np.zeros((len(genres_strings), len(GENRE_VOCAB)), dtype=np.uint8)
+    for row, genres_str in enumerate(genres_strings):
+        if not isinstance(genres_str, str):
+            continue
+        for genre in genres_str.split("|"):
+            col = GENRE_INDEX.get(genre)
+            if col is not None:
+                matrix[row, col] = 1
+    return matrix
+
 
 def translate_genres(genres_str):
     """
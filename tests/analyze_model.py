@@ -67,9 +67,16 @@ def analyze():
 
     # Fold in
     print("\n...Folding in user...")
-    # Using defaults first
+    # Using the SGD solver to inspect the effect of its hyperparameters
     user_factors, user_bias = fold_in_user(
-        user_ratings_df, qi, bi, global_mean, mappings, n_epochs=20, lr=0.005
+        user_ratings_df,
+        qi,
+        bi,
+        global_mean,
+        mappings,
+        n_epochs=20,
+        lr=0.005,
+        solver="sgd",
     )
 
     print(f"Resulting User Bias: {user_bias:.4f}")
@@ -0,0 +1,68 @@
+import sys
+import os
+import tempfile
+import time
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.model as model
+from src.model import ModelStore, recommend_batch
+from tests.verify_model_store import write_fake_model
+
+
+def verify():
+    with tempfile.TemporaryDirectory() as models_dir:
+        write_fake_model(models_dir, n_users=300, n_items=1000)
+        model._MODEL_STORE = ModelStore(models_dir)
+        pu, qi, bu, bi, global_mean, mappings = model._MODEL_STORE.load()
+
+        user_ids = np.arange(1, 301)
+        exclude = {1: [1, 2, 3], 7: list(range(1, 500))}
+
+        start = time.perf_counter()
+        item_ids, scores = recommend_batch(
+            user_ids, n=10, exclude=exclude, user_block=64, item_block=128
+        )
+        elapsed = time.perf_counter() - start
+        print(f"Scored {len(user_ids)} users in {elapsed * 1000:.1f} ms")
+
+        # Brute-force reference
+        full = global_mean + bu[:, None] + bi[None, :] + pu @ qi.T
+        for user_id, rated in exclude.items():
+            full[user_id - 1, np.array(rated) - 1] = -np.inf
+        expected = np.argsort(-full, axis=1, kind="stable")[:, :10] + 1
+
+        if item_ids.shape != (300, 10):
+            print("FAILURE: Unexpected output shape!")
+            return
+        if not np.array_equal(item_ids, expected):
+            print("FAILURE: Blocked top-N differs from the full ranking!")
+            return
+        if np.isin(item_ids[6], np.arange(1, 500)).any():
+            print("FAILURE: Rated movies were recommended!")
+            return
+        if scores.max() > 5.0 or scores.min() < 1.0:
+            print("FAILURE: Scores out of bounds!")
+            return
+        print("SUCCESS: Blocked top-N matches the full ranking.")
+
+        # Users who rated nearly everything get padded rows
+        almost_all = {5: list(range(1, 996))}
+        item_ids, scores = recommend_batch([5], n=10, exclude=almost_all)
+        if (item_ids[0] == -1).sum() != 5 or np.isnan(scores[0]).sum() != 5:
+            print("FAILURE: Exhausted rows should be padded!")
+            return
+
+        item_ids, scores = recommend_batch([1, 2], n=0)
+        if item_ids.shape != (2, 0):
+            print("FAILURE: n=0 should return empty rows!")
+            return
+
+    model._MODEL_STORE = None
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,95 @@
+import sys
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.catalog as catalog_module
+from src.catalog import Catalog, load_or_build_catalog
+
+
+def write_movies(path, n_movies=90000):
+    """Writes a movies.csv with the MovieLens layout."""
+    rng = np.random.RandomState(0)
+    genres = ["Action", "Comedy", "Drama", "Horror", "Sci-Fi", "Romance"]
+    movies_df = pd.DataFrame(
+        {
+            "movieId": np.arange(1, n_movies + 1) * 3,
+            "title": [
+                f"Película nº {i} ({1900 + i % 120})" for i in range(n_movies)
+            ],
+            "genres": [
+                "|".join(rng.choice(genres, rng.randint(1, 4), replace=False))
+                for _ in range(n_movies)
+            ],
+        }
+    )
+    movies_df.loc[0, "genres"] = "(no genres listed)"
+    movies_df.loc[1, "title"] = 'Amélie, "Le fabuleux destin" (2001)'
+    movies_df.to_csv(path, index=False)
+    return movies_df
+
+
+def verify():
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "movies.csv")
+        out_dir = os.path.join(tmp, "catalog")
+        movies_df = write_movies(csv_path)
+
+        compiled = []
+        original = catalog_module.compile_catalog
+
+        def counting_compile(*args, **kwargs):
+            compiled.append(1)
+            return original(*args, **kwargs)
+
+        catalog_module.compile_catalog = counting_compile
+        try:
+            load_or_build_catalog(csv_path, out_dir)
+
+            start = time.perf_counter()
+            catalog = load_or_build_catalog(csv_path, out_dir)
+            print(f"Open time: {(time.perf_counter() - start) * 1000:.1f} ms")
+            if len(compiled) != 1:
+                print("FAILURE: Catalog was rebuilt without CSV changes!")
+                return
+
+            # Same content with a new mtime must not trigger a rebuild
+            os.utime(csv_path, ns=(0, 0))
+            load_or_build_catalog(csv_path, out_dir)
+            if len(compiled) != 1:
+                print("FAILURE: Catalog was rebuilt for an unchanged checksum!")
+                return
+
+            reference = Catalog.from_frame(pd.read_csv(csv_path))
+            frame = catalog.to_frame()
+            if not frame.equals(pd.read_csv(csv_path)):
+                print("FAILURE: Binary catalog differs from movies.csv!")
+                return
+            if not np.array_equal(catalog.genre_matrix, reference.genre_matrix):
+                print("FAILURE: Genre bitmasks do not round-trip!")
+                return
+            if not np.array_equal(catalog.years, reference.years):
+                print("FAILURE: Years do not round-trip!")
+                return
+            print(f"Title of movie 6: {catalog.title(6)}")
+
+            # A content change must trigger a rebuild
+            movies_df.loc[2, "title"] = "Changed (1999)"
+            movies_df.to_csv(csv_path, index=False)
+            catalog = load_or_build_catalog(csv_path, out_dir)
+            if len(compiled) != 2 or catalog.title(9) != "Changed (1999)":
+                print("FAILURE: Catalog was not rebuilt after a CSV change!")
+                return
+        finally:
+            catalog_module.compile_catalog = original
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,185 @@
+import sys
+import os
+import tempfile
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.database as database
+from src.database import (
+    init_db,
+    create_user,
+    add_rating,
+    add_ratings,
+    delete_user,
+    get_rating_writer,
+    get_user_genres,
+    get_user_rating_arrays,
+    get_user_ratings,
+    update_user_genres,
+    get_db_connection,
+    close_db_connections,
+)
+
+
+def verify():
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "test.db")
+        init_db()
+
+        print("--- Connection pool ---")
+        conn = get_db_connection()
+        conn.close()
+        if get_db_connection() is not conn:
+            print("FAILURE: Connection was not reused within the thread!")
+            return
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+        print(f"journal_mode={mode}, synchronous={sync}")
+        if mode != "wal" or sync != 1:
+            print("FAILURE: Pragmas were not applied!")
+            return
+
+        # close() must discard unfinished work
+        conn.execute("INSERT INTO ratings VALUES (999, 1, 5.0, 0)")
+        conn.close()
+        if not get_user_ratings(999).empty:
+            print("FAILURE: Uncommitted rows leaked into the pool!")
+            return
+
+        # A write that raised before closing must not be committed by the
+        # next unrelated write on the same thread
+        create_user("mid_write", "mid@example.com", "password", [])
+        try:
+            get_db_connection().execute("DELETE FROM users")
+            raise RuntimeError("interrupted")
+        except RuntimeError:
+            pass
+        update_user_genres(1, ["Drama"])
+        if get_user_genres(1) != ["Drama"]:
+            print("FAILURE: An interrupted write was committed later!")
+            return
+
+        print("\n--- Concurrent sessions ---")
+        create_user("pool_user", "pool@example.com", "password", [])
+        errors = []
+        # Keep references so object ids cannot be reused
+        thread_connections = []
+
+        def session(user_id):
+            try:
+                for movie_id in range(1, 21):
+                    add_rating(user_id, movie_id, 4.0)
+                    get_user_ratings(user_id)
+                thread_connections.append(get_db_connection())
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=session, args=(u,)) for u in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            print(f"FAILURE: Concurrent sessions failed: {errors[0]}")
+            return
+        counts = [len(get_user_ratings(u)) for u in range(8)]
+        print(f"Ratings per user: {counts}")
+        if counts != [20] * 8 or len({id(c) for c in thread_connections}) != 8:
+            print("FAILURE: Unexpected results from concurrent sessions!")
+            return
+
+        print("\n--- Group commit ---")
+        writer = get_rating_writer()
+        before = writer.stats()
+        tickets = [
+            add_rating(100 + i % 4, i, 3.5, wait=False) for i in range(400)
+        ]
+        for ticket in tickets:
+            ticket.wait(5.0)
+        after = writer.stats()
+        batches = after["batches"] - before["batches"]
+        print(f"400 queued ratings committed in {batches} transactions")
+        if batches >= 400 or any(not t.done for t in tickets):
+            print("FAILURE: Ratings were not grouped into shared commits!")
+            return
+        if [len(get_user_ratings(100 + u)) for u in range(4)] != [100] * 4:
+            print("FAILURE: Queued ratings are missing!")
+            return
+
+        add_ratings(200, [(1, 4.0), (2, 2.5, 1234)])
+        history = get_user_ratings(200).set_index("movie_id")
+        if len(history) != 2 or history.loc[2, "timestamp"] != 1234:
+            print("FAILURE: Bulk insert did not store the ratings!")
+            return
+
+        movie_ids, ratings = get_user_rating_arrays(200)
+        if (
+            movie_ids.dtype != "int32"
+            or ratings.dtype != "float32"
+            or sorted(zip(movie_ids.tolist(), ratings.tolist()))
+            != [(1, 4.0), (2, 2.5)]
+        ):
+            print("FAILURE: Array read path does not match the ratings!")
+            return
+        if len(get_user_rating_arrays(12345)[0]) != 0:
+            print("FAILURE: Unknown users should have no ratings!")
+            return
+
+        # Pending writes are flushed before a user is deleted
+        add_rating(200, 3, 5.0, wait=False)
+        delete_user(200)
+        if not get_user_ratings(200).empty:
+            print("FAILURE: A queued rating survived the user deletion!")
+            return
+
+        # A failing write is reported without losing the rest of its batch
+        conn = get_db_connection()
+        conn.execute(
+            "CREATE TRIGGER reject BEFORE INSERT ON ratings "
+            "WHEN NEW.rating > 5 "
+            "BEGIN SELECT RAISE(ABORT, 'invalid rating'); END"
+        )
+        conn.commit()
+        good = add_rating(300, 1, 4.0, wait=False)
+        bad = add_rating(300, 2, 9.0, wait=False)
+        good.wait(5.0)
+        try:
+            bad.wait(5.0)
+            print("FAILURE: The invalid rating was accepted!")
+            return
+        except database.sqlite3.Error:
+            pass
+        if list(get_user_ratings(300)["movie_id"]) != [1]:
+            print("FAILURE: The valid rating was lost with the failing one!")
+            return
+
+        # Errors other than sqlite3.Error must not stop the writer
+        try:
+            add_rating(300, 2**70, 4.0)
+            print("FAILURE: An out-of-range movie ID was accepted!")
+            return
+        except OverflowError:
+            pass
+        add_rating(300, 3, 3.0)
+        if not get_rating_writer().flush():
+            print("FAILURE: The writer stopped after a failed write!")
+            return
+        if list(get_user_ratings(300)["movie_id"]) != [1, 3]:
+            print("FAILURE: Writes after a failure were lost!")
+            return
+
+        close_db_connections()
+        if get_user_ratings(0).empty:
+            print("FAILURE: Reconnecting after close_db_connections failed!")
+            return
+        close_db_connections()
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
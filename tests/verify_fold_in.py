@@ -0,0 +1,183 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import fold_in_user, fold_in_user_incremental, fold_in_users
+
+
+def make_problem(n_items=500, n_factors=20, n_rated=60, seed=0):
+    """Builds a random item model and a user who rated some of its items."""
+    rng = np.random.RandomState(seed)
+    qi = rng.normal(0, 0.3, (n_items, n_factors))
+    bi = rng.normal(0, 0.3, n_items)
+    global_mean = 3.5
+    mappings = {"items": {str(i + 1): i for i in range(n_items)}}
+
+    true_pu = rng.normal(0, 0.5, n_factors)
+    rated = rng.choice(n_items, n_rated, replace=False)
+    ratings = np.clip(
+        global_mean + 0.2 + bi[rated] + qi[rated] @ true_pu, 0.5, 5.0
+    )
+    user_ratings_df = pd.DataFrame({"movie_id": rated + 1, "rating": ratings})
+    return user_ratings_df, qi, bi, global_mean, mappings
+
+
+def verify():
+    user_ratings_df, qi, bi, global_mean, mappings = make_problem()
+
+    print("--- Ridge vs SGD parity ---")
+    start = time.perf_counter()
+    pu_sgd, bu_sgd = fold_in_user(
+        user_ratings_df,
+        qi,
+        bi,
+        global_mean,
+        mappings,
+        n_epochs=1000,
+        solver="sgd",
+    )
+    sgd_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pu_ridge, bu_ridge = fold_in_user(
+        user_ratings_df, qi, bi, global_mean, mappings, solver="ridge"
+    )
+    ridge_time = time.perf_counter() - start
+
+    pu_gap = np.max(np.abs(pu_sgd - pu_ridge))
+    bu_gap = abs(bu_sgd - bu_ridge)
+    print(f"SGD time: {sgd_time * 1000:.1f} ms")
+    print(f"Ridge time: {ridge_time * 1000:.2f} ms")
+    print(f"Max |pu_sgd - pu_ridge|: {pu_gap:.4f}")
+    print(f"|bu_sgd - bu_ridge|: {bu_gap:.4f}")
+
+    if pu_ridge.shape != pu_sgd.shape or not isinstance(bu_ridge, float):
+        print("FAILURE: Ridge solver broke the (pu, bu) contract!")
+        return
+    # Per-sample SGD with a constant learning rate hovers around the optimum
+    if pu_gap > 0.05 or bu_gap > 0.05:
+        print("FAILURE: Ridge solution does not match the SGD fold-in!")
+        return
+
+    print("\n--- Array input ---")
+    arrays = (
+        user_ratings_df["movie_id"].values.astype(np.int32),
+        user_ratings_df["rating"].values.astype(np.float32),
+    )
+    pu_arr, bu_arr = fold_in_user(arrays, qi, bi, global_mean, mappings)
+    pu_f32, bu_f32 = fold_in_user(
+        pd.DataFrame({"movie_id": arrays[0], "rating": arrays[1]}),
+        qi,
+        bi,
+        global_mean,
+        mappings,
+    )
+    if not np.allclose(pu_arr, pu_f32) or not np.isclose(bu_arr, bu_f32):
+        print("FAILURE: Array input differs from DataFrame input!")
+        return
+    print("SUCCESS: Arrays and DataFrames give the same fold-in.")
+
+    print("\n--- Unknown movies only ---")
+    unknown_df = pd.DataFrame({"movie_id": [999999], "rating": [4.0]})
+    pu, bu = fold_in_user(unknown_df, qi, bi, global_mean, mappings)
+    if np.any(pu) or bu != 0.0:
+        print("FAILURE: Users without known movies should get zero factors!")
+        return
+
+    print("\n--- Incremental fold-in ---")
+    heavy_df, qi_big, bi_big, global_mean, big_mappings = make_problem(
+        n_items=20000, n_factors=100, n_rated=5000, seed=3
+    )
+    args = (qi_big, bi_big, global_mean, big_mappings)
+    _, _, state = fold_in_user_incremental(heavy_df, *args)
+    rng = np.random.RandomState(7)
+    unrated = np.setdiff1d(np.arange(1, 20001), heavy_df["movie_id"].values)
+    incremental_time = 0.0
+    full_time = 0.0
+    for step in range(60):
+        if step % 3 == 0:
+            # Change an existing rating
+            heavy_df.iloc[step, 1] = rng.choice([1.0, 3.0, 5.0])
+        elif step % 3 == 1:
+            # Add a new rating
+            new_row = {"movie_id": unrated[step], "rating": 4.5}
+            heavy_df = pd.concat(
+                [heavy_df, pd.DataFrame([new_row])], ignore_index=True
+            )
+        else:
+            # Remove a rating
+            heavy_df = heavy_df.drop(heavy_df.index[-step]).reset_index(
+                drop=True
+            )
+
+        start = time.perf_counter()
+        pu_inc, bu_inc, state = fold_in_user_incremental(
+            heavy_df, *args, state=state
+        )
+        incremental_time += time.perf_counter() - start
+        start = time.perf_counter()
+        pu_full, bu_full = fold_in_user(heavy_df, *args)
+        full_time += time.perf_counter() - start
+
+        if not np.allclose(pu_inc, pu_full, atol=1e-8) or not np.isclose(
+            bu_inc, bu_full, atol=1e-8
+        ):
+            print(f"FAILURE: Incremental fold-in drifted at step {step}!")
+            return
+    print(f"Full solve: {full_time / 60 * 1000:.2f} ms per update")
+    print(f"Incremental: {incremental_time / 60 * 1000:.2f} ms per update")
+    if state.updates >= 50:
+        print("FAILURE: Statistics were never rebuilt!")
+        return
+
+    # A user whose previous state had no ratings yet
+    empty_df = heavy_df.iloc[:0]
+    _, _, empty_state = fold_in_user_incremental(empty_df, *args)
+    pu_inc, bu_inc, _ = fold_in_user_incremental(
+        heavy_df.iloc[:3], *args, state=empty_state
+    )
+    pu_full, bu_full = fold_in_user(heavy_df.iloc[:3], *args)
+    if not np.allclose(pu_inc, pu_full) or not np.isclose(bu_inc, bu_full):
+        print("FAILURE: Updating an empty state differs from the full solve!")
+        return
+    print("SUCCESS: Incremental updates match the full solve.")
+
+    print("\n--- Batched fold-in ---")
+    frames = []
+    for user_id in range(1, 41):
+        df, _, _, _, _ = make_problem(n_rated=5 + user_id % 7, seed=user_id)
+        df["user_id"] = user_id
+        frames.append(df)
+    frames.append(
+        pd.DataFrame({"user_id": [99], "movie_id": [999999], "rating": [3.0]})
+    )
+    all_ratings = pd.concat(frames, ignore_index=True)
+
+    start = time.perf_counter()
+    user_ids, pu_batch, bu_batch = fold_in_users(
+        all_ratings, qi, bi, global_mean, mappings
+    )
+    batch_time = time.perf_counter() - start
+    print(f"Batched time for {len(user_ids)} users: {batch_time * 1000:.2f} ms")
+
+    for row, user_id in enumerate(user_ids):
+        user_df = all_ratings[all_ratings["user_id"] == user_id]
+        pu, bu = fold_in_user(user_df, qi, bi, global_mean, mappings)
+        if not np.allclose(pu, pu_batch[row]) or not np.isclose(
+            bu, bu_batch[row]
+        ):
+            print(f"FAILURE: Batched result differs for user {user_id}!")
+            return
+
+    print("SUCCESS: Batched solutions match the single-user solver.")
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
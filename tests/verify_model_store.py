@@ -0,0 +1,88 @@
+import sys
+import os
+import pickle
+import tempfile
+import threading
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.model as model
+from src.model import ModelStore
+
+
+def write_fake_model(models_dir, n_users=50, n_items=200, n_factors=8):
+    """Writes a small random model with the same layout as the real export."""
+    rng = np.random.RandomState(0)
+    np.save(
+        os.path.join(models_dir, "svd_pu.npy"),
+        rng.normal(0, 0.1, (n_users, n_factors)),
+    )
+    np.save(
+        os.path.join(models_dir, "svd_qi.npy"),
+        rng.normal(0, 0.1, (n_items, n_factors)),
+    )
+    np.save(os.path.join(models_dir, "svd_bu.npy"), rng.normal(0, 0.3, n_users))
+    np.save(os.path.join(models_dir, "svd_bi.npy"), rng.normal(0, 0.3, n_items))
+    np.save(os.path.join(models_dir, "svd_global_mean.npy"), np.array([3.5]))
+    mappings = {
+        "users": {str(u + 1): u for u in range(n_users)},
+        "items": {str(i + 1): i for i in range(n_items)},
+    }
+    with open(os.path.join(models_dir, "svd_mappings.pkl"), "wb") as f:
+        pickle.dump(mappings, f)
+
+
+def verify():
+    with tempfile.TemporaryDirectory() as models_dir:
+        write_fake_model(models_dir)
+        store = ModelStore(models_dir)
+
+        # Count real loads while many threads hit the store at once
+        calls = []
+        original = model.load_optimized_components
+
+        def counting_load(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+
+        model.load_optimized_components = counting_load
+        try:
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(store.load()))
+                for _ in range(16)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            model.load_optimized_components = original
+
+        print(f"Loads performed: {len(calls)}")
+        if len(calls) != 1:
+            print("FAILURE: Components were loaded more than once!")
+            return
+        if any(r is not results[0] for r in results):
+            print("FAILURE: Sessions received different component objects!")
+            return
+
+        stats = store.stats()
+        print(f"Load time: {stats['load_time'] * 1000:.2f} ms")
+        print(f"Memory: {stats['memory']}")
+        if not stats["loaded"] or stats["memory"]["qi"] != 200 * 8 * 8:
+            print("FAILURE: Unexpected store statistics!")
+            return
+
+    missing = ModelStore(tempfile.gettempdir() + "/missing_model_dir")
+    if missing.load() is not None or missing.loaded:
+        print("FAILURE: Missing model should not be cached as loaded!")
+        return
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
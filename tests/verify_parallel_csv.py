@@ -0,0 +1,87 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.parallel_csv as parallel_csv
+from src.parallel_csv import (
+    RATINGS_DTYPES,
+    TAGS_DTYPES,
+    read_csv_parallel,
+    split_ranges,
+)
+
+
+def write_files(tmp, n_rows=20_000, seed=0):
+    """Writes a random ratings.csv and a tags.csv with quoted tags."""
+    rng = np.random.RandomState(seed)
+    ratings = pd.DataFrame(
+        {
+            "userId": rng.randint(1, 5000, n_rows),
+            "movieId": rng.randint(1, 200_000, n_rows),
+            "rating": rng.randint(1, 11, n_rows) / 2,
+            "timestamp": rng.randint(800_000_000, 1_700_000_000, n_rows),
+        }
+    )
+    words = np.array(["funny", "dark, gritty", 'so "bad"', "sci-fi", "1984"])
+    tags = ratings.drop(columns="rating").assign(
+        tag=words[rng.randint(0, len(words), n_rows)]
+    )[["userId", "movieId", "tag", "timestamp"]]
+    paths = (os.path.join(tmp, "ratings.csv"), os.path.join(tmp, "tags.csv"))
+    ratings.to_csv(paths[0], index=False)
+    tags.to_csv(paths[1], index=False)
+    return paths
+
+
+def verify():
+    # Use the pool even for the small test files
+    parallel_csv.PARALLEL_MIN_BYTES = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        ratings_path, tags_path = write_files(tmp)
+
+        print("--- Byte ranges ---")
+        with open(ratings_path, "rb") as f:
+            data = f.read()
+        for n_parts in (1, 2, 3, 7, 64):
+            ranges = split_ranges(ratings_path, n_parts)
+            if ranges[0][0] != data.index(b"\n") + 1 or ranges[-1][1] != len(
+                data
+            ):
+                print(f"FAILURE: {n_parts} ranges do not cover the rows!")
+                return
+            for (_, end), (start, _) in zip(
+                ranges[:-1], ranges[1:], strict=True
+            ):
+                if end != start or data[start - 1 : start] != b"\n":
+                    print(f"FAILURE: Range at {start} is not line-aligned!")
+                    return
+        print(f"SUCCESS: 64 parts -> {len(ranges)} line-aligned ranges.")
+
+        print("\n--- Parsing ---")
+        for path, dtype in (
+            (ratings_path, RATINGS_DTYPES),
+            (tags_path, TAGS_DTYPES),
+        ):
+            reference = pd.read_csv(path, dtype=dtype)
+            for workers in (1, 2, 3, 8):
+                frame = read_csv_parallel(path, dtype, workers=workers)
+                if not frame.equals(reference):
+                    print(
+                        f"FAILURE: {os.path.basename(path)} with {workers} "
+                        "workers differs from pd.read_csv!"
+                    )
+                    return
+            print(f"SUCCESS: {os.path.basename(path)} matches pd.read_csv.")
+        if frame["tag"].isin(["dark, gritty", 'so "bad"']).sum() == 0:
+            print("FAILURE: Quoted tags were not parsed!")
+            return
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
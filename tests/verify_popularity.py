@@ -0,0 +1,160 @@
+import sys
+import os
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.data_loader as data_loader
+import src.model as model
+from src.catalog import read_manifest
+from src.database import add_rating, create_user
+from src.movie_stats import (
+    POPULARITY_FILE,
+    PopularMovies,
+    build_popular_lists,
+    compute_decayed_stats,
+    save_popular_lists,
+)
+from tests.verify_recommendation_cache import setup_environment
+
+DAY = 86400
+NOW = 1_700_000_000
+
+
+def write_ratings(path):
+    """Writes ratings where an old classic competes with a recent hit."""
+    rows = []
+    # Movie 1 (classic): many good ratings, ten years ago
+    rows += [(u, 1, 4.5, NOW - 3650 * DAY) for u in range(1, 201)]
+    # Movie 2 (recent hit): fewer ratings, last month
+    rows += [(u, 2, 4.0, NOW - 30 * DAY) for u in range(1, 61)]
+    # Movie 3 (obscure): a single perfect rating
+    rows += [(1, 3, 5.0, NOW)]
+    # Background ratings so the prior has something to work with
+    rng = np.random.RandomState(0)
+    for movie_id in range(4, 60):
+        for u in range(rng.randint(2, 20)):
+            rows.append(
+                (u + 1, movie_id, 3.0, NOW - rng.randint(0, 2000) * DAY)
+            )
+    pd.DataFrame(
+        rows, columns=["userId", "movieId", "rating", "timestamp"]
+    ).to_csv(path, index=False)
+
+
+def verify():
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_environment(tmp, n_items=100)
+        write_ratings(data_loader.RATINGS_FILE)
+        catalog = data_loader.load_catalog()
+        catalog_md5 = read_manifest(data_loader.CATALOG_DIR)["source_md5"]
+
+        print("--- Time decay ---")
+        counts, means, now = compute_decayed_stats(
+            data_loader.RATINGS_FILE, catalog, half_life_days=365
+        )
+        chunked = compute_decayed_stats(
+            data_loader.RATINGS_FILE, catalog, half_life_days=365, chunksize=50
+        )
+        if now != NOW or not np.allclose(counts, chunked[0]):
+            print("FAILURE: Chunked aggregation differs from a single pass!")
+            return
+        row = catalog.row(1)
+        print(f"Decayed count of the classic: {counts[row]:.2f} (200 ratings)")
+        if not np.isclose(counts[row], 200 * 0.5**10, rtol=1e-3):
+            print("FAILURE: Ratings are not decayed by their age!")
+            return
+
+        decayed = PopularMovies(
+            **build_popular_lists(counts, means, catalog), now=now
+        )
+        counts_flat, means_flat, _ = compute_decayed_stats(
+            data_loader.RATINGS_FILE, catalog, half_life_days=1e9
+        )
+        flat = PopularMovies(
+            **build_popular_lists(counts_flat, means_flat, catalog)
+        )
+        top_decayed = list(decayed.top(3)[0])
+        top_decayed_4 = list(decayed.top(4)[0])
+        top_flat = list(flat.top(3)[0])
+        print(f"Top with decay: {top_decayed}, without: {top_flat}")
+        if top_decayed[0] != 2 or top_flat[0] != 1:
+            print("FAILURE: Recent activity does not outweigh old ratings!")
+            return
+        if 3 in top_decayed:
+            print("FAILURE: A single perfect rating reached the top!")
+            return
+
+        print("\n--- Genre lists ---")
+        genre = catalog.genres[catalog.row(2)].split("|")[0]
+        movie_ids, scores, ratings = decayed.top(5, genres=[genre])
+        if movie_ids[0] != 2 or list(scores) != sorted(scores, reverse=True):
+            print("FAILURE: Genre list is not ranked by popularity!")
+            return
+        for movie_id in movie_ids:
+            if genre not in catalog.genres[catalog.row(movie_id)]:
+                print(f"FAILURE: Movie {movie_id} is not a {genre} movie!")
+                return
+        if 2 in decayed.top(5, genres=[genre], exclude=[2])[0]:
+            print("FAILURE: Excluded movies were returned!")
+            return
+        print(f"SUCCESS: {genre} list: {list(movie_ids)}")
+
+        print("\n--- Artifact ---")
+        path = os.path.join(data_loader.CATALOG_DIR, POPULARITY_FILE)
+        save_popular_lists(
+            path,
+            build_popular_lists(counts, means, catalog),
+            catalog_md5,
+            now,
+            365,
+        )
+        print(f"Artifact size: {os.path.getsize(path)} bytes")
+        if PopularMovies.load(path, "another-catalog") is not None:
+            print("FAILURE: Lists of another catalog were accepted!")
+            return
+        loaded = data_loader.load_popular_movies()
+        if loaded is None or list(loaded.top(3)[0]) != top_decayed:
+            print("FAILURE: Saved lists do not round-trip!")
+            return
+
+        print("\n--- Cold-start fallback ---")
+        create_user("newcomer", "new@example.com", "password", [])
+        recs = model.get_recommendations(1, n=3)
+        print(f"Cold user without genres: {[r['movieId'] for r in recs]}")
+        if [r["movieId"] for r in recs] != top_decayed:
+            print("FAILURE: Cold user did not get the popularity list!")
+            return
+        create_user("fan", "fan@example.com", "password", ["Horror"])
+        recs = model.get_recommendations(2, n=3)
+        if [r["movieId"] for r in recs] == top_decayed:
+            print("FAILURE: Users with genres lost their personalization!")
+            return
+
+        # Ratings of movies unknown to the model give no signal, but those
+        # movies must not be recommended back
+        store = model.get_model_store()
+        path = os.path.join(store.models_dir, "svd_mappings.pkl")
+        with open(path, "rb") as f:
+            mappings = pickle.load(f)
+        del mappings["items"][str(top_decayed[0])]
+        with open(path, "wb") as f:
+            pickle.dump(mappings, f)
+        store.reload()
+        create_user("outsider", "out@example.com", "password", [])
+        add_rating(3, top_decayed[0], 5.0)
+        recs = [r["movieId"] for r in model.get_recommendations(3, n=3)]
+        if top_decayed[0] in recs or recs != top_decayed_4[1:]:
+            print("FAILURE: Rated movies were recommended back!")
+            return
+        print("SUCCESS: Users without any signal get the popular list.")
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
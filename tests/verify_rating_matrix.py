@@ -0,0 +1,118 @@
+import sys
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.rating_matrix as rating_matrix
+from src.rating_matrix import load_or_build_rating_matrix
+from src.ratings_store import load_or_build_ratings_store
+
+
+def write_ratings(path, n_ratings=30_000, seed=0):
+    """Writes a random ratings.csv without duplicate (user, movie) pairs."""
+    rng = np.random.RandomState(seed)
+    ratings = pd.DataFrame(
+        {
+            "userId": rng.randint(1, 800, n_ratings),
+            "movieId": rng.randint(1, 5000, n_ratings),
+            "rating": rng.randint(1, 11, n_ratings) / 2,
+            "timestamp": rng.randint(800_000_000, 1_700_000_000, n_ratings),
+        }
+    ).drop_duplicates(["userId", "movieId"])
+    ratings.to_csv(path, index=False)
+    return ratings
+
+
+def verify():
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "ratings.csv")
+        out_dir = os.path.join(tmp, "ratings_store")
+        ratings = write_ratings(csv_path)
+        store = load_or_build_ratings_store(csv_path, out_dir)
+
+        builds = []
+        original = rating_matrix.save_rating_matrix
+
+        def counting_save(*args, **kwargs):
+            builds.append(1)
+            return original(*args, **kwargs)
+
+        rating_matrix.save_rating_matrix = counting_save
+        try:
+            print("--- Build ---")
+            matrix = load_or_build_rating_matrix(store, out_dir, "v1")
+            start = time.perf_counter()
+            matrix = load_or_build_rating_matrix(store, out_dir, "v1")
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"Shape {matrix.shape}, {matrix.nnz} ratings")
+            print(f"Reopening: {elapsed:.2f} ms")
+            if len(builds) != 1:
+                print("FAILURE: The matrices were rebuilt on reopening!")
+                return
+            if not isinstance(matrix.by_user.indices, np.memmap):
+                print("FAILURE: Loaded matrices are not memory-mapped!")
+                return
+            load_or_build_rating_matrix(store, out_dir, "v2")
+            if len(builds) != 2:
+                print("FAILURE: New ratings did not trigger a rebuild!")
+                return
+        finally:
+            rating_matrix.save_rating_matrix = original
+
+        print("\n--- Layouts ---")
+        reference = sp.csr_matrix(
+            (
+                store.rating_codes.astype(np.int64),
+                (store.user_index, store.item_index),
+            ),
+            shape=matrix.shape,
+        )
+        reference.sort_indices()
+        for name, layout, expected in (
+            ("CSR", matrix.by_user, reference),
+            ("CSC", matrix.by_item, reference.T.tocsr()),
+        ):
+            expected.sort_indices()
+            if not (
+                np.array_equal(layout.indptr, expected.indptr)
+                and np.array_equal(layout.indices, expected.indices)
+                and np.array_equal(layout.codes, expected.data)
+            ):
+                print(f"FAILURE: {name} layout differs from scipy.sparse!")
+                return
+            print(f"SUCCESS: {name} layout matches scipy.sparse.")
+
+        print("\n--- Rows and columns ---")
+        user_id, movie_id, rating = ratings.iloc[123][
+            ["userId", "movieId", "rating"]
+        ]
+        u = matrix.user_position(int(user_id))
+        i = matrix.item_position(int(movie_id))
+        items, codes = matrix.user_row(u)
+        users, _ = matrix.item_column(i)
+        if not np.shares_memory(items, matrix.by_user.indices):
+            print("FAILURE: user_row copied the ratings!")
+            return
+        expected_items = ratings.loc[ratings["userId"] == user_id, "movieId"]
+        if sorted(matrix.item_raw_ids[items]) != sorted(expected_items):
+            print("FAILURE: user_row does not hold the user's movies!")
+            return
+        if u not in users or matrix.by_user.get(u, i) != rating:
+            print("FAILURE: Row and column disagree on a rating!")
+            return
+        if matrix.user_position(10**6) is not None:
+            print("FAILURE: An unknown user got a position!")
+            return
+        print(f"SUCCESS: User {int(user_id)} has {len(items)} ratings.")
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
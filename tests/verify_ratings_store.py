@@ -0,0 +1,205 @@
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.data_loader as data_loader
+import src.ratings_store as ratings_store
+from src.catalog import file_md5
+from src.ratings_store import (
+    INGEST_BYTES_PER_ROW,
+    INGEST_FIXED_BYTES,
+    convert_ratings,
+    encode_ratings,
+    load_or_build_ratings_store,
+    open_ratings_store,
+)
+
+
+def write_dataset(tmp, n_ratings=10_000, seed=0):
+    """Writes a random ratings.csv and a matching checksums.txt."""
+    rng = np.random.RandomState(seed)
+    ratings = pd.DataFrame(
+        {
+            "userId": rng.randint(1, 500, n_ratings),
+            "movieId": rng.randint(1, 200_000, n_ratings),
+            "rating": rng.randint(1, 11, n_ratings) / 2,
+            "timestamp": rng.randint(800_000_000, 1_700_000_000, n_ratings),
+        }
+    )
+    csv_path = os.path.join(tmp, "ratings.csv")
+    ratings.to_csv(csv_path, index=False)
+    with open(os.path.join(tmp, "checksums.txt"), "w") as f:
+        f.write("0df90835c19151f9d819d0822e190797  movies.csv\n")
+        f.write(f"{file_md5(csv_path)}  ratings.csv\n")
+    return ratings
+
+
+def verify():
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = write_dataset(tmp)
+        csv_path = os.path.join(tmp, "ratings.csv")
+        checksums_path = os.path.join(tmp, "checksums.txt")
+        out_dir = os.path.join(tmp, "ratings_store")
+
+        conversions = []
+        original = ratings_store.convert_ratings
+
+        def counting_convert(*args, **kwargs):
+            conversions.append(1)
+            return original(*args, **kwargs)
+
+        ratings_store.convert_ratings = counting_convert
+        try:
+            print("--- Conversion ---")
+            store = load_or_build_ratings_store(
+                csv_path, out_dir, checksums_path
+            )
+            store = load_or_build_ratings_store(
+                csv_path, out_dir, checksums_path
+            )
+            if len(conversions) != 1:
+                print("FAILURE: The CSV was converted more than once!")
+                return
+
+            dtypes = [
+                store.user_ids.dtype,
+                store.movie_ids.dtype,
+                store.rating_codes.dtype,
+                store.timestamps.dtype,
+            ]
+            print(f"Column dtypes: {[str(d) for d in dtypes]}")
+            print(f"Store size: {store.nbytes} bytes for {len(store)} ratings")
+            if [str(d) for d in dtypes] != ["int32", "int32", "uint8", "int32"]:
+                print("FAILURE: Columns do not use compact dtypes!")
+                return
+            if not isinstance(store.user_ids, np.memmap):
+                print("FAILURE: Columns are not memory-mapped!")
+                return
+
+            frame = store.to_frame()
+            for column in expected.columns:
+                if not np.array_equal(
+                    frame[column].values, expected[column].values
+                ):
+                    print(f"FAILURE: Column {column} does not round-trip!")
+                    return
+            print("SUCCESS: The store matches ratings.csv.")
+
+            print("\n--- Invalidation ---")
+            write_dataset(tmp, n_ratings=500, seed=1)
+            store = load_or_build_ratings_store(
+                csv_path, out_dir, checksums_path
+            )
+            if len(conversions) != 2 or len(store) != 500:
+                print("FAILURE: A new checksum did not trigger a conversion!")
+                return
+            # Without checksums.txt the md5 is computed from the file
+            store = load_or_build_ratings_store(csv_path, out_dir)
+            if len(conversions) != 2:
+                print("FAILURE: An unchanged CSV was converted again!")
+                return
+            print("SUCCESS: Conversion is keyed on the checksum.")
+        finally:
+            ratings_store.convert_ratings = original
+
+        print("\n--- Streaming ingestion ---")
+        expected = write_dataset(tmp, n_ratings=50_000, seed=2)
+        reports = []
+        budget = INGEST_FIXED_BYTES + 20_000 * INGEST_BYTES_PER_ROW
+        convert_ratings(
+            csv_path,
+            out_dir,
+            "streamed",
+            memory_budget=budget,
+            progress=lambda *report: reports.append(report),
+        )
+        store = open_ratings_store(out_dir)
+        print(f"Chunks: {len(reports)}, last report: {reports[-1]}")
+        if len(reports) != 3 or reports[-1][0] != 50_000:
+            print("FAILURE: The budget did not bound the chunk size!")
+            return
+        if reports[-1][1] != reports[-1][2]:
+            print("FAILURE: Progress did not reach the end of the file!")
+            return
+        if not np.array_equal(store.to_frame()["userId"], expected["userId"]):
+            print("FAILURE: Chunks were not appended in order!")
+            return
+
+        users = expected["userId"].unique()
+        items = expected["movieId"].unique()
+        if not np.array_equal(store.user_raw_ids, users) or not np.array_equal(
+            store.item_raw_ids, items
+        ):
+            print("FAILURE: Dense IDs are not in order of first appearance!")
+            return
+        if not np.array_equal(
+            store.user_raw_ids[store.user_index], store.user_ids
+        ) or not np.array_equal(
+            store.item_raw_ids[store.item_index], store.movie_ids
+        ):
+            print("FAILURE: Dense indices do not map back to the raw IDs!")
+            return
+        print(f"SUCCESS: {store.n_users} users, {store.n_items} movies mapped.")
+
+        try:
+            convert_ratings(csv_path, out_dir, "tiny", memory_budget=2**20)
+            print("FAILURE: A budget below the parser overhead was accepted!")
+            return
+        except ValueError:
+            pass
+
+        try:
+            encode_ratings([4.0, 4.2])
+            print("FAILURE: Non half-star ratings were accepted!")
+            return
+        except ValueError:
+            pass
+
+        # No manifest may describe the store while its files are replaced
+        manifest_path = os.path.join(out_dir, ratings_store.MANIFEST_FILE)
+        stale = []
+        real_replace = os.replace
+
+        def checking_replace(src, dst):
+            if dst != manifest_path and os.path.exists(manifest_path):
+                stale.append(os.path.basename(dst))
+            real_replace(src, dst)
+
+        os.replace = checking_replace
+        try:
+            convert_ratings(csv_path, out_dir, "swapped", progress=None)
+        finally:
+            os.replace = real_replace
+        if stale:
+            print(f"FAILURE: {stale} replaced under the old manifest!")
+            return
+        if any(name.endswith(".tmp") for name in os.listdir(out_dir)):
+            print("FAILURE: Temporary files were left behind!")
+            return
+        print("SUCCESS: The old manifest is removed before files are swapped.")
+
+        print("\n--- load_ratings modes ---")
+        data_loader.MOVIES_FILE = os.path.join(tmp, "movies.csv")
+        data_loader.RATINGS_FILE = csv_path
+        data_loader.CHECKSUMS_FILE = checksums_path
+        data_loader.RATINGS_STORE_DIR = out_dir
+        open(data_loader.MOVIES_FILE, "w").close()
+        store = data_loader.load_ratings(mode="store")
+        frame = data_loader.load_ratings()
+        if len(store) != len(frame) or not np.array_equal(
+            store.ratings, frame["rating"].values
+        ):
+            print("FAILURE: Both modes should return the same ratings!")
+            return
+        print("SUCCESS: load_ratings(mode='store') returns the mapped store.")
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,273 @@
+import sys
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.data_loader as data_loader
+import src.database as database
+import src.model as model
+from src.cache import LRUCache
+from src.database import (
+    add_rating,
+    create_user,
+    delete_user,
+    init_db,
+    link_movielens_user,
+    update_user_genres,
+)
+from tests.verify_model_store import write_fake_model
+
+GENRES = ["Action", "Comedy", "Horror", "Drama", "Sci-Fi", "Romance"]
+
+
+def setup_environment(tmp, n_items=300):
+    """Points the app at a temporary catalog, model and database."""
+    rng = np.random.RandomState(1)
+    movie_ids = np.arange(1, n_items + 1)
+    pd.DataFrame(
+        {
+            "movieId": movie_ids,
+            "title": [f"Movie {i} ({1950 + i % 70})" for i in movie_ids],
+            "genres": [
+                "|".join(rng.choice(GENRES, 2, replace=False))
+                for _ in movie_ids
+            ],
+        }
+    ).to_csv(os.path.join(tmp, "movies.csv"), index=False)
+    pd.DataFrame(
+        {"userId": [1], "movieId": [1], "rating": [4.0], "timestamp": [1]}
+    ).to_csv(os.path.join(tmp, "ratings.csv"), index=False)
+    data_loader.MOVIES_FILE = os.path.join(tmp, "movies.csv")
+    data_loader.RATINGS_FILE = os.path.join(tmp, "ratings.csv")
+    data_loader.CATALOG_DIR = os.path.join(tmp, "catalog")
+
+    models_dir = os.path.join(tmp, "models")
+    os.makedirs(models_dir)
+    write_fake_model(models_dir, n_items=n_items)
+    model._MODEL_STORE = model.ModelStore(models_dir)
+
+    database.DB_PATH = os.path.join(tmp, "test.db")
+    init_db()
+
+
+def verify():
+    print("--- LRU cache ---")
+    cache = LRUCache(max_entries=3, max_bytes=1000)
+    for key in "abc":
+        cache.put(key, key, nbytes=100)
+    cache.get("a")
+    cache.put("d", "d", nbytes=100)
+    if "b" in cache or "a" not in cache or len(cache) != 3:
+        print("FAILURE: The least recently used entry was not evicted!")
+        return
+    cache.put("e", np.zeros(100))  # 800 bytes
+    if cache.nbytes > 1000 or "e" not in cache:
+        print("FAILURE: The memory cap was not enforced!")
+        return
+    cache.put("f", np.zeros(1000))
+    if "f" in cache:
+        print("FAILURE: An entry larger than the cap was cached!")
+        return
+
+    ttl_cache = LRUCache(max_entries=10, ttl=0.05)
+    ttl_cache.put("k", 1)
+    if ttl_cache.get("k") != 1:
+        print("FAILURE: Fresh entry was not returned!")
+        return
+    time.sleep(0.06)
+    stats = ttl_cache.stats()
+    if ttl_cache.get("k") is not None or ttl_cache.stats()["expirations"] != 1:
+        print("FAILURE: Expired entry was returned!")
+        return
+    if stats["hits"] != 1 or stats["misses"] != 0:
+        print("FAILURE: Hit/miss counters are wrong!")
+        return
+    print(f"SUCCESS: {cache.stats()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_environment(tmp)
+        create_user("cache_user", "cache@example.com", "password", [])
+        user_id = 1
+
+        print("\n--- Fold-in cache ---")
+        solves = []
+        original = model.fold_in_user
+
+        def counting_fold_in(*args, **kwargs):
+            solves.append(1)
+            return original(*args, **kwargs)
+
+        model.fold_in_user = counting_fold_in
+        try:
+            for movie_id in (1, 2, 3):
+                add_rating(user_id, movie_id, 5.0)
+            first = model.get_recommendations(user_id, n=5)
+            second = model.get_recommendations(user_id, n=5)
+            print(f"Solves after two identical requests: {len(solves)}")
+            if len(solves) != 1 or first != second:
+                print("FAILURE: The repeated request was not served cached!")
+                return
+
+            add_rating(user_id, 4, 1.0)
+            third = model.get_recommendations(user_id, n=5)
+            if len(solves) != 2 or 4 in [r["movieId"] for r in third]:
+                print("FAILURE: A new rating did not invalidate the cache!")
+                return
+
+            if model.get_recommendations(user_id, n=0) != []:
+                print("FAILURE: n=0 did not return an empty list!")
+                return
+
+            model.get_model_store().reload()
+            model.get_recommendations(user_id, n=5)
+            if len(solves) != 3:
+                print("FAILURE: Reloading the model did not invalidate!")
+                return
+
+            delete_user(user_id)
+            pu, bu, rated_rows = model.get_user_profile(user_id)
+            if np.any(pu) or bu != 0.0 or len(rated_rows) != 0:
+                print("FAILURE: Deleted user still has cached factors!")
+                return
+        finally:
+            model.fold_in_user = original
+        print("SUCCESS: Profiles are reused until ratings or model change.")
+
+        print("\n--- Recommendation cache ---")
+        create_user("genre_user", "genre@example.com", "password", [])
+        user_id = 2
+        add_rating(user_id, 10, 4.5)
+        before = model.get_cache_stats()["recommendations"]
+        horror = model.get_recommendations(
+            user_id, n=5, selected_genres=["Horror", "Drama"], alpha=0.3
+        )
+        plain = model.get_recommendations(user_id, n=5)
+        # Toggle back: same genres in another order hit the cache
+        again = model.get_recommendations(
+            user_id, n=5, selected_genres=["Drama", "Horror"], alpha=0.3
+        )
+        after = model.get_cache_stats()["recommendations"]
+        hits = after["hits"] - before["hits"]
+        misses = after["misses"] - before["misses"]
+        print(f"hits={hits}, misses={misses}")
+        if (hits, misses) != (1, 2) or again != horror or plain == horror:
+            print("FAILURE: Genre toggles were not served from the cache!")
+            return
+
+        again[0]["title"] = "changed"
+        if (
+            model.get_recommendations(
+                user_id, n=5, selected_genres=["Horror", "Drama"], alpha=0.3
+            )
+            != horror
+        ):
+            print("FAILURE: Callers can corrupt cached results!")
+            return
+
+        add_rating(user_id, horror[0]["movieId"], 1.0)
+        fresh = model.get_recommendations(
+            user_id, n=5, selected_genres=["Horror", "Drama"], alpha=0.3
+        )
+        if horror[0]["movieId"] in [r["movieId"] for r in fresh]:
+            print("FAILURE: A stale list was served after a new rating!")
+            return
+        print("SUCCESS: Cached lists are keyed on the request and ratings.")
+
+        print("\n--- Known MovieLens users ---")
+        create_user("ml_user", "ml@example.com", "password", [])
+        user_id = 3
+        components = model.get_model_store().load()
+        stored_pu, stored_bu = components[0][4], components[2][4]
+        link_movielens_user(user_id, 5)
+        model.fold_in_user = counting_fold_in
+        try:
+            solves.clear()
+            pu, bu, _ = model.get_user_profile(user_id)
+            if solves or not np.allclose(pu, stored_pu) or bu != stored_bu:
+                print("FAILURE: Trained factors were not used directly!")
+                return
+
+            add_rating(user_id, 7, 5.0)
+            blended_pu, blended_bu, _ = model.get_user_profile(user_id)
+        finally:
+            model.fold_in_user = original
+        expected = model.fold_in_user(
+            (np.array([7]), np.array([5.0])),
+            components[1],
+            components[3],
+            components[4],
+            components[5],
+            prior=(stored_pu, stored_bu),
+        )
+        if len(solves) != 1 or not np.allclose(blended_pu, expected[0]):
+            print("FAILURE: App ratings were not blended with the factors!")
+            return
+        if np.allclose(blended_pu, stored_pu):
+            print("FAILURE: The new rating did not move the factors!")
+            return
+
+        model.BLEND_STORED_FACTORS = False
+        link_movielens_user(user_id, 5)  # bumps the version
+        pu, bu, _ = model.get_user_profile(user_id)
+        model.BLEND_STORED_FACTORS = True
+        if not np.allclose(pu, stored_pu):
+            print("FAILURE: Blending could not be disabled!")
+            return
+        print("SUCCESS: Linked users start from their trained factors.")
+
+        print("\n--- Genre cold start ---")
+        create_user("horror_fan", "horror@example.com", "password", ["Horror"])
+        create_user("two_genres", "two@example.com", "pw", ["Horror", "Comedy"])
+        store = model.get_model_store()
+        genre_matrix = store.genre_matrix()
+        qi = store.load()[1]
+        horror = genre_matrix[:, model.GENRE_INDEX["Horror"]] == 1
+        comedy = genre_matrix[:, model.GENRE_INDEX["Comedy"]] == 1
+        pu, bu, _ = model.get_user_profile(4)
+        if not np.allclose(pu, qi[horror].mean(axis=0)) or bu != 0.0:
+            print("FAILURE: Cold start is not the Horror centroid!")
+            return
+        pu, _, _ = model.get_user_profile(5)
+        expected = (qi[horror].mean(axis=0) + qi[comedy].mean(axis=0)) / 2
+        if not np.allclose(pu, expected):
+            print("FAILURE: Cold start does not average the genres!")
+            return
+        update_user_genres(5, [])
+        pu, _, _ = model.get_user_profile(5)
+        if np.any(pu):
+            print("FAILURE: Changing the genres did not invalidate the cache!")
+            return
+
+        weighted = model.compute_genre_centroids(
+            qi, genre_matrix, weights=horror.astype(float)
+        )
+        if not np.allclose(
+            weighted[model.GENRE_INDEX["Horror"]], qi[horror].mean(axis=0)
+        ):
+            print("FAILURE: Weighted centroids are wrong!")
+            return
+
+        # Centroids exported with the model take precedence
+        exported = np.ones((len(model.GENRE_VOCAB), qi.shape[1]))
+        np.save(
+            os.path.join(store.models_dir, "svd_genre_centroids.npy"), exported
+        )
+        store.reload()
+        pu, _, _ = model.get_user_profile(4)
+        if not np.allclose(pu, 1.0):
+            print("FAILURE: The exported centroids were not used!")
+            return
+        print("SUCCESS: Cold users start from their genre centroids.")
+
+        database.close_db_connections()
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
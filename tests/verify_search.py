@@ -0,0 +1,173 @@
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.data_loader as data_loader
+import src.movie_stats as movie_stats
+from src.data_loader import search_movies, suggest_movies
+from src.catalog import read_manifest
+from src.movie_stats import (
+    compute_movie_stats,
+    load_movie_stats,
+    save_movie_stats,
+)
+
+MOVIES = pd.DataFrame(
+    {
+        "movieId": [1, 2, 260, 1196, 4973, 1210, 5, 7],
+        "title": [
+            "Toy Story (1995)",
+            "Jumanji (1995)",
+            "Star Wars: Episode IV - A New Hope (1977)",
+            "Star Wars: Episode V - The Empire Strikes Back (1980)",
+            "Amélie (Fabuleux destin d'Amélie Poulain, Le) (2001)",
+            "Star Wars: Episode VI - Return of the Jedi (1983)",
+            "Father of the Bride Part II (1995)",
+            "Lone Star (1996)",
+        ],
+        "genres": [
+            "Adventure|Animation|Children|Comedy|Fantasy",
+            "Adventure|Children|Fantasy",
+            "Action|Adventure|Sci-Fi",
+            "Action|Adventure|Sci-Fi",
+            "Comedy|Romance",
+            "Action|Adventure|Sci-Fi",
+            "Comedy",
+            "Drama|Mystery|Western",
+        ],
+    }
+)
+
+
+def check(query, expected_ids):
+    results = search_movies(query, MOVIES)
+    found = list(results["movieId"])
+    status = "OK" if found == expected_ids else "MISMATCH"
+    print(f"[{status}] '{query}' -> {found}")
+    return found == expected_ids
+
+
+def verify():
+    print("--- Token search ---")
+    checks = [
+        check("Star Wars", [260, 1196, 1210]),
+        check("star wa", [260, 1196, 1210]),
+        check("wars jedi", [1210]),
+        check("amelie", [4973]),
+        check("AMÉLIE", [4973]),
+        check("(", []),
+        # Genre matching: English substring and Spanish names
+        check("Western", [7]),
+        check("Ciencia Ficción", [260, 1196, 1210]),
+        check("ciencia ficcion", [260, 1196, 1210]),
+        check("Animación", [1]),
+    ]
+    if not all(checks):
+        print("FAILURE: Unexpected search results!")
+        return
+
+    print("\n--- Fuzzy search ---")
+    fuzzy = search_movies("star wras", MOVIES)
+    print(f"'star wras' -> {list(fuzzy['movieId'])}")
+    if set(fuzzy["movieId"][:3]) != {260, 1196, 1210}:
+        print("FAILURE: Misspelled query should find Star Wars!")
+        return
+    if not check("amelei", [4973]) or not check("jumanjy", [2]):
+        print("FAILURE: Unexpected fuzzy results!")
+        return
+    if not search_movies("star wras", MOVIES, fuzzy=False).empty:
+        print("FAILURE: Fuzzy matching should be optional!")
+        return
+
+    print("\n--- Autocomplete ---")
+    for prefix, expected in [
+        ("star w", "Star Wars: Episode IV - A New Hope (1977)"),
+        ("cienc", "Ciencia Ficción"),
+        ("sci", "Sci-Fi"),
+    ]:
+        suggestions = suggest_movies(prefix, MOVIES)
+        print(f"'{prefix}' -> {suggestions}")
+        if expected not in suggestions:
+            print(f"FAILURE: '{expected}' should be suggested!")
+            return
+    if suggest_movies("zzz", MOVIES) or suggest_movies("", MOVIES):
+        print("FAILURE: Unexpected suggestions!")
+        return
+
+    print("\n--- Popularity ranking ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_loader.MOVIES_FILE = os.path.join(tmp, "movies.csv")
+        data_loader.RATINGS_FILE = os.path.join(tmp, "ratings.csv")
+        data_loader.CATALOG_DIR = os.path.join(tmp, "catalog")
+        MOVIES.to_csv(data_loader.MOVIES_FILE, index=False)
+        # Return of the Jedi is the most rated, Lone Star has one 5-star rating
+        ratings = [(u, 1210, 4.5) for u in range(50)]
+        ratings += [(u, 260, 4.0) for u in range(30)]
+        ratings += [(u, 1196, 3.0) for u in range(5)]
+        ratings += [(1, 7, 5.0), (2, 999999, 1.0)]
+        pd.DataFrame(ratings, columns=["userId", "movieId", "rating"]).assign(
+            timestamp=0
+        ).to_csv(data_loader.RATINGS_FILE, index=False)
+
+        catalog = data_loader.load_catalog()
+        counts, means = compute_movie_stats(
+            data_loader.RATINGS_FILE, catalog, chunksize=7
+        )
+        if counts[catalog.row(1210)] != 50 or means[catalog.row(7)] != 5.0:
+            print("FAILURE: Wrong per-movie statistics!")
+            return
+        save_movie_stats(
+            data_loader.CATALOG_DIR,
+            counts,
+            means,
+            read_manifest(data_loader.CATALOG_DIR)["source_md5"],
+        )
+
+        movies_df = data_loader.load_movies()
+        ranked = list(
+            search_movies("star", movies_df, order="popularity")["movieId"]
+        )
+        print(f"'star' by popularity -> {ranked}")
+        if ranked != [1210, 260, 1196, 7]:
+            print("FAILURE: Matches are not ranked by popularity!")
+            return
+        top = list(search_movies("", movies_df, order="popularity")["movieId"])
+        if top[:3] != [1210, 260, 1196]:
+            print("FAILURE: Empty query should list the most popular movies!")
+            return
+
+        # A save interrupted after the counts must not leave valid stats
+        catalog_md5 = read_manifest(data_loader.CATALOG_DIR)["source_md5"]
+        real_save_array = movie_stats._save_array
+
+        def failing_save_array(out_dir, name, array):
+            if name == "rating_means":
+                raise OSError("disk full")
+            real_save_array(out_dir, name, array)
+
+        movie_stats._save_array = failing_save_array
+        try:
+            save_movie_stats(
+                data_loader.CATALOG_DIR, counts * 2, means, catalog_md5
+            )
+        except OSError:
+            pass
+        finally:
+            movie_stats._save_array = real_save_array
+        if load_movie_stats(data_loader.CATALOG_DIR, catalog_md5) is not None:
+            print("FAILURE: Stats of an interrupted save were accepted!")
+            return
+
+    if len(search_movies("", MOVIES)) != len(MOVIES):
+        print("FAILURE: Empty query should list the first movies!")
+        return
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,159 @@
+import sys
+import os
+import pickle
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from surprise import SVD, Dataset, Reader
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.data_loader as data_loader
+import src.model as model
+from src.database import create_user, link_movielens_user
+from src.trainer import train_biased_mf
+from tests.verify_recommendation_cache import setup_environment
+
+
+def synthetic_ratings(n_users, n_items, n_ratings, rank=5, seed=0):
+    """Half-star ratings from a low-rank model with biases and noise."""
+    rng = np.random.RandomState(seed)
+    P = rng.normal(0, 0.5, (n_users, rank))
+    Q = rng.normal(0, 0.5, (n_items, rank))
+    pairs = pd.DataFrame(
+        {
+            "u": rng.randint(0, n_users, n_ratings),
+            # Skewed item popularity, like real catalogs
+            "i": rng.zipf(1.3, n_ratings) % n_items,
+        }
+    ).drop_duplicates()
+    u, i = pairs["u"].values, pairs["i"].values
+    raw = (
+        3.5
+        + rng.normal(0, 0.3, n_users)[u]
+        + rng.normal(0, 0.3, n_items)[i]
+        + (P[u] * Q[i]).sum(axis=1)
+        + rng.normal(0, 0.3, len(u))
+    )
+    return u, i, np.clip(np.round(raw * 2) / 2, 0.5, 5.0)
+
+
+def rmse(estimates, ratings):
+    return float(np.sqrt(np.mean((estimates - ratings) ** 2)))
+
+
+def verify():
+    print("--- Accuracy against Surprise ---")
+    n_users, n_items = 2000, 1500
+    u, i, r = synthetic_ratings(n_users, n_items, 200_000)
+    perm = np.random.RandomState(1).permutation(len(r))
+    train, test = perm[: int(0.8 * len(r))], perm[int(0.8 * len(r)) :]
+
+    start = time.perf_counter()
+    trainset = Dataset.load_from_df(
+        pd.DataFrame({"u": u[train], "i": i[train], "r": r[train]}),
+        Reader(rating_scale=(0.5, 5.0)),
+    ).build_full_trainset()
+    algo = SVD(random_state=0).fit(trainset)
+    surprise_time = time.perf_counter() - start
+    surprise_rmse = rmse(
+        np.array([algo.predict(x, y).est for x, y in zip(u[test], i[test])]),
+        r[test],
+    )
+
+    start = time.perf_counter()
+    pu, qi, bu, bi, global_mean = train_biased_mf(
+        u[train].astype(np.int32),
+        i[train].astype(np.int32),
+        r[train].astype(np.float32),
+        n_users,
+        n_items,
+        random_state=0,
+        verbose=False,
+    )
+    native_time = time.perf_counter() - start
+    estimates = (
+        global_mean
+        + bu[u[test]]
+        + bi[i[test]]
+        + np.einsum("ij,ij->i", pu[u[test]], qi[i[test]])
+    )
+    native_rmse = rmse(np.clip(estimates, 0.5, 5.0), r[test])
+
+    print(f"{len(train)} training ratings, 100 factors, 20 epochs")
+    print(
+        f"Surprise SVD: test RMSE {surprise_rmse:.4f} ({surprise_time:.1f} s)"
+    )
+    print(f"Native:       test RMSE {native_rmse:.4f} ({native_time:.1f} s)")
+    if abs(native_rmse - surprise_rmse) > 0.01:
+        print("FAILURE: Native RMSE is not within 0.01 of Surprise!")
+        return
+    print("SUCCESS: The native trainer matches Surprise's accuracy.")
+
+    print("\n--- train_model ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_environment(tmp, n_items=300)
+        data_loader.CHECKSUMS_FILE = os.path.join(tmp, "checksums.txt")
+        data_loader.RATINGS_STORE_DIR = os.path.join(tmp, "ratings_store")
+        u, i, r = synthetic_ratings(400, 300, 20_000, seed=2)
+        pd.DataFrame(
+            {"userId": u + 1, "movieId": i + 1, "rating": r, "timestamp": 1}
+        ).to_csv(data_loader.RATINGS_FILE, index=False)
+
+        store = model.get_model_store()
+        store.load()
+        old_version = store.version
+        model.MODELS_DIR = models_dir = store.models_dir
+        trained = model.train_model()
+        pu, qi, bu, bi, global_mean, mappings = store.load()
+        if store.version == old_version or pu.shape != trained.pu.shape:
+            print("FAILURE: The loaded model was not replaced!")
+            return
+        print(f"Exported pu {pu.shape}, qi {qi.shape}, mean {global_mean}")
+        with open(os.path.join(models_dir, "svd_mappings.pkl"), "rb") as f:
+            saved = pickle.load(f)
+        movie_id = int(trained.item_raw_ids[7])
+        if saved["items"][str(movie_id)] != 7 or len(saved["users"]) != 400:
+            print("FAILURE: ID mappings do not follow the store's indices!")
+            return
+        if not os.path.exists(
+            os.path.join(models_dir, model.GENRE_CENTROIDS_FILE)
+        ):
+            print("FAILURE: Genre centroids were not exported!")
+            return
+
+        create_user("linked", "linked@example.com", "password", [])
+        user_id = int(trained.user_raw_ids[0])
+        link_movielens_user(1, user_id)
+        factors = model.stored_user_factors(user_id, store.load())
+        if factors is None or not np.allclose(factors[0], trained.pu[0]):
+            print("FAILURE: Linked users do not get the trained factors!")
+            return
+        recs = model.get_recommendations(1, n=5)
+        if len(recs) != 5:
+            print("FAILURE: The trained model does not recommend!")
+            return
+        print(f"SUCCESS: Recommendations: {[r['movieId'] for r in recs]}")
+
+        # Retraining must not touch the files the old model has mapped
+        old_pu = np.array(pu)
+        model.train_model()
+        if not np.array_equal(pu, old_pu):
+            print("FAILURE: Retraining overwrote the mapped factors!")
+            return
+        print("SUCCESS: Mapped factors survive retraining.")
+
+        try:
+            model.train_model(engine="sklearn")
+            print("FAILURE: An unknown engine was accepted!")
+            return
+        except ValueError:
+            pass
+
+    print("\nVerification Passed.")
+
+
+if __name__ == "__main__":
+    verify()